@@ -34,19 +34,30 @@ Each request for a space name creates a structure in the disk such as:
                     is actually created.
     /damaged        Written if the space is to be considered damaged
                     and should be reclaimed after a timeout.
-"""
 
+Besides that, an index is kept in the disk to avoid having to probe each space
+(taking its lock and reading its files) to find a match:
+
+/space_index.lock   Lock file used to read/write the index.
+/space_index.json   A Json mapping the space names to the hash of the (formatted)
+                    conda.yaml contents and the last usage of the space.
+
+The index is just a hint: the space selected through it is still validated
+(with the space lock) and if the index is not in sync with the spaces in
+the disk a full scan of the spaces is done.
+"""
 
 from robocorp_code.protocols import IRcc
 from robocorp_ls_core.robotframework_log import get_logger
 
 from pathlib import Path
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Dict
 from robocorp_code.rcc_space_info import (
     RCCSpaceInfo,
     CurrentSpaceStatus,
     write_text,
     SpaceState,
+    format_conda_contents_to_compare,
 )
 
 log = get_logger(__name__)
@@ -59,6 +70,63 @@ class UnableToGetSpaceName(RuntimeError):
     pass
 
 
+def compute_conda_contents_hash(conda_yaml_contents: str) -> str:
+    import hashlib
+
+    formatted = format_conda_contents_to_compare(conda_yaml_contents)
+    return hashlib.sha256(formatted.encode("utf-8", "replace")).hexdigest()
+
+
+class _SpaceIndex:
+    """
+    Index with the space name -> conda contents hash/last usage.
+
+    Note: the index must only be accessed with the index lock acquired.
+    """
+
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self._index_path = directory / "space_index.json"
+
+    def acquire_lock(self):
+        from robocorp_ls_core.system_mutex import timed_acquire_mutex
+
+        return timed_acquire_mutex(
+            "space_index.lock", timeout=60, base_dir=str(self._directory)
+        )
+
+    def load(self) -> Dict[str, dict]:
+        import json
+
+        try:
+            contents = json.loads(self._index_path.read_text("utf-8"))
+            spaces = contents["spaces"]
+            if isinstance(spaces, dict):
+                return spaces
+        except FileNotFoundError:
+            pass
+        except:
+            log.exception("Error loading space index from: %s", self._index_path)
+        return {}
+
+    def save(self, spaces: Dict[str, dict]) -> None:
+        import json
+
+        write_text(self._index_path, json.dumps({"spaces": spaces}), "utf-8")
+
+    def update(self, space_name: str, conda_hash: str, last_usage: float) -> None:
+        try:
+            with self.acquire_lock():
+                spaces = self.load()
+                spaces[space_name] = {
+                    "conda_hash": conda_hash,
+                    "last_usage": last_usage,
+                }
+                self.save(spaces)
+        except:
+            log.exception("Error updating space index for: %s", space_name)
+
+
 class HolotreeManager:
     def __init__(
         self,
@@ -96,6 +164,7 @@ class HolotreeManager:
         self._directory = directory
         self._max_number_of_spaces = max_number_of_spaces
         self._timeout_to_reuse_space = timeout_to_reuse_space
+        self._space_index = _SpaceIndex(directory)
 
     def _iter_target_space_names(self):
         i = 1
@@ -246,12 +315,108 @@ class HolotreeManager:
         conda_yaml_contents: str,
         require_timeout: bool = False,
     ) -> RCCSpaceInfo:
+        conda_hash = compute_conda_contents_hash(conda_yaml_contents)
+        # The status of the spaces already probed based on the index (so
+        # that they aren't probed again if the spaces must be scanned).
+        probed: Dict[str, RCCSpaceInfo] = {}
+        space_info = self._compute_valid_space_info_from_index(
+            conda_hash, conda_yaml_path, conda_yaml_contents, probed
+        )
+        if space_info is None:
+            space_info = self._compute_valid_space_info_scanning(
+                conda_yaml_path, conda_yaml_contents, require_timeout, probed
+            )
+        self._space_index.update(
+            space_info.space_name, conda_hash, space_info.last_usage
+        )
+        return space_info
+
+    def _compute_valid_space_info_from_index(
+        self,
+        conda_hash: str,
+        conda_yaml_path: Path,
+        conda_yaml_contents: str,
+        probed: Dict[str, RCCSpaceInfo],
+    ) -> Optional[RCCSpaceInfo]:
+        """
+        :param probed:
+            Filled with the status of the spaces probed in this call.
+
+        :return: the space info to be used or None if it was not possible to
+        get a valid space based on the index (in which case all the spaces
+        must be scanned).
+        """
+        try:
+            with self._space_index.acquire_lock():
+                spaces = self._space_index.load()
+        except:
+            log.exception("Unable to load space index.")
+            return None
+
+        def compute_status(space_name: str) -> RCCSpaceInfo:
+            status = probed.get(space_name)
+            if status is None:
+                status = probed[space_name] = self._compute_status(
+                    space_name, conda_yaml_path, conda_yaml_contents
+                )
+            return status
+
+        for space_name, entry in spaces.items():
+            if entry.get("conda_hash") == conda_hash:
+                status = compute_status(space_name)
+                if status.curr_status == CurrentSpaceStatus.CAN_USE:
+                    return status
+                break
+
+        existing: List[str] = []
+        free: List[str] = []
+        for space_name in self._iter_target_space_names():
+            if (self._directory / space_name).exists():
+                if space_name not in spaces:
+                    # The index is not in sync with what's in the disk.
+                    return None
+                existing.append(space_name)
+            else:
+                free.append(space_name)
+
+        for space_name in free:
+            status = compute_status(space_name)
+            if status.curr_status == CurrentSpaceStatus.CAN_USE:
+                return status
+
+        # Check the reuse targets, starting at the least recently used one.
+        existing = sorted(existing, key=lambda name: spaces[name].get("last_usage", 0))
+        for space_name in existing:
+            status = compute_status(space_name)
+            if status.curr_status == CurrentSpaceStatus.CAN_USE:
+                return status
+            if status.curr_status == CurrentSpaceStatus.REUSE_TARGET:
+                if self._can_reuse_simple(conda_yaml_contents, conda_yaml_path, status):
+                    return status
+        return None
+
+    def _compute_valid_space_info_scanning(
+        self,
+        conda_yaml_path: Path,
+        conda_yaml_contents: str,
+        require_timeout: bool,
+        probed: Optional[Dict[str, RCCSpaceInfo]] = None,
+    ) -> RCCSpaceInfo:
+        """
+        :param probed:
+            The status of the spaces which were already probed (which are
+            used instead of probing the space again).
+        """
         checked: List[str] = []
         can_reuse: List[RCCSpaceInfo] = []
         not_available: List[RCCSpaceInfo] = []
         for name in self._iter_target_space_names():
             checked.append(name)
-            status = self._compute_status(name, conda_yaml_path, conda_yaml_contents)
+            status = probed.get(name) if probed else None
+            if status is None:
+                status = self._compute_status(
+                    name, conda_yaml_path, conda_yaml_contents
+                )
             if status.curr_status == CurrentSpaceStatus.CAN_USE:
                 return status
             elif status.curr_status == CurrentSpaceStatus.REUSE_TARGET:
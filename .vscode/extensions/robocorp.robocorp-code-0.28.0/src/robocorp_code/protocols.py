@@ -111,6 +111,11 @@ class WorkItemsInfo(TypedDict):
     input_work_items: List[WorkItem]
     output_work_items: List[WorkItem]
 
+    # The number of work items available (if the listing was paginated, the
+    # lists above may have less items).
+    input_work_items_total: int
+    output_work_items_total: int
+
     new_output_workitem_path: str
 
 
@@ -122,7 +127,14 @@ class ActionResultDictWorkItems(TypedDict):
     result: Optional[WorkItemsInfo]
 
 
-class ListWorkItemsParams(TypedDict):
+class _ListWorkItemsPaginationParams(TypedDict, total=False):
+    input_offset: int  # Index of the first input work item to be returned (default: 0).
+    input_limit: int  # Maximum number of input work items to be returned (default: all).
+    output_offset: int  # Index of the first output work item to be returned (default: 0).
+    output_limit: int  # Maximum number of output work items to be returned (default: all).
+
+
+class ListWorkItemsParams(_ListWorkItemsPaginationParams):
     robot: str  # Path to the robot for which we want the work items (may be just the folder or the yaml).
     output_prefix: str  # Prefix for output folder (such as 'run-' or 'interactive-').
     increment_output: bool  # Whether a new output folder should be generated (and older ones should be collected).
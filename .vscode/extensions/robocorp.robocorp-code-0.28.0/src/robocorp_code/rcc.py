@@ -1,6 +1,6 @@
 from subprocess import CalledProcessError, TimeoutExpired, list2cmdline
 import sys
-from typing import Optional, List, Any, Dict, Set
+from typing import Optional, List, Any, Dict, Set, Tuple, Sequence, Callable
 import weakref
 
 from robocorp_ls_core.basic import implements, as_str, is_process_alive
@@ -23,9 +23,9 @@ import json
 from robocorp_ls_core.protocols import check_implements
 from dataclasses import dataclass
 import time
+import threading
 from robocorp_code.rcc_space_info import RCCSpaceInfo, SpaceState
 
-
 log = get_logger(__name__)
 
 RCC_CLOUD_ROBOT_MUTEX_NAME = "rcc_cloud_activity"
@@ -174,6 +174,122 @@ class RobotInfoEnv(object):
         _: IRobotYamlEnvInfo = check_implements(self)
 
 
+class _PendingRccResult(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[ActionResult[str]] = None
+
+
+class _RccResultCache(object):
+    """
+    Caches the results of rcc commands which just collect information.
+
+    The key is the command line along with the contents of the files used as
+    the input for the command (so, if one of those files changes, the command
+    is run again). Concurrent calls for the same key share the same rcc
+    subprocess (the additional callers wait for the result of the first one).
+
+    Expired results are removed when a new result is added and at most
+    `max_entries` results are kept (the least recently used are removed
+    first).
+    """
+
+    def __init__(self, ttl: float = 60 * 5, max_entries: int = 32):
+        from collections import OrderedDict
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Note: kept in the order of usage (the last is the most recently used).
+        self._key_to_result: "OrderedDict[tuple, Tuple[float, ActionResult[str]]]" = (
+            OrderedDict()
+        )
+        self._key_to_pending: Dict[tuple, _PendingRccResult] = {}
+
+    def compute_key(self, args: Sequence[str], input_files: Sequence[str]) -> tuple:
+        import hashlib
+
+        files_info = []
+        for filename in input_files:
+            try:
+                with open(filename, "rb") as stream:
+                    digest = hashlib.sha256(stream.read()).hexdigest()
+            except OSError:
+                digest = ""
+            files_info.append((os.path.normcase(os.path.abspath(filename)), digest))
+        return (tuple(args), tuple(files_info))
+
+    def get_or_compute(
+        self, key: tuple, compute: Callable[[], ActionResult[str]]
+    ) -> ActionResult[str]:
+        with self._lock:
+            cached = self._key_to_result.get(key)
+            if cached is not None:
+                cached_at, result = cached
+                if time.time() - cached_at < self.ttl:
+                    self._key_to_result.move_to_end(key)
+                    return result
+                del self._key_to_result[key]
+
+            pending = self._key_to_pending.get(key)
+            if pending is not None:
+                wait_pending = True
+            else:
+                wait_pending = False
+                pending = self._key_to_pending[key] = _PendingRccResult()
+
+        if wait_pending:
+            pending.event.wait()
+            if pending.result is not None:
+                return pending.result
+            # The one computing it raised an exception: compute it again.
+            return compute()
+
+        result: Optional[ActionResult[str]] = None
+        try:
+            result = compute()
+            return result
+        finally:
+            with self._lock:
+                if result is not None and result.success:
+                    self._add_result(key, result)
+                del self._key_to_pending[key]
+            pending.result = result
+            pending.event.set()
+
+    def _add_result(self, key: tuple, result: ActionResult[str]) -> None:
+        # Note: the lock must be held.
+        now = time.time()
+        key_to_result = self._key_to_result
+        for cached_key, (cached_at, _result) in list(key_to_result.items()):
+            if now - cached_at >= self.ttl:
+                del key_to_result[cached_key]
+
+        key_to_result[key] = (now, result)
+        key_to_result.move_to_end(key)
+        while len(key_to_result) > self.max_entries:
+            key_to_result.popitem(last=False)
+
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """
+        :param filename:
+            If given, only the results which used the given file as an input
+            are invalidated, otherwise all the results are invalidated.
+        """
+        with self._lock:
+            if filename is None:
+                self._key_to_result.clear()
+                return
+
+            filename = os.path.normcase(os.path.abspath(filename))
+            for key in list(self._key_to_result):
+                _args, files_info = key
+                for cached_filename, _digest in files_info:
+                    if cached_filename == filename:
+                        del self._key_to_result[key]
+                        break
+
+
 class Rcc(object):
 
     # Note that this is stored in the class, not in the instance.
@@ -187,6 +303,7 @@ class Rcc(object):
 
         self._last_verified_account_info: Optional[AccountInfo] = None
         self.rcc_listeners: List[IRccListener] = []
+        self._result_cache = _RccResultCache()
 
     @property
     def last_verified_account_info(self) -> Optional[AccountInfo]:
@@ -393,9 +510,34 @@ class Rcc(object):
 
         return ActionResult(success=True, message=None, result=output)
 
+    def _run_rcc_cached(
+        self, args: List[str], input_files: Sequence[str] = (), **kwargs
+    ) -> ActionResult[str]:
+        """
+        Same as `_run_rcc` but the result is cached (keyed by the command line
+        and the contents of the given `input_files`).
+
+        Should only be used for commands which just collect information.
+        """
+        key = self._result_cache.compute_key(
+            [self.get_rcc_location(), str(self.get_robocorp_home_from_settings())]
+            + args,
+            input_files,
+        )
+        return self._result_cache.get_or_compute(
+            key, lambda: self._run_rcc(args, **kwargs)
+        )
+
+    def invalidate_cached_results(self, filename: Optional[str] = None) -> None:
+        """
+        Invalidates the cached rcc results which depend on the given file (or
+        all the cached results if no file is given).
+        """
+        self._result_cache.invalidate(filename)
+
     @implements(IRcc.get_template_names)
     def get_template_names(self) -> ActionResult[List[RobotTemplate]]:
-        result = self._run_rcc("robot initialize -l --json".split())
+        result = self._run_rcc_cached("robot initialize -l --json".split())
         if not result.success:
             return ActionResult(success=False, message=result.message)
 
@@ -1020,15 +1162,44 @@ class Rcc(object):
         _: IRcc = check_implements(self)
 
     def configuration_diagnostics(self, robot_yaml, json=True) -> ActionResult[str]:
-        return self._run_rcc(
+        input_files = [robot_yaml]
+        conda_config_path = _get_conda_config_path(robot_yaml)
+        if conda_config_path:
+            input_files.append(conda_config_path)
+
+        return self._run_rcc_cached(
             ["configuration", "diagnostics"]
             + (["--json"] if json else [])
             + ["-r", robot_yaml],
+            input_files=input_files,
             mutex_name=None,
             timeout=60,
         )
 
 
+def _get_conda_config_path(robot_yaml: str) -> Optional[str]:
+    """
+    :return: the path to the `condaConfigFile` referenced in the given
+    robot.yaml (or None if it's not available).
+    """
+    from robocorp_ls_core import yaml_wrapper
+
+    try:
+        with open(robot_yaml, "r", encoding="utf-8") as stream:
+            yaml_contents = yaml_wrapper.load(stream)
+    except Exception:
+        log.debug("Unable to load: %s", robot_yaml)
+        return None
+
+    if not isinstance(yaml_contents, dict):
+        return None
+
+    conda_config = yaml_contents.get("condaConfigFile")
+    if not conda_config or not isinstance(conda_config, str):
+        return None
+    return os.path.join(os.path.dirname(robot_yaml), conda_config)
+
+
 def make_numbered_in_temp(
     keep: int = 10,
     lock_timeout: float = -1,
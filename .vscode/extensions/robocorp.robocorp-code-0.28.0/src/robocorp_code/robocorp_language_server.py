@@ -2,7 +2,7 @@ from functools import partial
 import os
 import sys
 from pathlib import Path
-from typing import List, Any, Optional, Dict, Iterator
+from typing import List, Any, Optional, Dict
 from base64 import b64encode
 
 from robocorp_code import commands
@@ -69,6 +69,14 @@ def _verify_version(found_version, expected_version):
     return found_version >= expected_version
 
 
+def _paginate(work_items: List[WorkItem], offset, limit) -> List[WorkItem]:
+    offset = offset or 0
+    if not offset and limit is None:
+        return work_items
+    end = None if limit is None else offset + limit
+    return work_items[offset:end]
+
+
 class ListWorkspaceCachedInfoDict(TypedDict):
     ws_info: List[WorkspaceInfoDict]
     account_cache_key: tuple
@@ -144,6 +152,9 @@ class RobocorpLanguageServer(PythonLanguageServer):
         self._local_list_robots_cache: Dict[
             Path, CachedFileInfo[LocalRobotMetadataInfoDict]
         ] = {}
+        from robocorp_code.work_items_catalog import WorkItemsCatalog
+
+        self._work_items_catalog = WorkItemsCatalog()
         PythonLanguageServer.__init__(self, read_stream, write_stream)
 
         self._vault = _Vault(
@@ -249,6 +260,7 @@ class RobocorpLanguageServer(PythonLanguageServer):
             # validate it.
             if doc_uri.endswith("conda.yaml") or doc_uri.endswith("robot.yaml"):
                 robot_yaml_fs_path = uris.to_fs_path(doc_uri)
+                self._rcc.invalidate_cached_results(robot_yaml_fs_path)
                 if robot_yaml_fs_path.endswith("conda.yaml"):
                     p = os.path.dirname(robot_yaml_fs_path)
                     for _ in range(3):
@@ -706,27 +718,18 @@ class RobocorpLanguageServer(PythonLanguageServer):
         work_items_in_dir = robot_yaml.parent / "devdata" / "work-items-in"
         work_items_out_dir = robot_yaml.parent / "devdata" / "work-items-out"
 
-        input_work_items: List[WorkItem] = []
-        output_work_items: List[WorkItem] = []
+        # Note: the catalog provides the work items already sorted.
+        input_work_items: List[WorkItem] = self._work_items_catalog.list_work_items(
+            work_items_in_dir
+        )
+        output_work_items: List[WorkItem] = self._work_items_catalog.list_work_items(
+            work_items_out_dir
+        )
 
-        def sort_by_number_postfix(entry: WorkItem):
-            try:
-                return int(entry["name"].rsplit("-", 1)[-1])
-            except:
-                # That's ok, item just doesn't match our expected format.
-                return 9999999
-
-        if work_items_in_dir.is_dir():
-            input_work_items.extend(self._collect_work_items(work_items_in_dir))
-            input_work_items.sort(key=sort_by_number_postfix)
-
-        if work_items_out_dir.is_dir():
-            output_work_items.extend(self._collect_work_items(work_items_out_dir))
-            output_work_items.sort(key=sort_by_number_postfix)
-            if increment_output:
-                output_work_items = self._schedule_output_work_item_removal(
-                    output_work_items, output_prefix
-                )
+        if output_work_items and increment_output:
+            output_work_items = self._schedule_output_work_item_removal(
+                output_work_items, output_prefix
+            )
 
         if increment_output:
             new_output_workitem_str = str(
@@ -737,12 +740,25 @@ class RobocorpLanguageServer(PythonLanguageServer):
         else:
             new_output_workitem_str = ""
 
+        input_work_items_total = len(input_work_items)
+        output_work_items_total = len(output_work_items)
+
+        # Pagination (each list is paginated separately).
+        input_work_items = _paginate(
+            input_work_items, params.get("input_offset"), params.get("input_limit")
+        )
+        output_work_items = _paginate(
+            output_work_items, params.get("output_offset"), params.get("output_limit")
+        )
+
         work_items_info: WorkItemsInfo = {
             "robot_yaml": str(robot_yaml),
             "input_folder_path": str(work_items_in_dir),
             "output_folder_path": str(work_items_out_dir),
             "input_work_items": input_work_items,
             "output_work_items": output_work_items,
+            "input_work_items_total": input_work_items_total,
+            "output_work_items_total": output_work_items_total,
             "new_output_workitem_path": new_output_workitem_str,
         }
         return dict(success=True, message=None, result=work_items_info)
@@ -787,19 +803,6 @@ class RobocorpLanguageServer(PythonLanguageServer):
         )
         return work_items_out_dir / f"{output_prefix}{next_run}" / "work-items.json"
 
-    def _collect_work_items(self, work_items_dir: Path) -> Iterator[WorkItem]:
-        def create_work_item(json_path) -> WorkItem:
-            return {"name": json_path.parent.name, "json_path": str(json_path)}
-
-        for path in work_items_dir.iterdir():
-            json_path = path / "work-items.json"
-            if json_path.is_file():
-                yield create_work_item(json_path)
-            else:
-                json_path = path / "work-items.output.json"
-                if json_path.is_file():
-                    yield create_work_item(json_path)
-
     # Automatically schedule a removal of work item that matches the output prefix
     def _schedule_output_work_item_removal(
         self, output_work_items: List[WorkItem], output_prefix: str
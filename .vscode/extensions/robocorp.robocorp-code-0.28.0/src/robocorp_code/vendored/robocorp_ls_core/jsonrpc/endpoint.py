@@ -17,11 +17,17 @@
 import sys
 import uuid
 
-from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.robotframework_log import (
+    get_logger,
+    TruncatedPayload,
+    LOG_LEVEL_DEBUG,
+)
+from robocorp_ls_core import tracing
 
 from .exceptions import (
     JsonRpcException,
     JsonRpcRequestCancelled,
+    JsonRpcContentModified,
     JsonRpcInternalError,
     JsonRpcMethodNotFound,
 )
@@ -51,6 +57,10 @@ class Endpoint(object):
 
     SHOW_THREAD_DUMP_AFTER_TIMEOUT = 5
 
+    # Interval between samples when profiling slow requests (only used if
+    # LSP_PROFILE_SLOW_REQUESTS is set).
+    PROFILE_SAMPLE_INTERVAL = 0.01
+
     def __init__(self, dispatcher, consumer, id_generator=lambda: str(uuid.uuid4())):
         """A JSON RPC endpoint for managing messages sent to/from the client.
 
@@ -71,6 +81,7 @@ class Endpoint(object):
 
         self._client_request_futures = {}
         self._server_request_futures = {}
+        self._pid = os.getpid()
 
         # i.e.: 5 to 15 workers.
         max_workers = min(15, (os.cpu_count() or 1) + 4)
@@ -81,7 +92,8 @@ class Endpoint(object):
 
     @implements(IEndPoint.notify)
     def notify(self, method: str, params=None):
-        log.debug("Sending notification: %s %s", method, params)
+        if log.is_enabled(LOG_LEVEL_DEBUG):
+            log.debug("Sending notification: %s %s", method, TruncatedPayload(params))
 
         message = {"jsonrpc": JSONRPC_VERSION, "method": method}
         if params is not None:
@@ -92,7 +104,13 @@ class Endpoint(object):
     @implements(IEndPoint.request)
     def request(self, method: str, params=None) -> IFuture:
         msg_id = self._id_generator()
-        log.debug("Sending request with id %s: %s %s", msg_id, method, params)
+        if log.is_enabled(LOG_LEVEL_DEBUG):
+            log.debug(
+                "Sending request with id %s: %s %s",
+                msg_id,
+                method,
+                TruncatedPayload(params),
+            )
 
         message = {"jsonrpc": JSONRPC_VERSION, "id": msg_id, "method": method}
         if params is not None:
@@ -127,19 +145,31 @@ class Endpoint(object):
             log.warning("Unknown message type %s", message)
             return
 
+        # Note: only create the TruncatedPayload if it'll be actually logged.
+        debug = log.is_enabled(LOG_LEVEL_DEBUG)
         if "id" not in message:
-            log.debug("Handling notification from client %s", message)
+            if debug:
+                log.debug(
+                    "Handling notification from client %s", TruncatedPayload(message)
+                )
             self._handle_notification(message["method"], message.get("params"))
         elif "method" not in message:
-            log.debug("Handling response from client %s", message)
+            if debug:
+                log.debug("Handling response from client %s", TruncatedPayload(message))
             self._handle_response(
                 message["id"], message.get("result"), message.get("error")
             )
         else:
             try:
-                log.debug("Handling request from client %s", message)
+                if debug:
+                    log.debug(
+                        "Handling request from client %s", TruncatedPayload(message)
+                    )
                 self._handle_request(
-                    message["id"], message["method"], message.get("params")
+                    message["id"],
+                    message["method"],
+                    message.get("params"),
+                    message.get("traceId"),
                 )
             except JsonRpcException as e:
                 log.exception("Failed to handle request %s", message["id"])
@@ -173,7 +203,8 @@ class Endpoint(object):
             return
 
         try:
-            handler_result = handler(params)
+            with tracing.span(f"notification:{method}"):
+                handler_result = handler(params)
         except Exception:  # pylint: disable=broad-except
             log.exception("Failed to handle notification %s: %s", method, params)
             return
@@ -219,7 +250,33 @@ class Endpoint(object):
         if request_future.cancel():
             log.debug("Cancelled request with id %s", msg_id)
 
-    def _call_checking_time(self, func, **kwargs):
+    def _call_checking_time(self, func, __trace_id__=None, __method__="", **kwargs):
+        from robocorp_ls_core.options import Setup
+
+        with tracing.trace_context(__trace_id__):
+            if Setup.options.PROFILE_SLOW_REQUESTS:
+                return self._call_profiling_if_slow(func, __method__, **kwargs)
+            return self._call_checking_time_in_trace(func, **kwargs)
+
+    def _call_profiling_if_slow(self, func, method, **kwargs):
+        from robocorp_ls_core import timeouts
+        from robocorp_ls_core.options import Setup
+        from robocorp_ls_core.sampling_profiler import SlowRequestProfiler
+        import threading
+
+        timeout_tracker = timeouts.TimeoutTracker.get_singleton()
+        profiler = SlowRequestProfiler(
+            threading.get_ident(), method, self.PROFILE_SAMPLE_INTERVAL
+        )
+        try:
+            with timeout_tracker.call_on_timeout(
+                Setup.options.PROFILE_SLOW_REQUESTS_THRESHOLD, profiler.start
+            ):
+                return self._call_checking_time_in_trace(func, **kwargs)
+        finally:
+            profiler.stop()
+
+    def _call_checking_time_in_trace(self, func, **kwargs):
         from robocorp_ls_core import timeouts
         import threading
         import traceback
@@ -264,17 +321,30 @@ class Endpoint(object):
         else:
             return func(**kwargs)
 
-    def _handle_request(self, msg_id, method, params):
+    def _handle_request(self, msg_id, method, params, trace_id=None):
         """Handle a request from the client."""
         import time
 
         initial_time = time.time()
+        start = time.perf_counter()
         try:
             handler = self._dispatcher[method]
         except KeyError:
             raise JsonRpcMethodNotFound.of(method)
 
-        handler_result = handler(params)
+        if trace_id is None:
+            trace_id = f"{self._pid}:{msg_id}"
+
+        with tracing.trace_context(trace_id):
+            handler_result = handler(params)
+
+        def record_request_time():
+            tracing.get_tracer().record(
+                f"request:{method}",
+                initial_time,
+                time.perf_counter() - start,
+                trace_id,
+            )
 
         if callable(handler_result):
             kwargs = {}
@@ -288,7 +358,8 @@ class Endpoint(object):
 
             if FORCE_NON_THREADED_VERSION:
                 # I.e.: non-threaded version without breaking api.
-                handler_result = handler_result(**kwargs)
+                with tracing.trace_context(trace_id):
+                    handler_result = handler_result(**kwargs)
                 log.debug(
                     "Got result from synchronous request handler (in %.2fs): %s",
                     time.time() - initial_time,
@@ -297,19 +368,28 @@ class Endpoint(object):
                 self._consumer(
                     {"jsonrpc": JSONRPC_VERSION, "id": msg_id, "result": handler_result}
                 )
+                record_request_time()
 
             else:
                 request_future = self._executor_service.submit(
-                    self._call_checking_time, handler_result, **kwargs
+                    self._call_checking_time,
+                    handler_result,
+                    __trace_id__=trace_id,
+                    __method__=method,
+                    **kwargs,
                 )
                 if monitor is not None:
                     request_future.__monitor__ = monitor
                 self._client_request_futures[msg_id] = request_future
-                request_future.add_done_callback(self._request_callback(msg_id))
+                request_future.add_done_callback(
+                    self._request_callback(msg_id, record_request_time)
+                )
         elif isinstance(handler_result, futures.Future):
             log.debug("Request handler is already a future %s", handler_result)
             self._client_request_futures[msg_id] = handler_result
-            handler_result.add_done_callback(self._request_callback(msg_id))
+            handler_result.add_done_callback(
+                self._request_callback(msg_id, record_request_time)
+            )
         else:
             log.debug(
                 "Got result from synchronous request handler (in %.2fs): %s",
@@ -319,8 +399,9 @@ class Endpoint(object):
             self._consumer(
                 {"jsonrpc": JSONRPC_VERSION, "id": msg_id, "result": handler_result}
             )
+            record_request_time()
 
-    def _request_callback(self, request_id):
+    def _request_callback(self, request_id, on_done=None):
         """Construct a request callback for the given request ID."""
 
         def callback(future):
@@ -331,6 +412,9 @@ class Endpoint(object):
                 message = {"jsonrpc": JSONRPC_VERSION, "id": request_id}
 
                 if future.cancelled():
+                    if getattr(future, "__content_modified__", False):
+                        # Cancelled because a newer request superseded it.
+                        raise JsonRpcContentModified()
                     raise JsonRpcRequestCancelled()
 
                 message["result"] = future.result()
@@ -345,6 +429,8 @@ class Endpoint(object):
                 message["error"] = JsonRpcInternalError.of(sys.exc_info()).to_dict()
 
             self._consumer(message)
+            if on_done is not None:
+                on_done()
 
         return callback
 
@@ -360,5 +446,10 @@ class Endpoint(object):
             log.debug("Received error response to message %s: %s", msg_id, error)
             request_future.set_exception(JsonRpcException.from_dict(error))
         else:
-            log.debug("Received result for message %s: %s", msg_id, result)
+            if log.is_enabled(LOG_LEVEL_DEBUG):
+                log.debug(
+                    "Received result for message %s: %s",
+                    msg_id,
+                    TruncatedPayload(result),
+                )
             request_future.set_result(result)
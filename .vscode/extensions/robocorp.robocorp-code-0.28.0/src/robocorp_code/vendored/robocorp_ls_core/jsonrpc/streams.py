@@ -15,7 +15,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import threading
-from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.robotframework_log import (
+    get_logger,
+    TruncatedPayload,
+    LOG_LEVEL_DEBUG,
+)
+from robocorp_ls_core import tracing
 from typing import Optional
 import json
 from robocorp_ls_core.options import BaseOptions
@@ -107,11 +112,12 @@ class JsonRpcStreamReader(object):
                     log.exception("Failed to parse JSON message %s", data)
                     continue
 
-                if isinstance(msg, dict):
-                    if msg.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
-                        log.debug("Read: %s", data)
-                else:
-                    log.debug("Read (non dict data): %s", data)
+                if log.is_enabled(LOG_LEVEL_DEBUG):
+                    if isinstance(msg, dict):
+                        if msg.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
+                            log.debug("Read: %s", TruncatedPayload(data))
+                    else:
+                        log.debug("Read (non dict data): %s", TruncatedPayload(data))
 
                 try:
                     message_consumer(msg)
@@ -138,21 +144,35 @@ class JsonRpcStreamWriter(object):
         with self._wfile_lock:
             self._wfile.close()
 
+    def _log_message(self, message) -> None:
+        if isinstance(message, dict):
+            if message.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
+                log.debug("Writing: %s", TruncatedPayload(message))
+        else:
+            log.debug("Writing (non dict message): %s", TruncatedPayload(message))
+
     def write(self, message):
+        """
+        :param message:
+            The message to be written. If it's `bytes` it's considered to be
+            the already json-encoded message (which is written as is).
+        """
         with self._wfile_lock:
             if self._wfile.closed:
                 log.debug("Unable to write %s (file already closed).", (message,))
                 return False
             try:
-                if isinstance(message, dict):
-                    if message.get("command") not in BaseOptions.HIDE_COMMAND_MESSAGES:
-                        log.debug("Writing: %s", message)
+                if isinstance(message, bytes):
+                    log.debug("Writing (encoded message): %s bytes", len(message))
+                    as_bytes = message
                 else:
-                    log.debug("Writing (non dict message): %s", message)
+                    if log.is_enabled(LOG_LEVEL_DEBUG):
+                        self._log_message(message)
 
-                body = json.dumps(message, **self._json_dumps_args)
+                    with tracing.span("json:serialize"):
+                        body = json.dumps(message, **self._json_dumps_args)
+                        as_bytes = body.encode("utf-8")
 
-                as_bytes = body.encode("utf-8")
                 stream = self._wfile
                 content_len_as_str = "Content-Length: %s\r\n\r\n" % len(as_bytes)
                 content_len_bytes = content_len_as_str.encode("ascii")
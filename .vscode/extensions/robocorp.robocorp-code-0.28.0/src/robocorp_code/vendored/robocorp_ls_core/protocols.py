@@ -165,6 +165,14 @@ class IIdMessageMatcher(Generic[T], Protocol):
     event: threading.Event
     msg: T
 
+    def add_done_callback(self, callback: Callable[[Any], None]) -> None:
+        """
+        :param callback:
+            Called with this message matcher when the message is received (in
+            the thread which reads the messages) or right away if it was
+            already received.
+        """
+
 
 COMMUNICATION_DROPPED = CommunicationDropped()
 
@@ -219,6 +227,15 @@ class ILanguageServerClientBase(IRequestCancellable, Protocol):
         :return _MessageMatcher:
         """
 
+    def request_async_encoded(
+        self, message_id, method_name: str, encoded_params: bytes
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        Same as `request_async` but the params are already json-encoded (see:
+        `client_base.encode_params`), so, the same encoded params may be sent
+        to multiple clients without being encoded again.
+        """
+
     def request(
         self,
         contents,
@@ -292,6 +309,13 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
         :Note: async complete.
         """
 
+    def forward_async_encoded(
+        self, method_name, encoded_params: bytes
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+
     def open(self, uri, version, source):
         pass
 
@@ -336,6 +360,13 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
         :Note: async complete.
         """
 
+    def request_source_format_range(
+        self, text_document, range, options
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+
     def request_signature_help(
         self, doc_uri: str, line: int, col: int
     ) -> Optional[IIdMessageMatcher]:
@@ -377,6 +408,17 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
         :Note: async complete.
         """
 
+    def request_internal_info(
+        self, include_trace_events: bool = False
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :param include_trace_events:
+            If True the spans kept by the tracer are also provided (in the
+            Chrome trace event format).
+
+        :Note: async complete.
+        """
+
     def request_evaluatable_expression(
         self, doc_uri: str, position: "PositionTypedDict"
     ) -> Optional[IIdMessageMatcher]:
@@ -594,6 +636,12 @@ class ILog(Protocol):
     def error(self, msg: str = "", *args: Any):
         pass  # same as exception
 
+    def is_enabled(self, log_level: int) -> bool:
+        """
+        :param log_level:
+            One of the LOG_LEVEL_XXX constants in robotframework_log.
+        """
+
 
 class IConfigProvider(Protocol):
     @property
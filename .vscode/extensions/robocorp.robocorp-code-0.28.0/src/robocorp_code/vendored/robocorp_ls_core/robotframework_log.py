@@ -19,6 +19,13 @@ Note that we have 3 levels:
 0: show only critical/exceptions
 1: show info
 2: show debug
+
+To log big payloads (i.e.: json messages) use:
+
+log.debug('Message: %s', TruncatedPayload(msg))
+
+So that the payload is only converted to a string if the level is enabled (and
+in that case the string is trimmed to MAX_LOG_PAYLOAD_SIZE chars).
 """
 import os.path
 import traceback
@@ -44,6 +51,70 @@ try:
 except:
     pass
 
+# Note: if <= 0 payloads are logged in full.
+MAX_LOG_PAYLOAD_SIZE = MAX_LOG_MSG_SIZE
+try:
+    MAX_LOG_PAYLOAD_SIZE = int(
+        os.environ.get("MAX_LOG_PAYLOAD_SIZE", MAX_LOG_PAYLOAD_SIZE)
+    )
+except:
+    pass
+
+LOG_LEVEL_CRITICAL = 0
+LOG_LEVEL_INFO = 1
+LOG_LEVEL_DEBUG = 2
+
+_payload_repr = None
+
+
+def _get_payload_repr():
+    global _payload_repr
+    if _payload_repr is None:
+        import reprlib
+
+        # Note: the limits are there so that the cost of converting a payload
+        # to a string is bounded (regardless of the payload size).
+        payload_repr = reprlib.Repr()
+        payload_repr.maxlevel = 5
+        payload_repr.maxdict = 30
+        payload_repr.maxlist = 30
+        payload_repr.maxtuple = 30
+        payload_repr.maxstring = 200
+        payload_repr.maxother = 200
+        _payload_repr = payload_repr
+    return _payload_repr
+
+
+class TruncatedPayload(object):
+    """
+    Wraps a payload to be logged so that it's only converted to a string when
+    the message is actually logged (and in that case the string is trimmed to
+    MAX_LOG_PAYLOAD_SIZE chars).
+    """
+
+    __slots__ = ["payload"]
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        payload = self.payload
+        max_size = MAX_LOG_PAYLOAD_SIZE
+        if max_size <= 0:
+            return str(_as_str(payload))
+
+        if isinstance(payload, (str, bytes)):
+            s = _as_str(payload)
+        else:
+            s = _get_payload_repr().repr(payload)
+
+        len_s = len(s)
+        if len_s > max_size:
+            s = f"{s[:max_size]} ... <trimmed {len_s} to {max_size}>"
+        return s
+
+    __repr__ = __str__
+
 
 class _LogConfig(object):
 
@@ -162,6 +233,13 @@ class _Logger(object):
     warn = warning = info
     error = exception
 
+    def is_enabled(self, log_level: int) -> bool:
+        """
+        :param log_level:
+            One of LOG_LEVEL_CRITICAL, LOG_LEVEL_INFO, LOG_LEVEL_DEBUG.
+        """
+        return _log_config.log_level >= log_level
+
     @property
     def level(self):
         # Note: return a level compatible with the logging.
@@ -1,12 +1,23 @@
 import os.path
 import sys
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Any
 
 from robocorp_ls_core.robotframework_log import get_logger
 
 
 log = get_logger(__name__)
 
+_lock = threading.Lock()
+
+# The maximum number of robotidy configurations kept in memory.
+_MAX_CACHED_ROBOTIDY_APIS = 5
+
+# config key -> RobotidyAPI (kept in the order of usage: the last is the most
+# recently used).
+_config_key_to_robotidy_api: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+
 
 def _import_robotidy():
     try:
@@ -24,9 +35,80 @@ def _import_robotidy():
     log.info("robotidy module: %s", robotidy)
 
 
-def robot_tidy_source_format(ast, dirname: str) -> Optional[str]:
+def _compute_config_key(dirname: str) -> Tuple[Any, ...]:
+    """
+    Provides a key which changes if the robotidy configuration used for the
+    given directory may have changed.
+    """
+    from robotidy.files import find_project_root
+
+    project_root = find_project_root((dirname,))
+    ret = [str(project_root)]
+    for config_name in ("robotidy.toml", "pyproject.toml"):
+        try:
+            stat = (project_root / config_name).stat()
+            ret.append((config_name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            ret.append((config_name, None))
+    return tuple(ret)
+
+
+def _get_robotidy_api(dirname: str):
+    """
+    Provides a RobotidyAPI (with its own transformers) configured for the
+    given directory.
+
+    The configured robotidy instances are cached (as the configuration is
+    read from the filesystem and transformers are loaded when it's created),
+    but as transformers may keep state while visiting a model, each call
+    receives a copy with new transformers.
+    """
+    import copy
+    from robotidy.api import RobotidyAPI
+
+    config_key = _compute_config_key(dirname)
+    with _lock:
+        robotidy_api = _config_key_to_robotidy_api.get(config_key)
+        if robotidy_api is not None:
+            _config_key_to_robotidy_api.move_to_end(config_key)
+
+    if robotidy_api is None:
+        robotidy_api = RobotidyAPI(dirname, None)
+        with _lock:
+            _config_key_to_robotidy_api[config_key] = robotidy_api
+            while len(_config_key_to_robotidy_api) > _MAX_CACHED_ROBOTIDY_APIS:
+                _config_key_to_robotidy_api.popitem(last=False)
+
+    ret = copy.copy(robotidy_api)
+    # Note: the transformers reference the formatting config, so, both are
+    # copied together.
+    ret.formatting_config, ret.transformers = copy.deepcopy(
+        (robotidy_api.formatting_config, robotidy_api.transformers)
+    )
+    return ret
+
+
+def robot_tidy_source_format(
+    ast, dirname: str, start_line: Optional[int] = None, end_line: Optional[int] = None
+) -> Optional[str]:
+    """
+    :param start_line:
+        If given, only statements starting at this (1-based) line or after it
+        are formatted.
+    :param end_line:
+        If given, only statements ending at this (1-based) line or before it
+        are formatted.
+    """
     _import_robotidy()
-    from robotidy.api import transform_model
 
-    transformed_model = transform_model(ast, dirname)
-    return transformed_model
+    robotidy_api = _get_robotidy_api(dirname)
+    formatting_config = robotidy_api.formatting_config
+    if start_line is not None:
+        formatting_config.start_line = start_line
+    if end_line is not None:
+        formatting_config.end_line = end_line
+    diff, _, new_model = robotidy_api.transform(ast)
+
+    if not diff:
+        return None
+    return new_model.text
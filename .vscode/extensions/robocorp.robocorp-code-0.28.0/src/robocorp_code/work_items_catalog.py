@@ -0,0 +1,160 @@
+"""
+Keeps an in-memory catalog of the work items available in the work items
+directories (i.e.: devdata/work-items-in and devdata/work-items-out).
+
+The catalog is updated incrementally: a work item folder is only checked
+again if it (or the work items directory) changed since the last listing
+(so, robots with thousands of recorded work items don't need to have each
+folder checked again whenever the work items are listed).
+
+Note that the contents of the work items (the payload json) are never
+loaded here, only the path to the json is provided.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from robocorp_code.protocols import WorkItem
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+WORK_ITEM_JSON_NAMES = ("work-items.json", "work-items.output.json")
+
+
+def sort_by_number_postfix(entry: WorkItem):
+    try:
+        return int(entry["name"].rsplit("-", 1)[-1])
+    except:
+        # That's ok, item just doesn't match our expected format.
+        return 9999999
+
+
+def _find_work_item(work_item_dir: Path) -> Optional[WorkItem]:
+    for json_name in WORK_ITEM_JSON_NAMES:
+        json_path = work_item_dir / json_name
+        if json_path.is_file():
+            return {"name": work_item_dir.name, "json_path": str(json_path)}
+    return None
+
+
+class _WorkItemFolderInfo(object):
+    __slots__ = ["mtime_ns", "work_item"]
+
+    def __init__(self, mtime_ns: int, work_item: Optional[WorkItem]):
+        self.mtime_ns = mtime_ns
+        self.work_item = work_item
+
+
+class _WorkItemsDirInfo(object):
+    def __init__(self):
+        self.mtime_ns = -1
+        self.name_to_folder_info: Dict[str, _WorkItemFolderInfo] = {}
+        self.sorted_work_items: List[WorkItem] = []
+
+
+class WorkItemsCatalog(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dir_to_info: Dict[Path, _WorkItemsDirInfo] = {}
+
+    def invalidate(self, work_items_dir: Optional[Path] = None) -> None:
+        with self._lock:
+            if work_items_dir is None:
+                self._dir_to_info.clear()
+            else:
+                self._dir_to_info.pop(work_items_dir, None)
+
+    def list_work_items(self, work_items_dir: Path) -> List[WorkItem]:
+        """
+        :return: the work items in the given directory sorted by the number
+        postfix in the name (i.e.: run-1, run-2, ...).
+        """
+        with self._lock:
+            try:
+                dir_mtime_ns = work_items_dir.stat().st_mtime_ns
+            except OSError:
+                self._dir_to_info.pop(work_items_dir, None)
+                return []
+
+            info = self._dir_to_info.get(work_items_dir)
+            if info is None:
+                info = self._dir_to_info[work_items_dir] = _WorkItemsDirInfo()
+
+            if dir_mtime_ns == info.mtime_ns:
+                # No folders were added/removed: just check the folders which
+                # changed (i.e.: the work item json was removed/replaced) or
+                # which still don't have a work item json (it's possible that
+                # it was just created and the json still wasn't written).
+                changed = self._update_known_folders(work_items_dir, info)
+            else:
+                changed = self._update_all_folders(work_items_dir, info)
+                info.mtime_ns = dir_mtime_ns
+
+            if changed:
+                work_items = [
+                    folder_info.work_item
+                    for folder_info in info.name_to_folder_info.values()
+                    if folder_info.work_item is not None
+                ]
+                work_items.sort(key=sort_by_number_postfix)
+                info.sorted_work_items = work_items
+
+            return list(info.sorted_work_items)
+
+    def _update_known_folders(
+        self, work_items_dir: Path, info: _WorkItemsDirInfo
+    ) -> bool:
+        changed = False
+        for name, folder_info in info.name_to_folder_info.items():
+            folder = work_items_dir / name
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+
+            if mtime_ns != folder_info.mtime_ns or folder_info.work_item is None:
+                folder_info.mtime_ns = mtime_ns
+                work_item = _find_work_item(folder) if mtime_ns != -1 else None
+                if work_item != folder_info.work_item:
+                    folder_info.work_item = work_item
+                    changed = True
+        return changed
+
+    def _update_all_folders(
+        self, work_items_dir: Path, info: _WorkItemsDirInfo
+    ) -> bool:
+        changed = False
+        old_name_to_folder_info = info.name_to_folder_info
+        new_name_to_folder_info: Dict[str, _WorkItemFolderInfo] = {}
+        try:
+            with os.scandir(work_items_dir) as dir_entries:
+                for dir_entry in dir_entries:
+                    try:
+                        if not dir_entry.is_dir():
+                            continue
+                        mtime_ns = dir_entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+
+                    name = dir_entry.name
+                    folder_info = old_name_to_folder_info.get(name)
+                    if folder_info is None or folder_info.mtime_ns != mtime_ns:
+                        folder_info = _WorkItemFolderInfo(
+                            mtime_ns, _find_work_item(work_items_dir / name)
+                        )
+                        changed = True
+                    elif folder_info.work_item is None:
+                        work_item = _find_work_item(work_items_dir / name)
+                        if work_item is not None:
+                            folder_info.work_item = work_item
+                            changed = True
+                    new_name_to_folder_info[name] = folder_info
+        except OSError:
+            log.exception("Error listing work items in: %s", work_items_dir)
+
+        if len(new_name_to_folder_info) != len(old_name_to_folder_info):
+            changed = True
+        info.name_to_folder_info = new_name_to_folder_info
+        return changed
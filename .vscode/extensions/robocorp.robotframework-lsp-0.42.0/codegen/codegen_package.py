@@ -203,6 +203,11 @@ def get_json_contents():
                         "default": False,
                         "description": "Collecting workspace symbols can be resource intensive on big projects and may slow down code-completion, in this case, it's possible collect info only for open files on big projects.",
                     },
+                    "robot.nonOpenDocsAstCache.maxMemoryMB": {
+                        "type": "number",
+                        "default": 200,
+                        "description": "Memory budget (estimated, in MB) for the parsed contents of files which aren't open in the editor (loaded to compute workspace symbols, references, etc). When exceeded the least recently used ones are discarded (and parsed again if needed).",
+                    },
                     "robot.editor.4spacesTab": {
                         "type": "boolean",
                         "default": True,
@@ -126,12 +126,12 @@ class _FullIndexer(_AbstractIndexer):
             if ast is None:
                 raise RuntimeError("AST already garbage collected.")
 
-            for stack, node in _iter_nodes(ast):
+            for stack, node in _iter_nodes_with_shared_stack(ast):
                 lst = self._name_to_node_info_lst.get(node.__class__.__name__)
                 if lst is None:
                     lst = self._name_to_node_info_lst[node.__class__.__name__] = []
 
-                lst.append(NodeInfo(tuple(stack), node))
+                lst.append(NodeInfo(stack, node))
             self._indexed_full = True
 
     def iter_indexed(self, clsname: str) -> Iterator[NodeInfo]:
@@ -343,7 +343,6 @@ if typing.TYPE_CHECKING:
     class _AST_CLASS(INode, Protocol):
         pass
 
-
 else:
     # We know that the AST we're dealing with is the INode.
     # We can't use runtime_checkable on Python 3.7 though.
@@ -392,6 +391,37 @@ def _iter_nodes(
                 yield stack, value
 
 
+def _iter_nodes_with_shared_stack(
+    node,
+    parent_stack: Tuple[INode, ...] = (),
+    stack: Optional[Tuple[INode, ...]] = (),
+) -> Iterator[Tuple[Tuple[INode, ...], INode]]:
+    """
+    Same as `_iter_nodes(node, recursive=True)` but the yielded stack is an
+    immutable tuple which is shared by all the siblings (so, it can be kept
+    without a copy and a tuple is only created for nodes which have children
+    instead of a tuple for each node).
+
+    :param stack:
+        The stack for the children of the given node (if None it's lazily
+        created as `parent_stack + (node,)` when the first child is found).
+    """
+    for _field, value in ast_module.iter_fields(node):
+        if isinstance(value, list):
+            children = value
+        elif isinstance(value, _AST_CLASS):
+            children = (value,)
+        else:
+            continue
+
+        for item in children:
+            if isinstance(item, _AST_CLASS):
+                if stack is None:
+                    stack = parent_stack + (node,)
+                yield stack, item
+                yield from _iter_nodes_with_shared_stack(item, stack, None)
+
+
 def iter_all_nodes_recursive(node: INode) -> Iterator[Tuple[List[INode], INode]]:
     """
     This function will iterate over all the nodes. Use only if there's no
@@ -559,8 +589,14 @@ def iter_all_nodes(ast, recursive=True) -> Iterator[NodeInfo]:
     Use one of the filtered APIs whenever possible as those are cached
     by the type.
     """
-    for stack, node in _iter_nodes(ast, recursive=recursive):
-        yield NodeInfo(tuple(stack), node)
+    if recursive:
+        yield from (
+            NodeInfo(stack, node) for stack, node in _iter_nodes_with_shared_stack(ast)
+        )
+    else:
+        stack: Tuple[INode, ...] = ()
+        for _stack, node in _iter_nodes(ast, recursive=False):
+            yield NodeInfo(stack, node)
 
 
 def is_library_node_info(node_info: NodeInfo) -> bool:
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, List, Any, Iterator
 
 from robocorp_ls_core.protocols import check_implements
 from robocorp_ls_core.robotframework_log import get_logger
@@ -10,7 +10,7 @@ from robotframework_ls.impl.protocols import (
     ILibraryDoc,
     INode,
 )
-from robocorp_ls_core.lsp import DiagnosticSeverity, DiagnosticTag
+from robocorp_ls_core.lsp import DiagnosticSeverity, DiagnosticTag, Error
 
 
 log = get_logger(__name__)
@@ -18,21 +18,21 @@ log = get_logger(__name__)
 
 class _KeywordContainer(object):
     def __init__(self) -> None:
+        from robotframework_ls.impl.embedded_args_index import (
+            EmbeddedArgsKeywordIndex,
+        )
+
         self._name_to_keyword: Dict[str, IKeywordFound] = {}
-        self._names_with_variables: Dict[str, IKeywordFound] = {}
+        self._embedded_args_index = EmbeddedArgsKeywordIndex()
 
     def add_keyword(self, keyword_found: IKeywordFound) -> None:
-        from robotframework_ls.impl.text_utilities import normalize_robot_name
-
-        normalized_name = normalize_robot_name(keyword_found.keyword_name)
+        normalized_name = keyword_found.normalized_keyword_name
         self._name_to_keyword[normalized_name] = keyword_found
 
-        if "{" in normalized_name:
-            self._names_with_variables[normalized_name] = keyword_found
+        if keyword_found.embedded_args_matcher is not None:
+            self._embedded_args_index.add_keyword(keyword_found)
 
     def get_keyword(self, normalized_keyword_name: str) -> Optional[IKeywordFound]:
-        from robotframework_ls.impl.text_utilities import matches_robot_keyword
-
         keyword_found = self._name_to_keyword.get(normalized_keyword_name)
 
         if keyword_found is not None:
@@ -40,11 +40,154 @@ class _KeywordContainer(object):
 
         # We do not have an exact match, still, we need to check if we may
         # have a match in keywords that accept variables.
-        for name, keyword_found in self._names_with_variables.items():
-            if matches_robot_keyword(normalized_keyword_name, name):
-                return keyword_found
+        return self._embedded_args_index.get_keyword(normalized_keyword_name)
 
-        return None
+
+# The top-level blocks which are analyzed separately (for other sections the
+# section is the block).
+_SECTIONS_WITH_BLOCKS = ("TestCaseSection", "KeywordSection")
+
+
+class _BlockAnalysisContext(object):
+    """
+    The information the analysis of the keyword usages in a block depends on
+    (aside from the block contents).
+
+    Note: the dependency graph and library docs are compared by identity (when
+    something changes a new instance is created).
+    """
+
+    def __init__(
+        self,
+        dependency_graph: Any,
+        library_docs: List[ILibraryDoc],
+        keyword_definitions: tuple,
+        settings: tuple,
+    ):
+        self.dependency_graph = dependency_graph
+        self.library_docs = library_docs
+        self.keyword_definitions = keyword_definitions
+        self.settings = settings
+
+    def is_same(self, other: "_BlockAnalysisContext") -> bool:
+        if self.dependency_graph is not other.dependency_graph:
+            return False
+        if len(self.library_docs) != len(other.library_docs):
+            return False
+        for library_doc, other_library_doc in zip(
+            self.library_docs, other.library_docs
+        ):
+            if library_doc is not other_library_doc:
+                return False
+        return (
+            self.keyword_definitions == other.keyword_definitions
+            and self.settings == other.settings
+        )
+
+
+class _DocAnalysisCacheEntry(object):
+    def __init__(
+        self,
+        context: _BlockAnalysisContext,
+        block_text_to_errors: Dict[str, List[Error]],
+    ):
+        self.context = context
+        # Note: errors have lines relative to the start of the block.
+        self.block_text_to_errors = block_text_to_errors
+
+
+class AnalysisBlocksCache(object):
+    """
+    Keeps the errors found in the keyword usages of each top-level block
+    (test case / keyword / section) of the documents linted, so, only blocks
+    whose text (or dependencies) changed need to be analyzed again.
+    """
+
+    def __init__(self, max_docs: int = 50) -> None:
+        import threading
+        from collections import OrderedDict
+
+        self._lock = threading.Lock()
+        self._max_docs = max_docs
+        self._doc_uri_to_entry: "OrderedDict[str, _DocAnalysisCacheEntry]" = (
+            OrderedDict()
+        )
+        self.blocks_reused = 0
+        self.blocks_analyzed = 0
+
+    def get_block_text_to_errors(
+        self, doc_uri: str, context: _BlockAnalysisContext
+    ) -> Dict[str, List[Error]]:
+        with self._lock:
+            entry = self._doc_uri_to_entry.get(doc_uri)
+            if entry is None or not entry.context.is_same(context):
+                return {}
+            return entry.block_text_to_errors
+
+    def set_block_text_to_errors(
+        self,
+        doc_uri: str,
+        context: _BlockAnalysisContext,
+        block_text_to_errors: Dict[str, List[Error]],
+    ) -> None:
+        with self._lock:
+            self._doc_uri_to_entry[doc_uri] = _DocAnalysisCacheEntry(
+                context, block_text_to_errors
+            )
+            self._doc_uri_to_entry.move_to_end(doc_uri)
+            while len(self._doc_uri_to_entry) > self._max_docs:
+                self._doc_uri_to_entry.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._doc_uri_to_entry.clear()
+
+
+def _iter_blocks(ast) -> Iterator[Any]:
+    for section in ast.sections:
+        if section.__class__.__name__ in _SECTIONS_WITH_BLOCKS:
+            yield from section.body
+        else:
+            yield section
+
+
+def _get_block_text(lines, block) -> str:
+    return "".join(lines[block.lineno - 1 : block.end_lineno])
+
+
+def _compute_keyword_definitions_key(ast) -> tuple:
+    """
+    Provides what's used from the keywords in the current document when
+    analyzing the keyword usages (name, arguments and documentation -- used
+    to know if it's deprecated).
+    """
+    from robotframework_ls.impl import ast_utils
+
+    ret = []
+    for node_info in ast_utils.iter_keywords(ast):
+        keyword_node = node_info.node
+        definition = [keyword_node.name]
+        for node in keyword_node.body:
+            if node.__class__.__name__ in ("Arguments", "Documentation"):
+                definition.append(tuple(t.value for t in node.tokens))
+        ret.append(tuple(definition))
+    return tuple(ret)
+
+
+def _shift_errors(errors: List[Error], delta: int) -> List[Error]:
+    ret = []
+    for error in errors:
+        new_error = Error(
+            error.msg,
+            (error.start[0] + delta, error.start[1]),
+            (error.end[0] + delta, error.end[1]),
+            error.severity,
+        )
+        tags = getattr(error, "tags", None)
+        if tags:
+            new_error.tags = tags
+        ret.append(new_error)
+    return ret
 
 
 class _AnalysisKeywordsCollector(object):
@@ -180,12 +323,17 @@ class _AnalysisKeywordsCollector(object):
         _: IKeywordCollector = check_implements(self)
 
 
-def collect_analysis_errors(initial_completion_context):
+def collect_analysis_errors(
+    initial_completion_context,
+    analysis_blocks_cache: Optional[AnalysisBlocksCache] = None,
+):
+    """
+    :param analysis_blocks_cache:
+        If given, the errors in the keyword usages of the top-level blocks
+        which didn't change since the last analysis are reused.
+    """
     from robotframework_ls.impl import ast_utils
-    from robotframework_ls.impl.ast_utils import create_error_from_node
     from robotframework_ls.impl.collect_keywords import collect_keywords
-    from robotframework_ls.impl.text_utilities import normalize_robot_name
-    from robotframework_ls.impl.text_utilities import contains_variable_text
     from robotframework_ls.impl.keyword_argument_analysis import (
         UsageInfoForKeywordArgumentAnalysis,
     )
@@ -193,12 +341,14 @@ def collect_analysis_errors(initial_completion_context):
 
     errors = []
     config = initial_completion_context.config
+    resolved_library_docs: List[ILibraryDoc] = []
 
     def on_resolved_library(
         completion_context: ICompletionContext,
         library_node: Optional[INode],
         library_doc: ILibraryDoc,
     ):
+        resolved_library_docs.append(library_doc)
         if library_node is None:
             return
 
@@ -216,7 +366,7 @@ def collect_analysis_errors(initial_completion_context):
             return
 
         from robotframework_ls.impl.keyword_argument_analysis import (
-            KeywordArgumentAnalysis,
+            get_keyword_argument_analysis,
         )
 
         library_args = []
@@ -225,7 +375,7 @@ def collect_analysis_errors(initial_completion_context):
             library_args = keyword_doc.args
 
         # Ok, we found the keyword, let's check if the arguments are correct.
-        keyword_argument_analysis = KeywordArgumentAnalysis(library_args)
+        keyword_argument_analysis = get_keyword_argument_analysis(library_args)
 
         name_token = library_node.get_token(Token.NAME)
         if name_token is not None:
@@ -319,6 +469,111 @@ def collect_analysis_errors(initial_completion_context):
     collect_keywords(initial_completion_context, collector)
 
     ast = initial_completion_context.get_ast()
+    if analysis_blocks_cache is None:
+        errors.extend(
+            _collect_keyword_usage_errors(
+                initial_completion_context, collector, ast, MAX_ERRORS - len(errors)
+            )
+        )
+        return errors
+
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS,
+        OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS,
+    )
+
+    settings: tuple = ()
+    if config is not None:
+        settings = (
+            config.get_setting(OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS, bool, True),
+            config.get_setting(OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS, bool, True),
+        )
+
+    doc = initial_completion_context.doc
+    context = _BlockAnalysisContext(
+        initial_completion_context.collect_dependency_graph(),
+        resolved_library_docs,
+        _compute_keyword_definitions_key(ast),
+        settings,
+    )
+    old_block_text_to_errors = analysis_blocks_cache.get_block_text_to_errors(
+        doc.uri, context
+    )
+    new_block_text_to_errors: Dict[str, List[Error]] = {}
+
+    lines = doc.get_internal_lines()
+    for block in _iter_blocks(ast):
+        if len(errors) >= MAX_ERRORS:
+            break
+        initial_completion_context.check_cancelled()
+
+        block_text = _get_block_text(lines, block)
+        block_errors = new_block_text_to_errors.get(block_text)
+        if block_errors is None:
+            block_errors = old_block_text_to_errors.get(block_text)
+            if block_errors is None:
+                analysis_blocks_cache.blocks_analyzed += 1
+                block_errors = _shift_errors(
+                    _collect_keyword_usage_errors(
+                        initial_completion_context, collector, block, MAX_ERRORS
+                    ),
+                    -(block.lineno - 1),
+                )
+            else:
+                analysis_blocks_cache.blocks_reused += 1
+            new_block_text_to_errors[block_text] = block_errors
+        else:
+            analysis_blocks_cache.blocks_reused += 1
+
+        errors.extend(_shift_errors(block_errors, block.lineno - 1))
+
+    analysis_blocks_cache.set_block_text_to_errors(
+        doc.uri, context, new_block_text_to_errors
+    )
+    del errors[MAX_ERRORS:]
+    return errors
+
+
+def _collect_keyword_usage_errors(
+    initial_completion_context: ICompletionContext,
+    collector: _AnalysisKeywordsCollector,
+    ast,
+    max_errors: int,
+) -> List[Error]:
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.ast_utils import create_error_from_node
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+    from robotframework_ls.impl.text_utilities import contains_variable_text
+    from robotframework_ls.impl.keyword_argument_analysis import (
+        UsageInfoForKeywordArgumentAnalysis,
+    )
+    from robotframework_ls.impl.keyword_argument_analysis import (
+        KeywordArgumentAnalysis,
+    )
+    from robotframework_ls.impl.keyword_argument_analysis import (
+        get_keyword_argument_analysis,
+    )
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS,
+    )
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS,
+    )
+    from robot.api import Token
+
+    errors: List[Error] = []
+    config = initial_completion_context.config
+    lint_undefined_keywords = config is None or config.get_setting(
+        OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS, bool, True
+    )
+    lint_keyword_call_arguments = config is None or config.get_setting(
+        OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS, bool, True
+    )
+
+    # All the usages of the same keyword share the same analysis.
+    # id(keyword_found) -> analysis
+    keyword_found_id_to_analysis: Dict[int, KeywordArgumentAnalysis] = {}
+
     for keyword_usage_info in ast_utils.iter_keyword_usage_tokens(
         ast, collect_args_as_keywords=True
     ):
@@ -329,13 +584,7 @@ def collect_analysis_errors(initial_completion_context):
         keyword_found = collector.get_keyword(normalized_name)
         try:
             if not keyword_found:
-                from robotframework_ls.impl.robot_lsp_constants import (
-                    OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS,
-                )
-
-                if config is not None and not config.get_setting(
-                    OPTION_ROBOT_LINT_UNDEFINED_KEYWORDS, bool, True
-                ):
+                if not lint_undefined_keywords:
                     continue
 
                 node = keyword_usage_info.node
@@ -347,23 +596,20 @@ def collect_analysis_errors(initial_completion_context):
                 errors.append(error)
 
             else:
-                from robotframework_ls.impl.robot_lsp_constants import (
-                    OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS,
-                )
-
-                if config is not None and not config.get_setting(
-                    OPTION_ROBOT_LINT_KEYWORD_CALL_ARGUMENTS, bool, True
-                ):
+                if not lint_keyword_call_arguments:
                     continue
 
-                from robotframework_ls.impl.keyword_argument_analysis import (
-                    KeywordArgumentAnalysis,
-                )
-
                 # Ok, we found the keyword, let's check if the arguments are correct.
-                keyword_argument_analysis = KeywordArgumentAnalysis(
-                    keyword_found.keyword_args
+                keyword_argument_analysis = keyword_found_id_to_analysis.get(
+                    id(keyword_found)
                 )
+                if keyword_argument_analysis is None:
+                    keyword_argument_analysis = get_keyword_argument_analysis(
+                        keyword_found.keyword_args
+                    )
+                    keyword_found_id_to_analysis[
+                        id(keyword_found)
+                    ] = keyword_argument_analysis
 
                 keyword_token = None
                 if keyword_token is None:
@@ -388,7 +634,7 @@ def collect_analysis_errors(initial_completion_context):
                     error.tags = [DiagnosticTag.Deprecated]
                     errors.append(error)
 
-            if len(errors) >= MAX_ERRORS:
+            if len(errors) >= max_errors:
                 # i.e.: Collect at most 100 errors
                 break
         except:
@@ -11,14 +11,29 @@ from robotframework_ls.impl.protocols import (
     LibraryDependencyInfo,
     AbstractKeywordCollector,
 )
-from typing import Sequence, List, Dict, Optional, Iterator
-from robotframework_ls.impl.text_utilities import build_keyword_docs_with_signature
+from typing import Sequence, List, Dict, Optional, Iterator, Tuple, Callable, Any
+from robotframework_ls.impl.text_utilities import (
+    build_keyword_docs_with_signature,
+    normalize_robot_name,
+    get_embedded_args_matcher,
+)
 from robocorp_ls_core.lsp import MarkupContentTypedDict, MarkupKind
 
 
 log = get_logger(__name__)
 
 
+def _normalize_name(keyword_name: str) -> Tuple[str, Optional[Callable[[str], Any]]]:
+    """
+    :return: the normalized keyword name and the matcher for the embedded
+    arguments (None if the keyword doesn't have embedded arguments).
+    """
+    normalized_name = normalize_robot_name(keyword_name)
+    if "{" in normalized_name:
+        return normalized_name, get_embedded_args_matcher(normalized_name)
+    return normalized_name, None
+
+
 class _KeywordFoundFromAst(object):
 
     __slots__ = [
@@ -29,6 +44,8 @@ class _KeywordFoundFromAst(object):
         "completion_context",
         "completion_item_kind",
         "_name_token",
+        "normalized_keyword_name",
+        "embedded_args_matcher",
         "__instance_cache__",
     ]
 
@@ -52,6 +69,9 @@ class _KeywordFoundFromAst(object):
         self._keyword_args = keyword_args
         self.completion_context = completion_context
         self.completion_item_kind = completion_item_kind
+        self.normalized_keyword_name, self.embedded_args_matcher = _normalize_name(
+            keyword_name
+        )
 
     @property
     def keyword_name(self):
@@ -159,6 +179,8 @@ class _KeywordFoundFromLibrary(object):
         "_keyword_args",
         "completion_context",
         "completion_item_kind",
+        "normalized_keyword_name",
+        "embedded_args_matcher",
         "__instance_cache__",
     ]
 
@@ -181,6 +203,9 @@ class _KeywordFoundFromLibrary(object):
         self.completion_context = completion_context
         self.completion_item_kind = completion_item_kind
         self._library_alias = library_alias
+        self.normalized_keyword_name, self.embedded_args_matcher = _normalize_name(
+            keyword_name
+        )
 
     @property
     def keyword_name(self):
@@ -202,11 +227,9 @@ class _KeywordFoundFromLibrary(object):
     def resource_name(self):
         return None
 
-    @instance_cache
     def is_deprecated(self):
-        from robotframework_ls.impl import text_utilities
-
-        return text_utilities.has_deprecated_text(self._keyword_doc.doc)
+        # Note: doesn't need to load the doc (which may be loaded on demand).
+        return self._keyword_doc.deprecated
 
     @property  # type: ignore
     @instance_cache
@@ -424,6 +447,15 @@ def _collect_libraries_keywords(
 
 def _collect_from_context(
     completion_context: ICompletionContext, collector: IKeywordCollector
+):
+    from robocorp_ls_core import tracing
+
+    with tracing.span("keywords:collect"):
+        _collect_from_context_in_span(completion_context, collector)
+
+
+def _collect_from_context_in_span(
+    completion_context: ICompletionContext, collector: IKeywordCollector
 ):
     dependency_graph = completion_context.collect_dependency_graph()
 
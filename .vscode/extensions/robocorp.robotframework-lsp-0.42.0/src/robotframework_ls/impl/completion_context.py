@@ -695,8 +695,10 @@ class CompletionContext(object):
         from robotframework_ls.impl.completion_context_dependency_graph import (
             CompletionContextDependencyGraph,
         )
+        from robocorp_ls_core import tracing
 
-        return CompletionContextDependencyGraph.from_completion_context(self)
+        with tracing.span("dependency_graph:build"):
+            return CompletionContextDependencyGraph.from_completion_context(self)
 
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
@@ -1,4 +1,4 @@
-from typing import Iterator, Tuple, Optional, Deque, Dict, Sequence, List
+from typing import Iterator, Tuple, Optional, Deque, Dict, Sequence, List, Iterable
 
 from robocorp_ls_core.ordered_set import OrderedSet
 from robotframework_ls.impl.protocols import (
@@ -45,6 +45,57 @@ class _Memo(object):
         return False
 
 
+class _DocImportsInfo(object):
+    """
+    The imports (libraries, resources and variables) of a single (non-root)
+    document.
+
+    When the imports of a document don't use variables their resolution only
+    depends on the document itself (and on the configuration), so, this
+    information may be shared among the dependency graphs of different root
+    documents (i.e.: a resource imported by many suites only needs to have its
+    imports resolved once).
+    """
+
+    __slots__ = [
+        "doc",
+        "library_infos",
+        "resource_imports_as_docs",
+        "variable_imports_as_docs",
+    ]
+
+    def __init__(
+        self,
+        doc: IRobotDocument,
+        library_infos: Tuple[LibraryDependencyInfo, ...],
+        resource_imports_as_docs: Tuple[
+            Tuple[IResourceImportNode, Optional[IRobotDocument]], ...
+        ],
+        variable_imports_as_docs: Tuple[IRobotDocument, ...],
+    ):
+        self.doc = doc
+        self.library_infos = library_infos
+        self.resource_imports_as_docs = resource_imports_as_docs
+        self.variable_imports_as_docs = variable_imports_as_docs
+
+    def is_fully_resolved(self) -> bool:
+        for _resource_import_node, resource_doc in self.resource_imports_as_docs:
+            if resource_doc is None:
+                return False
+        return True
+
+    def iter_dependency_uris(self) -> Iterator[str]:
+        """
+        Provides the uris which invalidate this info when changed.
+        """
+        yield self.doc.uri
+        for _resource_import_node, resource_doc in self.resource_imports_as_docs:
+            if resource_doc is not None:
+                yield resource_doc.uri
+        for variable_doc in self.variable_imports_as_docs:
+            yield variable_doc.uri
+
+
 class CompletionContextDependencyGraph:
     """
     This class is used to map dependencies from a given document
@@ -158,28 +209,55 @@ class CompletionContextDependencyGraph:
             # it's used in the cache key when checking so it won't be a match).
             return False
 
-        return (
+        if (
             uri in self._doc_uri_to_library_infos
             or uri in self._doc_uri_to_resource_imports
             or uri in self._doc_uri_to_variable_imports
-        )
+        ):
+            return True
+
+        # The variables files (i.e.: .py/.yaml) don't have an entry of their
+        # own, so, check whether it's imported.
+        for variable_imports in self._doc_uri_to_variable_imports.values():
+            for variable_doc in variable_imports:
+                if variable_doc.uri == uri:
+                    return True
+        return False
+
+    def iter_dependency_uris(self) -> Iterator[str]:
+        """
+        Provides the uris for which do_invalidate_on_uri_change(uri) would
+        return True.
+        """
+        root_uri = self.get_root_doc().uri
+        seen = {root_uri}
+        for dct in (
+            self._doc_uri_to_library_infos,
+            self._doc_uri_to_resource_imports,
+            self._doc_uri_to_variable_imports,
+        ):
+            for uri in dct:
+                if uri not in seen:
+                    seen.add(uri)
+                    yield uri
+
+        for variable_imports in self._doc_uri_to_variable_imports.values():
+            for variable_doc in variable_imports:
+                uri = variable_doc.uri
+                if uri not in seen:
+                    seen.add(uri)
+                    yield uri
 
     @classmethod
-    def _collect_library_info_from_completion_context(
-        cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
-    ) -> OrderedSet[LibraryDependencyInfo]:
+    def _iter_library_infos_from_completion_context(
+        cls, curr_ctx: ICompletionContext
+    ) -> Iterator[LibraryDependencyInfo]:
         from robotframework_ls.impl import ast_utils
         from robot.api import Token
 
         # Collect libraries information
         libraries = curr_ctx.get_imported_libraries()
 
-        new_library_infos: OrderedSet[LibraryDependencyInfo] = OrderedSet()
-        if is_root_context:
-            new_library_infos.add(
-                LibraryDependencyInfo(BUILTIN_LIB, None, True, None, None)
-            )
-
         for library in libraries:
             name_tok = library.get_token(Token.NAME)
 
@@ -188,25 +266,62 @@ class CompletionContextDependencyGraph:
                 args = ast_utils.get_library_arguments_serialized(library)
                 node = library
 
-                lib_info = LibraryDependencyInfo(
+                yield LibraryDependencyInfo(
                     curr_ctx.token_value_resolving_variables(name_tok),
                     alias,
                     False,
                     args,
                     node,
                 )
-                if not memo.complete_for_library(lib_info.name, lib_info.alias):
-                    continue
 
-                new_library_infos.add(lib_info)
+    @classmethod
+    def _filter_library_infos(
+        cls,
+        library_infos: Iterable[LibraryDependencyInfo],
+        is_root_context: bool,
+        memo: _Memo,
+    ) -> OrderedSet[LibraryDependencyInfo]:
+        new_library_infos: OrderedSet[LibraryDependencyInfo] = OrderedSet()
+        if is_root_context:
+            new_library_infos.add(
+                LibraryDependencyInfo(BUILTIN_LIB, None, True, None, None)
+            )
+
+        for lib_info in library_infos:
+            if not memo.complete_for_library(lib_info.name, lib_info.alias):
+                continue
+
+            new_library_infos.add(lib_info)
         return new_library_infos
 
+    @classmethod
+    def _collect_library_info_from_completion_context(
+        cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
+    ) -> OrderedSet[LibraryDependencyInfo]:
+        return cls._filter_library_infos(
+            cls._iter_library_infos_from_completion_context(curr_ctx),
+            is_root_context,
+            memo,
+        )
+
     @classmethod
     def _collect_resource_info_from_completion_context(
         cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
+    ):
+        return cls._filter_resource_infos(
+            curr_ctx.get_resource_imports_as_docs(), is_root_context, memo
+        )
+
+    @classmethod
+    def _filter_resource_infos(
+        cls,
+        resource_imports_as_docs: Sequence[
+            Tuple[IResourceImportNode, Optional[IRobotDocument]]
+        ],
+        is_root_context: bool,
+        memo: _Memo,
     ):
         # Collect related resource imports information.
-        resource_imports_as_docs = curr_ctx.get_resource_imports_as_docs()
         new_resource_infos: List[
             Tuple[IResourceImportNode, Optional[IRobotDocument]]
         ] = []
@@ -224,14 +339,70 @@ class CompletionContextDependencyGraph:
     def _collect_variable_info_from_completion_context(
         cls, curr_ctx: ICompletionContext, is_root_context: bool, memo: _Memo
     ):
+        return cls._filter_variable_infos(curr_ctx.get_variable_imports_as_docs(), memo)
 
+    @classmethod
+    def _filter_variable_infos(
+        cls, variable_imports_as_docs: Iterable[IRobotDocument], memo: _Memo
+    ):
         new_variable_imports: List[IRobotDocument] = []
-        for variable_import in curr_ctx.get_variable_imports_as_docs():
+        for variable_import in variable_imports_as_docs:
             if memo.follow_import_variables(variable_import.uri):
                 new_variable_imports.append(variable_import)
 
         return new_variable_imports
 
+    @classmethod
+    def _imports_use_variables(cls, ctx: ICompletionContext) -> bool:
+        from robot.api import Token
+        from robotframework_ls.impl.text_utilities import contains_variable_text
+
+        for import_nodes in (
+            ctx.get_imported_libraries(),
+            ctx.get_resource_imports(),
+            ctx.get_variable_imports(),
+        ):
+            for import_node in import_nodes:
+                name_tok = import_node.get_token(Token.NAME)
+                if name_tok is None:
+                    continue
+                # Note: ${CURDIR} only depends on the document itself.
+                name = name_tok.value.replace("${CURDIR}", "")
+                if contains_variable_text(name):
+                    return True
+        return False
+
+    @classmethod
+    def _get_doc_imports_info(
+        cls,
+        caches: ICompletionContextWorkspaceCaches,
+        root_ctx: ICompletionContext,
+        doc: IRobotDocument,
+        invalidation_tracker,
+    ) -> _DocImportsInfo:
+        doc_imports_info = caches.get_cached_doc_imports_info(doc.uri)
+        if doc_imports_info is not None and doc_imports_info.doc is doc:
+            return doc_imports_info
+
+        ctx = root_ctx.create_copy(doc)
+        doc_imports_info = _DocImportsInfo(
+            doc,
+            tuple(cls._iter_library_infos_from_completion_context(ctx)),
+            ctx.get_resource_imports_as_docs(),
+            ctx.get_variable_imports_as_docs(),
+        )
+
+        # If some import couldn't be resolved we don't cache it (as we don't
+        # know which file would need to be created to make it valid).
+        # Imports which use variables also aren't cached as the variables are
+        # resolved with the configuration of the root context (so, the result
+        # could be different for another root).
+        if doc_imports_info.is_fully_resolved() and not cls._imports_use_variables(ctx):
+            caches.cache_doc_imports_info(
+                doc.uri, doc_imports_info, invalidation_tracker
+            )
+        return doc_imports_info
+
     @classmethod
     def from_completion_context(cls, completion_context: ICompletionContext):
         from collections import deque
@@ -311,52 +482,63 @@ class CompletionContextDependencyGraph:
                 # Variables don't need any change as we don't store the nodes.
                 return found
 
-            completion_context_stack: Deque[ICompletionContext] = deque()
-            completion_context_stack.append(completion_context)
+            docs_stack: Deque[IRobotDocument] = deque()
+            docs_stack.append(completion_context.doc)
 
             is_root_context = True
 
             # Mark as being followed.
             memo.follow_import(completion_context.doc.uri)
 
-            while completion_context_stack:
-                curr_ctx = completion_context_stack.popleft()
+            while docs_stack:
+                curr_doc = docs_stack.popleft()
 
                 if is_root_context:
                     # use what's been already collected to compute the cache.
                     new_library_infos = initial_library_infos
-                else:
-                    new_library_infos = (
-                        cls._collect_library_info_from_completion_context(
-                            curr_ctx, is_root_context, memo
+                    new_resource_infos = (
+                        cls._collect_resource_info_from_completion_context(
+                            completion_context, is_root_context, memo
                         )
                     )
-                new_resource_infos = cls._collect_resource_info_from_completion_context(
-                    curr_ctx, is_root_context, memo
-                )
-                new_variable_imports = (
-                    cls._collect_variable_info_from_completion_context(
-                        curr_ctx, is_root_context, memo
+                    new_variable_imports = (
+                        cls._collect_variable_info_from_completion_context(
+                            completion_context, is_root_context, memo
+                        )
+                    )
+                else:
+                    # The imports of resources are shared among the different
+                    # dependency graphs (only the root imports are always
+                    # collected again).
+                    doc_imports_info = cls._get_doc_imports_info(
+                        caches, completion_context, curr_doc, invalidation_tracker
+                    )
+                    new_library_infos = cls._filter_library_infos(
+                        doc_imports_info.library_infos, is_root_context, memo
+                    )
+                    new_resource_infos = cls._filter_resource_infos(
+                        doc_imports_info.resource_imports_as_docs,
+                        is_root_context,
+                        memo,
+                    )
+                    new_variable_imports = cls._filter_variable_infos(
+                        doc_imports_info.variable_imports_as_docs, memo
                     )
-                )
 
                 if new_library_infos:
-                    dependency_graph.add_library_infos(
-                        curr_ctx.doc.uri, new_library_infos
-                    )
+                    dependency_graph.add_library_infos(curr_doc.uri, new_library_infos)
 
                 if new_resource_infos:
                     dependency_graph.add_resource_infos(
-                        curr_ctx.doc.uri, new_resource_infos
+                        curr_doc.uri, new_resource_infos
                     )
                     for _resource_import_node, resource_doc in new_resource_infos:
                         if resource_doc is not None:
-                            new_ctx = curr_ctx.create_copy(resource_doc)
-                            completion_context_stack.append(new_ctx)
+                            docs_stack.append(resource_doc)
 
                 if new_variable_imports:
                     dependency_graph.add_variable_infos(
-                        curr_ctx.doc.uri, new_variable_imports
+                        curr_doc.uri, new_variable_imports
                     )
 
                 is_root_context = False
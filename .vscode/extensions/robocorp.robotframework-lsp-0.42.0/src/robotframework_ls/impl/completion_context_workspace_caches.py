@@ -1,4 +1,15 @@
-from typing import Optional, Hashable, TypeVar, Generic, Iterator, Tuple, Set
+from typing import (
+    Optional,
+    Hashable,
+    TypeVar,
+    Generic,
+    Iterator,
+    Tuple,
+    Set,
+    Dict,
+    Callable,
+    Any,
+)
 from robotframework_ls.impl.protocols import (
     IRobotDocument,
     ICompletionContextWorkspaceCaches,
@@ -20,14 +31,40 @@ T = TypeVar("T")
 log = get_logger(__name__)
 
 
+# The dependency graphs cached are bounded by the number of documents they
+# reference (so, many small graphs or a few big ones may be kept in memory).
+_MAX_CACHED_DEPENDENCY_GRAPHS_SIZE = 2000
+
+# The imports of (non-root) documents which are shared among the dependency
+# graphs.
+_MAX_CACHED_DOC_IMPORTS_INFOS = 1000
+
+
 class _LRU(Generic[T]):
     """
     A really-simple LRU to help us keep track of only a few dependency graphs.
+
+    :param get_size:
+        If given, the size of the cache is computed by the sum of the sizes of
+        its values (otherwise each value has size 1).
+
+    :param on_evict:
+        If given, called with (key, value) for each entry removed because the
+        cache is over its max size.
     """
 
-    def __init__(self, max_size: int):
+    def __init__(
+        self,
+        max_size: int,
+        get_size: Optional[Callable[[T], int]] = None,
+        on_evict: Optional[Callable[[Hashable, T], None]] = None,
+    ):
         self._cache: "OrderedDict[Hashable, T]" = OrderedDict()
+        self._key_to_size: Dict[Hashable, int] = {}
         self._max_size = max_size
+        self._get_size = get_size
+        self._on_evict = on_evict
+        self._size = 0
 
     def get(self, key: Hashable) -> Optional[T]:
         val = self._cache.get(key)
@@ -38,16 +75,38 @@ class _LRU(Generic[T]):
             return val
 
     def put(self, key: Hashable, value: T) -> None:
+        self.pop(key)
+        size = self._get_size(value) if self._get_size is not None else 1
         self._cache[key] = value
-        self._cache.move_to_end(key)
-        if len(self._cache) > self._max_size:
-            self._cache.popitem(last=False)
+        self._key_to_size[key] = size
+        self._size += size
+
+        # Note: the last one added is always kept (even if it's bigger
+        # than the max size).
+        while self._size > self._max_size and len(self._cache) > 1:
+            evicted_key, evicted = self._cache.popitem(last=False)
+            self._size -= self._key_to_size.pop(evicted_key)
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted)
 
     def pop(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
-        return self._cache.pop(key, default)
+        ret = self._cache.pop(key, default)
+        size = self._key_to_size.pop(key, None)
+        if size is not None:
+            self._size -= size
+        return ret
 
     def clear(self) -> None:
         self._cache.clear()
+        self._key_to_size.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def size(self) -> int:
+        return self._size
 
     def items(self) -> Iterator[Tuple[Hashable, T]]:
         yield from self._cache.items()
@@ -56,14 +115,80 @@ class _LRU(Generic[T]):
         yield from self._cache.values()
 
 
+def _normalize_library_name(library_name: str) -> str:
+    """
+    Provides the name of a library as it's used in the library name to cache
+    keys index (i.e.: `Library    ${CURDIR}/my_library.py` is indexed as
+    `my_library`).
+    """
+    import os
+
+    library_name = library_name.lower()
+    if library_name.endswith(LIBRARY_FILE_EXTENSIONS) or (
+        "/" in library_name or "\\" in library_name
+    ):
+        library_name = os.path.splitext(os.path.basename(library_name))[0]
+    return library_name
+
+
+def _iter_library_names(
+    dependency_graph: ICompletionContextDependencyGraph,
+) -> Iterator[str]:
+    for library_info in dependency_graph.iter_all_libraries():
+        if library_info.name and not library_info.builtin:
+            yield _normalize_library_name(library_info.name)
+
+
+def _get_module_names(filename: str) -> Set[str]:
+    """
+    Provides the names by which the given python file may be imported as
+    a library (used when the library still wasn't loaded in the libspec
+    manager).
+    """
+    import os
+
+    ret = set()
+    basename = os.path.splitext(os.path.basename(filename))[0].lower()
+    if basename == "__init__":
+        ret.add(os.path.basename(os.path.dirname(filename)).lower())
+    else:
+        ret.add(basename)
+    return ret
+
+
+def _add_to_index(
+    index: Dict[str, Set[Hashable]], keys: Iterator[str], cache_key: Hashable
+) -> None:
+    for key in keys:
+        cache_keys = index.get(key)
+        if cache_keys is None:
+            cache_keys = index[key] = set()
+        cache_keys.add(cache_key)
+
+
+def _remove_from_index(
+    index: Dict[str, Set[Hashable]], keys: Iterator[str], cache_key: Hashable
+) -> None:
+    for key in keys:
+        cache_keys = index.get(key)
+        if cache_keys is not None:
+            cache_keys.discard(cache_key)
+            if not cache_keys:
+                del index[key]
+
+
 class _InvalidationTracker:
     def __init__(self):
         self._uris_invalidated = set()
+        self._library_names_invalidated = set()
         self._all_invalidated = False
 
     def mark_uri_invalidated(self, uri):
         self._uris_invalidated.add(uri)
 
+    def mark_library_names_invalidated(self, library_names):
+        self._library_names_invalidated.update(library_names)
+
     def mark_all_invalidated(self):
         self._all_invalidated = True
 
@@ -74,17 +199,69 @@ class _InvalidationTracker:
             if dependency_graph.do_invalidate_on_uri_change(uri):
                 return False
 
+        if self._library_names_invalidated:
+            for library_name in _iter_library_names(dependency_graph):
+                if library_name in self._library_names_invalidated:
+                    return False
+
+        return True
+
+    def is_doc_imports_info_still_valid(self, doc_imports_info) -> bool:
+        if self._all_invalidated:
+            return False
+        for uri in doc_imports_info.iter_dependency_uris():
+            if uri in self._uris_invalidated:
+                return False
         return True
 
 
+def _get_dependency_graph_size(
+    dependency_graph: ICompletionContextDependencyGraph,
+) -> int:
+    # The root document + the documents it depends on.
+    return 1 + sum(1 for _ in dependency_graph.iter_dependency_uris())
+
+
 class CompletionContextWorkspaceCaches:
-    def __init__(self):
+    def __init__(
+        self,
+        get_library_names_for_source: Optional[Callable[[str], Set[str]]] = None,
+    ):
+        """
+        :param get_library_names_for_source:
+            A callable which provides the (lower-case) library names which have
+            a given python file as a source (if not given, a change in any
+            python file invalidates all the caches).
+        """
         self._lock = threading.Lock()
-        # Small cache because invalidation could become slow in a big cache
-        # (and it should be enough to hold what we're currently working with).
-        self._cached: _LRU[ICompletionContextDependencyGraph] = _LRU(5)
+        self._get_library_names_for_source = get_library_names_for_source
+        # Invalidation is done through the reverse index (uri -> cache keys
+        # depending on it), so, the cache size is bounded by the number of
+        # documents referenced in the cached graphs and not by the number
+        # of graphs.
+        self._cached: _LRU[ICompletionContextDependencyGraph] = _LRU(
+            _MAX_CACHED_DEPENDENCY_GRAPHS_SIZE,
+            get_size=_get_dependency_graph_size,
+            on_evict=self._on_evict,
+        )
+        self._uri_to_cache_keys: Dict[str, Set[Hashable]] = {}
+        self._library_name_to_cache_keys: Dict[str, Set[Hashable]] = {}
+
+        # doc uri -> imports of the doc (and its reverse index).
+        self._doc_imports_infos: _LRU[Any] = _LRU(
+            _MAX_CACHED_DOC_IMPORTS_INFOS, on_evict=self._on_evict_doc_imports_info
+        )
+        self._uri_to_doc_imports_keys: Dict[str, Set[Hashable]] = {}
+        self.doc_imports_hits = 0
+        self.doc_imports_misses = 0
+
         self.cache_hits = 0
+        self.cache_misses = 0
+        # Number of times that all the caches were cleared.
         self.invalidations = 0
+        # Number of dependency graphs invalidated due to changes in a uri.
+        self.invalidated_graphs = 0
+        self.evictions = 0
 
         self._invalidation_trackers: Set[_InvalidationTracker] = set()
 
@@ -93,19 +270,85 @@ class CompletionContextWorkspaceCaches:
             for invalidation_tracker in self._invalidation_trackers:
                 invalidation_tracker.mark_uri_invalidated(uri)
 
-            for key, entry in tuple(self._cached.items()):
-                if entry.do_invalidate_on_uri_change(uri):
-                    invalidated: Optional[
-                        ICompletionContextDependencyGraph
-                    ] = self._cached.pop(key, None)
-                    if BaseOptions.DEBUG_CACHE_DEPS and invalidated:
-                        import json
+            self._invalidate_cache_keys(self._uri_to_cache_keys.pop(uri, ()))
+
+            for key in tuple(self._uri_to_doc_imports_keys.pop(uri, ())):
+                doc_imports_info = self._doc_imports_infos.pop(key)
+                if doc_imports_info is not None:
+                    _remove_from_index(
+                        self._uri_to_doc_imports_keys,
+                        doc_imports_info.iter_dependency_uris(),
+                        key,
+                    )
+
+    def _invalidate_library_names(self, library_names: Set[str]) -> None:
+        with self._lock:
+            for invalidation_tracker in self._invalidation_trackers:
+                invalidation_tracker.mark_library_names_invalidated(library_names)
+
+            cache_keys: Set[Hashable] = set()
+            for library_name in library_names:
+                cache_keys.update(
+                    self._library_name_to_cache_keys.pop(library_name, ())
+                )
+            self._invalidate_cache_keys(cache_keys)
+
+    def _invalidate_cache_keys(self, cache_keys) -> None:
+        # Note: the lock must be already held.
+        for key in tuple(cache_keys):
+            invalidated: Optional[ICompletionContextDependencyGraph] = self._cached.pop(
+                key, None
+            )
+            if invalidated is not None:
+                self.invalidated_graphs += 1
+                self._remove_from_reverse_index(key, invalidated)
+                if BaseOptions.DEBUG_CACHE_DEPS:
+                    import json
+
+                    log.info(
+                        "Invalidated: %s\n%s\n",
+                        key,
+                        json.dumps(invalidated.to_dict(), indent=4),
+                    )
 
-                        log.info(
-                            "Invalidated: %s\n%s\n",
-                            key,
-                            json.dumps(invalidated.to_dict(), indent=4),
-                        )
+    def _add_to_reverse_index(
+        self, cache_key: Hashable, dependency_graph: ICompletionContextDependencyGraph
+    ) -> None:
+        _add_to_index(
+            self._uri_to_cache_keys, dependency_graph.iter_dependency_uris(), cache_key
+        )
+        _add_to_index(
+            self._library_name_to_cache_keys,
+            _iter_library_names(dependency_graph),
+            cache_key,
+        )
+
+    def _remove_from_reverse_index(
+        self, cache_key: Hashable, dependency_graph: ICompletionContextDependencyGraph
+    ) -> None:
+        _remove_from_index(
+            self._uri_to_cache_keys, dependency_graph.iter_dependency_uris(), cache_key
+        )
+        _remove_from_index(
+            self._library_name_to_cache_keys,
+            _iter_library_names(dependency_graph),
+            cache_key,
+        )
+
+    def _on_evict(
+        self, cache_key: Hashable, dependency_graph: ICompletionContextDependencyGraph
+    ) -> None:
+        # Note: called from the LRU with the lock already held.
+        self.evictions += 1
+        self._remove_from_reverse_index(cache_key, dependency_graph)
+
+    def _on_evict_doc_imports_info(self, uri: Hashable, doc_imports_info) -> None:
+        # Note: called from the LRU with the lock already held.
+        _remove_from_index(
+            self._uri_to_doc_imports_keys,
+            doc_imports_info.iter_dependency_uris(),
+            uri,
+        )
 
     @contextmanager
     def invalidation_tracker(self):
@@ -131,10 +374,28 @@ class CompletionContextWorkspaceCaches:
                 self._invalidate_uri(uri)
 
             elif lower.endswith(LIBRARY_FILE_EXTENSIONS):
-                # If a library changes, we consider all caches invalid because
-                # we don't hold an association to know which library maps to
-                # which files at this level.
-                self.clear_caches()
+                get_library_names_for_source = self._get_library_names_for_source
+                if get_library_names_for_source is None:
+                    # We don't have an association to know which library maps
+                    # to which files, so, consider all caches invalid.
+                    self.clear_caches()
+                    return
+
+                # Python files may be used as variables files (tracked by uri)
+                # or as libraries (tracked by the library name).
+                uri = uris.from_fs_path(filename)
+                self._invalidate_uri(uri)
+
+                library_names = _get_module_names(filename)
+                try:
+                    library_names.update(get_library_names_for_source(filename))
+                except Exception:
+                    log.exception(
+                        "Error getting library names for source: %s", filename
+                    )
+                    self.clear_caches()
+                    return
+                self._invalidate_library_names(library_names)
 
     def on_updated_document(self, uri: str, document: Optional[IRobotDocument]):
         """
@@ -155,6 +416,10 @@ class CompletionContextWorkspaceCaches:
             for invalidation_tracker in self._invalidation_trackers:
                 invalidation_tracker.mark_all_invalidated()
             self._cached.clear()
+            self._uri_to_cache_keys.clear()
+            self._library_name_to_cache_keys.clear()
+            self._doc_imports_infos.clear()
+            self._uri_to_doc_imports_keys.clear()
 
     def dispose(self):
         self.clear_caches()
@@ -166,6 +431,8 @@ class CompletionContextWorkspaceCaches:
             ret = self._cached.get(cache_key)
             if ret is not None:
                 self.cache_hits += 1
+            else:
+                self.cache_misses += 1
 
             if BaseOptions.DEBUG_CACHE_DEPS:
                 if ret is not None:
@@ -193,8 +460,61 @@ class CompletionContextWorkspaceCaches:
     ) -> None:
         with self._lock:
             if invalidation_tracker.is_dependency_graph_still_valid(dependency_graph):
+                old = self._cached.pop(cache_key)
+                if old is not None:
+                    self._remove_from_reverse_index(cache_key, old)
+                self._add_to_reverse_index(cache_key, dependency_graph)
                 self._cached.put(cache_key, dependency_graph)
 
+    def get_cached_doc_imports_info(self, doc_uri: str) -> Optional[Any]:
+        with self._lock:
+            ret = self._doc_imports_infos.get(doc_uri)
+            if ret is not None:
+                self.doc_imports_hits += 1
+            else:
+                self.doc_imports_misses += 1
+            return ret
+
+    def cache_doc_imports_info(
+        self,
+        doc_uri: str,
+        doc_imports_info: Any,
+        invalidation_tracker: _InvalidationTracker,
+    ) -> None:
+        with self._lock:
+            if invalidation_tracker.is_doc_imports_info_still_valid(doc_imports_info):
+                old = self._doc_imports_infos.pop(doc_uri)
+                if old is not None:
+                    _remove_from_index(
+                        self._uri_to_doc_imports_keys,
+                        old.iter_dependency_uris(),
+                        doc_uri,
+                    )
+                _add_to_index(
+                    self._uri_to_doc_imports_keys,
+                    doc_imports_info.iter_dependency_uris(),
+                    doc_uri,
+                )
+                self._doc_imports_infos.put(doc_uri, doc_imports_info)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "invalidations": self.invalidations,
+                "invalidated_graphs": self.invalidated_graphs,
+                "evictions": self.evictions,
+                "cached_graphs": len(self._cached),
+                "cached_graphs_size": self._cached.size,
+                "max_cached_graphs_size": _MAX_CACHED_DEPENDENCY_GRAPHS_SIZE,
+                "indexed_uris": len(self._uri_to_cache_keys),
+                "indexed_library_names": len(self._library_name_to_cache_keys),
+                "doc_imports_hits": self.doc_imports_hits,
+                "doc_imports_misses": self.doc_imports_misses,
+                "cached_doc_imports": len(self._doc_imports_infos),
+            }
+
     def __typecheckself__(self) -> None:
         from robocorp_ls_core.protocols import check_implements
 
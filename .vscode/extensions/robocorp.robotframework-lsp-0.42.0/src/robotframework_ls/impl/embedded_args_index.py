@@ -0,0 +1,131 @@
+"""
+Index for keywords with embedded arguments (i.e.: `Click Element On ${row}`).
+
+A call can only match such a keyword if it starts with the literal prefix and
+ends with the literal suffix of the keyword name, so, the keywords are grouped
+by their (normalized) literal prefix (or by the literal suffix when the name
+starts with an embedded argument) and only the keywords in the groups which
+match the call are checked with the related regexp.
+"""
+from typing import Dict, List, Optional, Set
+
+from robotframework_ls.impl.protocols import IKeywordFound
+
+
+class _Entry(object):
+    __slots__ = ["order", "keyword_found", "suffix"]
+
+    def __init__(self, order: int, keyword_found: IKeywordFound, suffix: str):
+        self.order = order
+        self.keyword_found = keyword_found
+        self.suffix = suffix
+
+
+class EmbeddedArgsKeywordIndex(object):
+    def __init__(self) -> None:
+        self._name_to_entry: Dict[str, _Entry] = {}
+
+        self._prefix_to_entries: Dict[str, List[_Entry]] = {}
+        self._prefix_lengths: Set[int] = set()
+
+        # Keywords without a literal prefix.
+        self._suffix_to_entries: Dict[str, List[_Entry]] = {}
+        self._suffix_lengths: Set[int] = set()
+
+        # Keywords without a literal prefix nor suffix (i.e.: `${a} and ${b}`).
+        self._unindexed: List[_Entry] = []
+
+    def __len__(self) -> int:
+        return len(self._name_to_entry)
+
+    def add_keyword(self, keyword_found: IKeywordFound) -> None:
+        """
+        Adds a keyword with embedded arguments (if a keyword with the same
+        normalized name was already added it's replaced, keeping the original
+        precedence).
+        """
+        from robotframework_ls.impl.text_utilities import (
+            get_embedded_args_literal_prefix_and_suffix,
+        )
+
+        normalized_name = keyword_found.normalized_keyword_name
+        entry = self._name_to_entry.get(normalized_name)
+        if entry is not None:
+            entry.keyword_found = keyword_found
+            return
+
+        prefix, suffix = get_embedded_args_literal_prefix_and_suffix(normalized_name)
+        entry = self._name_to_entry[normalized_name] = _Entry(
+            len(self._name_to_entry), keyword_found, suffix
+        )
+
+        if prefix:
+            entries = self._prefix_to_entries.get(prefix)
+            if entries is None:
+                entries = self._prefix_to_entries[prefix] = []
+                self._prefix_lengths.add(len(prefix))
+            entries.append(entry)
+
+        elif suffix:
+            entries = self._suffix_to_entries.get(suffix)
+            if entries is None:
+                entries = self._suffix_to_entries[suffix] = []
+                self._suffix_lengths.add(len(suffix))
+            entries.append(entry)
+
+        else:
+            self._unindexed.append(entry)
+
+    def get_keyword(self, normalized_keyword_name: str) -> Optional[IKeywordFound]:
+        """
+        :return: the first keyword added which matches the given (normalized)
+        call text.
+        """
+        if not self._name_to_entry:
+            return None
+
+        call_len = len(normalized_keyword_name)
+        found: Optional[_Entry] = None
+
+        for prefix_len in self._prefix_lengths:
+            if prefix_len <= call_len:
+                entries = self._prefix_to_entries.get(
+                    normalized_keyword_name[:prefix_len]
+                )
+                if entries:
+                    found = self._check_entries(normalized_keyword_name, entries, found)
+
+        for suffix_len in self._suffix_lengths:
+            if suffix_len <= call_len:
+                entries = self._suffix_to_entries.get(
+                    normalized_keyword_name[call_len - suffix_len :]
+                )
+                if entries:
+                    found = self._check_entries(normalized_keyword_name, entries, found)
+
+        if self._unindexed:
+            found = self._check_entries(normalized_keyword_name, self._unindexed, found)
+
+        if found is None:
+            return None
+        return found.keyword_found
+
+    def _check_entries(
+        self,
+        normalized_keyword_name: str,
+        entries: List[_Entry],
+        found: Optional[_Entry],
+    ) -> Optional[_Entry]:
+        for entry in entries:
+            if found is not None and entry.order >= found.order:
+                # Entries are sorted by the order, so, the remaining entries
+                # can't have precedence over the one already found.
+                break
+
+            if normalized_keyword_name.endswith(entry.suffix):
+                embedded_args_matcher = entry.keyword_found.embedded_args_matcher
+                if embedded_args_matcher is not None and embedded_args_matcher(
+                    normalized_keyword_name
+                ):
+                    return entry
+        return found
@@ -184,7 +184,7 @@ class _FindDefinitionKeywordCollector(AbstractKeywordCollector):
         return True
 
     def on_keyword(self, keyword_found):
-        if self._matcher.is_keyword_name_match(keyword_found.keyword_name):
+        if self._matcher.is_keyword_found_match(keyword_found):
             definition = _DefinitionFromKeyword(keyword_found)
             self.matches.append(definition)
             return
@@ -20,37 +20,295 @@ def robot_source_format(source, space_count=4):
     return formatted
 
 
-def _create_range(d, offset1, offset2):
-    from robocorp_ls_core.lsp import Range
+def _common_prefix_len(s1: str, s2: str) -> int:
+    i = 0
+    max_i = min(len(s1), len(s2))
+    while i < max_i and s1[i] == s2[i]:
+        i += 1
+    return i
 
-    return Range(d.offset_to_line_col(offset1), d.offset_to_line_col(offset2))
 
+def _common_suffix_len(s1: str, s2: str, max_len: int) -> int:
+    i = 0
+    len1 = len(s1)
+    len2 = len(s2)
+    while i < max_len and s1[len1 - i - 1] == s2[len2 - i - 1]:
+        i += 1
+    return i
 
-def create_text_edit_from_diff(contents, new_contents):
+
+def _offset_to_line_col(lines, first_line: int, offset: int):
+    """
+    :param lines:
+        The lines (with line endings) starting at `first_line`.
+    :param offset:
+        An offset in the contents of `lines` joined.
+    """
+    line = first_line
+    for line_contents in lines:
+        if offset < len(line_contents) or not line_contents.endswith(("\r", "\n")):
+            return line, offset
+        offset -= len(line_contents)
+        line += 1
+    return line, offset
+
+
+def _create_block_text_edit(old_lines, new_lines, first_line: int):
+    """
+    Creates a single text edit to convert the old lines into the new lines
+    (the common prefix/suffix of the block are kept as is so that the edit is
+    minimal).
+    """
+    from robocorp_ls_core.lsp import TextEdit, Range
+
+    old_text = "".join(old_lines)
+    new_text = "".join(new_lines)
+
+    prefix = _common_prefix_len(old_text, new_text)
+    suffix = _common_suffix_len(
+        old_text, new_text, min(len(old_text), len(new_text)) - prefix
+    )
+
+    # Don't split a "\r\n" line ending.
+    if 0 < prefix < len(old_text) and old_text[prefix - 1 : prefix + 1] == "\r\n":
+        prefix -= 1
+    end_offset = len(old_text) - suffix
+    if 0 < end_offset < len(old_text) and (
+        old_text[end_offset - 1 : end_offset + 1] == "\r\n"
+    ):
+        suffix -= 1
+
+    start = _offset_to_line_col(old_lines, first_line, prefix)
+    end = _offset_to_line_col(old_lines, first_line, len(old_text) - suffix)
+    return TextEdit(Range(start, end), new_text[prefix : len(new_text) - suffix])
+
+
+# When there are no unique lines to be used as anchors, a regular diff is done
+# only if the range is small (otherwise the range is just replaced).
+_MAX_SEQUENCE_MATCHER_RANGE = 10000
+
+
+def _longest_increasing_subsequence(pairs):
+    """
+    :param pairs:
+        A list with (index in a, index in b) sorted by the index in a.
+
+    :return:
+        The longest subsequence of pairs where the index in b is also increasing.
+    """
+    import bisect
+
+    tails = []  # The index in b of the last element of each subsequence.
+    tails_indexes = []  # The index in pairs of the last element of each subsequence.
+    previous = [-1] * len(pairs)
+    for i, (_ia, ib) in enumerate(pairs):
+        k = bisect.bisect_left(tails, ib)
+        if k > 0:
+            previous[i] = tails_indexes[k - 1]
+        if k == len(tails):
+            tails.append(ib)
+            tails_indexes.append(i)
+        else:
+            tails[k] = ib
+            tails_indexes[k] = i
+
+    ret = []
+    i = tails_indexes[-1] if tails_indexes else -1
+    while i != -1:
+        ret.append(pairs[i])
+        i = previous[i]
+    ret.reverse()
+    return ret
+
+
+def _iter_unique_line_anchors(a, alo, ahi, b, blo, bhi):
+    a_count = {}
+    for i in range(alo, ahi):
+        line = a[i]
+        if line in a_count:
+            a_count[line] = -1
+        else:
+            a_count[line] = i
+
+    b_count = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if line in b_count:
+            b_count[line] = -1
+        elif line in a_count:
+            b_count[line] = j
+
+    pairs = []
+    for line, j in b_count.items():
+        if j != -1:
+            i = a_count[line]
+            if i != -1:
+                pairs.append((i, j))
+    pairs.sort()
+    return _longest_increasing_subsequence(pairs)
+
+
+def _compute_line_diff_opcodes(a, b):
+    """
+    Computes the opcodes (in the same format of `SequenceMatcher.get_opcodes()`)
+    to convert the lines in `a` into the lines in `b` using a patience diff
+    (lines which are unique in both sides are used as anchors and the ranges
+    between anchors are diffed recursively).
+    """
     from difflib import SequenceMatcher
-    from robocorp_ls_core.lsp import TextEdit
-    from robocorp_ls_core.workspace import Document
 
-    d = Document("", contents)
+    opcodes = []
 
-    s = SequenceMatcher(None, contents, new_contents)
-    lst = []
-    for tag, i1, i2, j1, j2 in s.get_opcodes():
-        # print(
-        #     "%7s a[%d:%d] (%s) b[%d:%d] (%s)"
-        #     % (tag, i1, i2, contents[i1:i2], j1, j2, new_contents[j1:j2])
-        # )
+    def add_opcode(tag, i1, i2, j1, j2):
+        if i1 == i2 and j1 == j2:
+            return
+        if opcodes:
+            last_tag, last_i1, last_i2, last_j1, last_j2 = opcodes[-1]
+            if (tag == "equal") == (last_tag == "equal"):
+                if tag != "equal" and tag != last_tag:
+                    tag = "replace"
+                opcodes[-1] = (tag, last_i1, i2, last_j1, j2)
+                return
+        opcodes.append((tag, i1, i2, j1, j2))
+
+    # Note: use a stack instead of recursion (the items are processed in order).
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        if alo < 0:
+            # i.e.: An anchor (marked as negative so that it's not diffed).
+            add_opcode("equal", -alo - 1, ahi, blo, bhi)
+            continue
+
+        # Common prefix
+        start_alo, start_blo = alo, blo
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            alo += 1
+            blo += 1
+        add_opcode("equal", start_alo, alo, start_blo, blo)
+
+        # Common suffix
+        end_ahi, end_bhi = ahi, bhi
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+
+        if alo == ahi or blo == bhi:
+            if alo != ahi:
+                add_opcode("delete", alo, ahi, blo, bhi)
+            elif blo != bhi:
+                add_opcode("insert", alo, ahi, blo, bhi)
+            add_opcode("equal", ahi, end_ahi, bhi, end_bhi)
+            continue
+
+        anchors = _iter_unique_line_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            if (ahi - alo) * (bhi - blo) <= _MAX_SEQUENCE_MATCHER_RANGE:
+                s = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+                for tag, i1, i2, j1, j2 in s.get_opcodes():
+                    add_opcode(tag, alo + i1, alo + i2, blo + j1, blo + j2)
+            else:
+                add_opcode("replace", alo, ahi, blo, bhi)
+            add_opcode("equal", ahi, end_ahi, bhi, end_bhi)
+            continue
 
-        if tag in ("replace", "insert"):
-            lst.append(TextEdit(_create_range(d, i1, i2), new_contents[j1:j2]))
+        # Push in reverse order (the stack is LIFO).
+        stack.append((-ahi - 1, end_ahi, bhi, end_bhi))
+        next_i, next_j = ahi, bhi
+        for i, j in reversed(anchors):
+            stack.append((i + 1, next_i, j + 1, next_j))
+            stack.append((-i - 1, i + 1, j, j + 1))
+            next_i, next_j = i, j
+        stack.append((alo, next_i, blo, next_j))
 
-        elif tag == "delete":
-            lst.append(TextEdit(_create_range(d, i1, i2), ""))
+    return opcodes
 
-        elif tag == "equal":
+
+def create_text_edit_from_diff(contents, new_contents):
+    """
+    Creates the text edits to convert `contents` into `new_contents`.
+
+    The diff is done line by line (a changed block of lines is converted to a
+    single text edit and when a block has the same number of lines in both
+    versions each changed line is converted to a text edit).
+    """
+    lines = contents.splitlines(True)
+    new_lines = new_contents.splitlines(True)
+
+    lst = []
+    for tag, i1, i2, j1, j2 in _compute_line_diff_opcodes(lines, new_lines):
+        if tag == "equal":
             pass
 
+        elif tag == "replace" and (i2 - i1) == (j2 - j1):
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                if lines[i] != new_lines[j]:
+                    lst.append(_create_block_text_edit([lines[i]], [new_lines[j]], i))
+
+        elif tag in ("replace", "insert", "delete"):
+            lst.append(_create_block_text_edit(lines[i1:i2], new_lines[j1:j2], i1))
+
         else:
             raise AssertionError("Unhandled: %s" % (tag,))
 
     return lst
+
+
+def compute_format_lines_range(ast, start_line: int, end_line: int):
+    """
+    Computes the lines which should be formatted when formatting the given
+    range: the range is expanded so that it contains the full top-level blocks
+    (section headers, test cases, keywords and statements in other sections)
+    which intersect it.
+
+    :param start_line:
+        0-based start line of the range to be formatted.
+    :param end_line:
+        0-based end line (inclusive) of the range to be formatted.
+
+    :return Optional[Tuple[int, int]]:
+        The 0-based (inclusive) lines to be formatted or None if no block
+        intersects the given range.
+    """
+    first_line = None
+    last_line = None
+    for section in ast.sections:
+        nodes = []
+        header = getattr(section, "header", None)
+        if header is not None:
+            nodes.append(header)
+        nodes.extend(section.body)
+
+        for node in nodes:
+            node_start = node.lineno - 1
+            node_end = node.end_lineno - 1
+            if node_start < 0 or node_end < start_line or node_start > end_line:
+                continue
+
+            if first_line is None or node_start < first_line:
+                first_line = node_start
+            if last_line is None or node_end > last_line:
+                last_line = node_end
+
+    if first_line is None or last_line is None:
+        return None
+    return first_line, last_line
+
+
+def filter_text_edits_in_lines(text_edits, first_line: int, last_line: int):
+    """
+    :return: only the text edits which are fully contained in the given
+    0-based (inclusive) lines.
+    """
+    ret = []
+    for text_edit in text_edits:
+        start = text_edit.range.start
+        end = text_edit.range.end
+        if start.line < first_line or start.line > last_line:
+            continue
+        if end.line > last_line and not (
+            end.line == last_line + 1 and end.character == 0
+        ):
+            continue
+        ret.append(text_edit)
+    return ret
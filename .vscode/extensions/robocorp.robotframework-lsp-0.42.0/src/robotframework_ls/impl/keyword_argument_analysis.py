@@ -2,8 +2,10 @@ from robotframework_ls.impl.protocols import (
     IKeywordArg,
     IRobotToken,
 )
-from typing import Optional, List, Deque, Iterator, Dict, Union, Sequence
+from typing import Optional, List, Deque, Iterator, Dict, Union, Sequence, Tuple
 import itertools
+import threading
+from collections import OrderedDict
 from robocorp_ls_core.lsp import Error
 from robocorp_ls_core.constants import Null, NULL
 
@@ -33,7 +35,14 @@ class UsageInfoForKeywordArgumentAnalysis:
 
 
 class KeywordArgumentAnalysis:
+    """
+    Note: the analysis is immutable after created (so, it may be shared among
+    threads -- use `get_keyword_argument_analysis` to get a cached version).
+    """
+
     def __init__(self, keyword_args: Sequence[IKeywordArg]) -> None:
+        from robotframework_ls.impl.text_utilities import normalize_robot_name
+        from robotframework_ls.impl.text_utilities import is_variable_text
 
         args = self._keyword_args = keyword_args
 
@@ -42,7 +51,14 @@ class KeywordArgumentAnalysis:
         self._star_arg_index = -1
         self._keyword_arg_index = -1
 
+        # id(arg) -> index in the definition.
+        self._token_definition_id_to_index: Dict[int, int] = {}
+
+        # Contains all names we can match -> the related keyword arg.
+        self._definition_keyword_name_to_arg: Dict[str, IKeywordArg] = {}
+
         for i, arg in enumerate(args):
+            self._token_definition_id_to_index[id(arg)] = i
             if arg.is_star_arg:
                 self.found_star_arg = arg
                 self._star_arg_index = i
@@ -51,6 +67,15 @@ class KeywordArgumentAnalysis:
                 self.found_keyword_arg = arg
                 self._keyword_arg_index = i
 
+            else:
+                arg_name = arg.arg_name
+                if is_variable_text(arg_name):
+                    arg_name = arg_name[2:-1]
+
+                self._definition_keyword_name_to_arg[
+                    normalize_robot_name(arg_name)
+                ] = arg
+
     def _compute_active_parameter_fallback(
         self,
         usage_info_argument_index: int,
@@ -168,7 +193,6 @@ class KeywordArgumentAnalysis:
         from robotframework_ls.impl.ast_utils import create_error_from_node
         from collections import deque
         from robotframework_ls.impl.text_utilities import normalize_robot_name
-        from robotframework_ls.impl.text_utilities import is_variable_text
 
         # Pre-requisite.
         keyword_token = usage_info.get_token_to_report_argument_missing()
@@ -177,37 +201,20 @@ class KeywordArgumentAnalysis:
 
         # deque (initially with all args -- args we match are removed
         # as we go forward).
-        definition_keyword_args_deque: Deque[IKeywordArg] = deque()
+        definition_keyword_args_deque: Deque[IKeywordArg] = deque(self._keyword_args)
 
-        # id(arg) -> index in the definition.
-        token_definition_id_to_index: Dict[int, int] = {}
+        # id(arg) -> index in the definition (not changed, so, it's shared).
+        token_definition_id_to_index = self._token_definition_id_to_index
 
-        # Contains all names we can match -> the related keyword arg.
-        definition_keyword_name_to_arg: Dict[str, IKeywordArg] = {}
+        # Contains all names we can match -> the related keyword arg (a copy
+        # as matched names are removed as we go).
+        definition_keyword_name_to_arg: Dict[str, IKeywordArg] = dict(
+            self._definition_keyword_name_to_arg
+        )
 
         # The ones that are matched are filled as we go.
         definition_arg_matched: Dict[IKeywordArg, bool] = {}
 
-        # Fill our basic structures.
-        for i, definition_arg in enumerate(self._keyword_args):
-            definition_keyword_args_deque.append(definition_arg)
-            token_definition_id_to_index[id(definition_arg)] = i
-
-            if definition_arg.is_star_arg:
-                # Skip not matched by name
-                continue
-            if definition_arg.is_keyword_arg:
-                # Skip not matched by name
-                continue
-
-            arg_name = definition_arg.arg_name
-            if is_variable_text(arg_name):
-                arg_name = arg_name[2:-1]
-
-            definition_keyword_name_to_arg[
-                normalize_robot_name(arg_name)
-            ] = definition_arg
-
         tokens_args_to_iterate = self._iter_args(usage_info.node.tokens)
         # Fill positional args
         for token_arg in tokens_args_to_iterate:
@@ -460,3 +467,49 @@ class KeywordArgumentAnalysis:
         yield from self._collect_keyword_usage_errors_and_build_definition_map(
             usage_info
         )
+
+
+_MAX_CACHED_ANALYSIS = 1000
+
+# (original_arg, arg_name, is_star_arg, is_keyword_arg, is_default_value_set)
+# for each argument.
+_Signature = Tuple[Tuple[str, str, bool, bool, bool], ...]
+
+_cache_lock = threading.Lock()
+_signature_to_analysis: "OrderedDict[_Signature, KeywordArgumentAnalysis]" = (
+    OrderedDict()
+)
+
+
+def get_keyword_argument_analysis(
+    keyword_args: Sequence[IKeywordArg],
+) -> KeywordArgumentAnalysis:
+    """
+    Provides a (cached) analysis for the given arguments.
+
+    The cache is keyed by the signature (and not by the keyword) so, it
+    doesn't need to be invalidated when a libspec is reloaded and the same
+    analysis is shared by different keywords with the same arguments.
+    """
+    signature: _Signature = tuple(
+        (
+            arg.original_arg,
+            arg.arg_name,
+            arg.is_star_arg,
+            arg.is_keyword_arg,
+            arg.is_default_value_set(),
+        )
+        for arg in keyword_args
+    )
+    with _cache_lock:
+        analysis = _signature_to_analysis.get(signature)
+        if analysis is not None:
+            _signature_to_analysis.move_to_end(signature)
+            return analysis
+
+    analysis = KeywordArgumentAnalysis(keyword_args)
+    with _cache_lock:
+        _signature_to_analysis[signature] = analysis
+        while len(_signature_to_analysis) > _MAX_CACHED_ANALYSIS:
+            _signature_to_analysis.popitem(last=False)
+    return analysis
@@ -67,12 +67,14 @@ def _load_library_doc_and_mtime(libspec_manager, spec_filename: str, obtain_mute
         load_markdown_json_version,
     )
 
+    from robocorp_ls_core import tracing
+
     ctx: Any
     if obtain_mutex:
         ctx = timed_acquire_mutex_for_spec_filename(spec_filename)
     else:
         ctx = NULL
-    with ctx:
+    with ctx, tracing.span("libspec:load"):
         # We must load it with a mutex to avoid conflicts between generating/reading.
         try:
             mtime = os.path.getmtime(spec_filename)
@@ -205,6 +207,7 @@ class _LibInfo(object):
         "_additional_info",
         "_invalid",
         "_can_regenerate",
+        "_sources",
     ]
 
     def __init__(self, library_doc: ILibraryDoc, mtime, spec_filename, can_regenerate):
@@ -228,10 +231,28 @@ class _LibInfo(object):
         self._canonical_spec_filename = spec_filename
         self._additional_info = None
         self._invalid = False
+        self._sources: Optional[Set[str]] = None
 
     def __str__(self):
         return f"_LibInfo({self.library_doc}, {self.mtime})"
 
+    @property
+    def sources(self) -> Set[str]:
+        """
+        :return: the (normalized) sources of the library and its keywords.
+        """
+        sources = self._sources
+        if sources is None:
+            sources = set()
+            library_doc = self.library_doc
+            if library_doc.source:
+                sources.add(_normfile(library_doc.source))
+            for keyword in library_doc.keywords:
+                if keyword.source:
+                    sources.add(_normfile(keyword.source))
+            self._sources = sources
+        return sources
+
     def verify_sources_sync(self):
         """
         :return bool:
@@ -485,16 +506,11 @@ class LibspecManager(object):
 
         self.pre_generate_libspecs = pre_generate_libspecs
 
-        if pre_generate_libspecs:
-            from robotframework_ls.impl.libspec_markdown_conversion import (
-                LibspecMarkdownConversion,
-            )
-
-            self.libspec_markdown_conversion: Optional[
-                LibspecMarkdownConversion
-            ] = LibspecMarkdownConversion(self)
-        else:
-            self.libspec_markdown_conversion = None
+        # Note: the LibspecMarkdownConversion is only created when the first
+        # conversion is scheduled (to avoid the import/thread at startup).
+        self._libspec_markdown_conversion: Optional[Any] = None
+        # Note: the conversion may be requested from multiple threads.
+        self._libspec_markdown_conversion_lock = threading.Lock()
 
         self._libspec_warmup = LibspecWarmup(endpoint, dir_cache)
 
@@ -558,7 +574,21 @@ class LibspecManager(object):
         # Must be set from the outside world when needed.
         self.config = None
 
+        from robotframework_ls.impl.markdown_docs_cache import (
+            get_markdown_docs_cache,
+        )
+
+        # Docs converted to markdown on demand are kept along with the
+        # libspecs (so that they're reused among sessions and processes).
+        markdown_docs_cache = get_markdown_docs_cache()
+        markdown_docs_cache.set_persist_dir(
+            os.path.join(self._cache_libspec_dir, "markdown_docs")
+        )
+
         if self.pre_generate_libspecs:
+            # Only done in one of the processes.
+            markdown_docs_cache.schedule_cleanup_persist_dir()
+
             log.debug("Generating builtin libraries libspec.")
             self._libspec_warmup.gen_builtin_libraries(self)
 
@@ -566,12 +596,29 @@ class LibspecManager(object):
         self._synchronize()
         log.debug("Finished initializing LibspecManager.")
 
-    def schedule_conversion_to_markdown(self, spec_filename: str):
-        if self.libspec_markdown_conversion is not None:
-            self.libspec_markdown_conversion.schedule_conversion_to_markdown(
-                spec_filename
+    @property
+    def libspec_markdown_conversion(self):
+        if not self.pre_generate_libspecs:
+            return None
+
+        libspec_markdown_conversion = self._libspec_markdown_conversion
+        if libspec_markdown_conversion is None:
+            from robotframework_ls.impl.libspec_markdown_conversion import (
+                LibspecMarkdownConversion,
             )
 
+            with self._libspec_markdown_conversion_lock:
+                libspec_markdown_conversion = self._libspec_markdown_conversion
+                if libspec_markdown_conversion is None:
+                    libspec_markdown_conversion = LibspecMarkdownConversion(self)
+                    self._libspec_markdown_conversion = libspec_markdown_conversion
+        return libspec_markdown_conversion
+
+    def schedule_conversion_to_markdown(self, spec_filename: str):
+        libspec_markdown_conversion = self.libspec_markdown_conversion
+        if libspec_markdown_conversion is not None:
+            libspec_markdown_conversion.schedule_conversion_to_markdown(spec_filename)
+
     @property
     def fs_observer(self) -> IFSObserver:
         return self._fs_observer
@@ -746,10 +793,7 @@ class LibspecManager(object):
 
         yield from self._additional_pythonpath_folder_to_folder_info.keys()
 
-    def iter_lib_info(self, builtin=False):
-        """
-        :rtype: generator(_LibInfo)
-        """
+    def _iter_canonical_filename_to_info(self, builtin=False):
         # Note: the iteration order is important (first ones are visited earlier
         # and have higher priority).
         iter_in = []
@@ -773,8 +817,16 @@ class LibspecManager(object):
             for (_uri, info) in self._internal_folder_to_folder_info.items():
                 if info.libspec_canonical_filename_to_info:
                     iter_in.append((info.libspec_canonical_filename_to_info, True))
+        return iter_in
 
-        for canonical_filename_to_info, can_regenerate in iter_in:
+    def iter_lib_info(self, builtin=False):
+        """
+        :rtype: generator(_LibInfo)
+        """
+        for (
+            canonical_filename_to_info,
+            can_regenerate,
+        ) in self._iter_canonical_filename_to_info(builtin):
             for canonical_spec_filename, info in list(
                 canonical_filename_to_info.items()
             ):
@@ -790,6 +842,30 @@ class LibspecManager(object):
                 if info is not None and info.library_doc is not None:
                     yield info
 
+    def get_library_names_for_source(self, source: str) -> Set[str]:
+        """
+        :param source:
+            A python file which was changed.
+
+        :return:
+            The (lower-case) names of the libraries which have the given source
+            as the library source or as the source of one of its keywords.
+
+        Note: only the libraries already loaded are checked (libraries still
+        not loaded can't be referenced by any cache).
+        """
+        source = _normfile(source)
+        ret: Set[str] = set()
+        for (
+            canonical_filename_to_info,
+            _can_regenerate,
+        ) in self._iter_canonical_filename_to_info():
+            for info in list(canonical_filename_to_info.values()):
+                if info is not None and info.library_doc is not None:
+                    if source in info.sources and info.library_doc.name:
+                        ret.add(info.library_doc.name.lower())
+        return ret
+
     def get_library_names(self):
         return sorted(
             set(lib_info.library_doc.name for lib_info in self.iter_lib_info())
@@ -1032,8 +1108,10 @@ class LibspecManager(object):
 
     def dispose(self):
         self._file_changes_notifier.dispose()
-        if self.libspec_markdown_conversion is not None:
-            self.libspec_markdown_conversion.dispose()
+        with self._libspec_markdown_conversion_lock:
+            libspec_markdown_conversion = self._libspec_markdown_conversion
+        if libspec_markdown_conversion is not None:
+            libspec_markdown_conversion.dispose()
 
     def _compute_libspec_filename(
         self,
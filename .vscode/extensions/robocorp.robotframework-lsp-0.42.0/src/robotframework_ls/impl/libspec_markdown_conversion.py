@@ -1,6 +1,6 @@
 from robotframework_ls.impl.text_utilities import get_digest_from_string
 import os
-from typing import Optional
+from typing import Optional, Tuple, List
 from robotframework_ls.impl.protocols import ILibraryDoc
 from robocorp_ls_core.robotframework_log import get_logger
 import threading
@@ -14,14 +14,24 @@ import sys
 log = get_logger(__name__)
 
 
-def _get_mtime_from_stream(stream) -> Optional[float]:
-    lst = []
-    while True:
-        c = stream.read(1)
-        if c == "\n":
-            break
-        lst.append(c)
-    line = "".join(lst).strip()
+# The markdown json version of a libspec is saved as:
+#
+# mtime:<libspec mtime>\n
+# indexed:<size of the library json>\n
+# <library json>
+# <keyword docs>
+#
+# In the library json the keyword docs are given as a "docRange" with the
+# [start, end) offsets of the doc (json-encoded string) in the keyword docs
+# region, so, the docs are only loaded on demand.
+#
+# Note: everything is saved as ascii (json with ensure_ascii=True), so, offsets
+# in chars are the same as offsets in bytes.
+_INDEXED_PREFIX = "indexed:"
+
+
+def _get_mtime_from_line(line: str, target_json: str) -> Optional[float]:
+    line = line.strip()
 
     if not line.startswith("mtime:"):
         log.info(
@@ -42,43 +52,125 @@ def _get_mtime_from_stream(stream) -> Optional[float]:
         return None
 
 
+def _get_file_key(stat_result) -> Tuple[int, int]:
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class _IndexedDocLoader(object):
+    """
+    Loads the doc of a keyword from the markdown json on demand.
+    """
+
+    __slots__ = ["_target_json", "_file_key", "_start", "_end"]
+
+    def __init__(self, target_json: str, file_key: Tuple[int, int], start, end):
+        self._target_json = target_json
+        self._file_key = file_key
+        self._start = start
+        self._end = end
+
+    def load(self) -> Optional[str]:
+        """
+        :return: the doc or None if it couldn't be loaded.
+        """
+        import json
+
+        try:
+            with open(self._target_json, "rb") as stream:
+                if _get_file_key(os.fstat(stream.fileno())) != self._file_key:
+                    # It was converted again in the meanwhile (the libspec
+                    # should be reloaded and this LibraryDoc discarded).
+                    log.info(
+                        "Unable to load doc from: %s (file changed).",
+                        self._target_json,
+                    )
+                    return None
+
+                stream.seek(self._start)
+                contents = stream.read(self._end - self._start)
+            return json.loads(contents.decode("ascii"))
+        except:
+            log.exception("Error loading doc from: %s", self._target_json)
+            return None
+
+
+def _iter_keyword_dicts(libdoc_dict: dict):
+    yield from iter(libdoc_dict["inits"])
+    yield from iter(libdoc_dict["keywords"])
+
+
+def _dump_indexed_json(libdoc_dict: dict, stream) -> None:
+    """
+    Dumps the library contents (after the mtime line) with the keyword docs
+    separated from the library json.
+    """
+    import json
+
+    docs: List[str] = []
+    offset = 0
+    for kw in _iter_keyword_dicts(libdoc_dict):
+        doc = json.dumps(kw.pop("doc"))
+        kw["docRange"] = [offset, offset + len(doc)]
+        offset += len(doc)
+        docs.append(doc)
+
+    contents = json.dumps(libdoc_dict)
+    stream.write(f"{_INDEXED_PREFIX}{len(contents)}\n")
+    stream.write(contents)
+    for doc in docs:
+        stream.write(doc)
+
+
 def load_markdown_json_version(
     libspec_manager, spec_filename, mtime: float
 ) -> Optional[ILibraryDoc]:
     from robotframework_ls.impl import robot_specbuilder
+    import json
 
     target_json = _get_markdown_json_version_filename(libspec_manager, spec_filename)
 
-    stream = None
     try:
-        try:
-            stream = open(target_json, "r", encoding="utf-8")
-        except:
-            log.debug("Unable to load from json: %s (file does not exist)", target_json)
-        else:
-            try:
-                loaded_mtime = _get_mtime_from_stream(stream)
+        stream = open(target_json, "rb")
+    except:
+        log.debug("Unable to load from json: %s (file does not exist)", target_json)
+        return None
 
-                if str(loaded_mtime) != str(mtime):
-                    log.debug(
-                        "Unable to load from json: %s because mtime no longer matches.",
-                        target_json,
-                    )
-                    return None
+    with stream:
+        try:
+            file_key = _get_file_key(os.fstat(stream.fileno()))
+            loaded_mtime = _get_mtime_from_line(
+                stream.readline().decode("utf-8", "replace"), target_json
+            )
 
-                # Note: let the external world think it was built with the libspec
-                # (so, the stream is from the json and the spec filename is from .libspec).
-                json_builder = robot_specbuilder.JsonDocBuilder()
-                return json_builder.build_from_stream(spec_filename, stream)
-            except:
-                log.exception("Error loading libdoc from json: %s", target_json)
+            if str(loaded_mtime) != str(mtime):
+                log.debug(
+                    "Unable to load from json: %s because mtime no longer matches.",
+                    target_json,
+                )
                 return None
 
-    finally:
-        if stream is not None:
-            stream.close()
+            line = stream.readline().decode("utf-8")
+            if not line.startswith(_INDEXED_PREFIX):
+                # Old format: the whole library json follows the mtime.
+                libdoc_dict = json.loads(line + stream.read().decode("utf-8"))
+            else:
+                contents_size = int(line[len(_INDEXED_PREFIX) :].strip())
+                libdoc_dict = json.loads(stream.read(contents_size).decode("ascii"))
+                docs_offset = stream.tell()
+                for kw in _iter_keyword_dicts(libdoc_dict):
+                    start, end = kw.pop("docRange")
+                    kw["doc"] = _IndexedDocLoader(
+                        target_json, file_key, docs_offset + start, docs_offset + end
+                    )
 
-    return None
+            # Note: let the external world think it was built with the libspec
+            # (so, the contents are from the json and the spec filename is
+            # from .libspec).
+            json_builder = robot_specbuilder.JsonDocBuilder()
+            return json_builder.build_from_dict(spec_filename, libdoc_dict)
+        except:
+            log.exception("Error loading libdoc from json: %s", target_json)
+            return None
 
 
 def _convert_to_markdown_if_needed(spec_filename, target_json) -> None:
@@ -86,8 +178,10 @@ def _convert_to_markdown_if_needed(spec_filename, target_json) -> None:
     import shutil
 
     try:
-        with open(target_json, "r", encoding="utf-8") as existing_stream:
-            current_mtime = _get_mtime_from_stream(existing_stream)
+        with open(target_json, "rb") as existing_stream:
+            current_mtime = _get_mtime_from_line(
+                existing_stream.readline().decode("utf-8", "replace"), target_json
+            )
     except:
         current_mtime = None
 
@@ -114,13 +208,15 @@ def _convert_to_markdown_if_needed(spec_filename, target_json) -> None:
         pass
 
     with tempfile.NamedTemporaryFile(
-        mode="w+", dir=os.path.dirname(target_json), delete=False, encoding="utf-8"
+        mode="w+",
+        dir=os.path.dirname(target_json),
+        delete=False,
+        encoding="utf-8",
+        newline="\n",
     ) as tempf:
-        import json
-
         tempf.write(f"mtime:{mtime}\n")
 
-        json.dump(libdoc.to_dictionary(), tempf)
+        _dump_indexed_json(libdoc.to_dictionary(), tempf)
 
     shutil.copy(tempf.name, target_json)
     os.remove(tempf.name)
@@ -226,4 +322,11 @@ if __name__ == "__main__":
         sys.stderr.flush()
         sys.exit(1)
 
+    from robotframework_ls.impl.markdown_docs_cache import get_markdown_docs_cache
+
+    # Note: the same dir used by the LibspecManager (so that docs converted
+    # here don't need to be converted again on demand and vice-versa).
+    get_markdown_docs_cache().set_persist_dir(
+        os.path.join(os.path.dirname(target_json), "markdown_docs")
+    )
     _convert_to_markdown_if_needed(spec_filename, target_json)
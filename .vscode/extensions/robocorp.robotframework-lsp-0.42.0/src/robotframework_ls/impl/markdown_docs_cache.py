@@ -0,0 +1,212 @@
+"""
+Cache for the conversion of documentation (robot/html/rest) to markdown.
+
+Entries are keyed by a hash of the doc format and contents, so, a given
+documentation is converted only once even if it's shared among keywords or if
+the libspec is regenerated (and when a persist dir is set the converted
+contents are also reused among sessions and processes -- the persisted files
+are bounded by size and the least recently used ones are removed first).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Max number of chars of converted docs kept in memory.
+_MAX_CACHED_CHARS = 5 * 1024 * 1024
+
+# Max number of bytes of converted docs kept in the persist dir.
+_MAX_PERSISTED_BYTES = 50 * 1024 * 1024
+
+# The size of the persist dir is checked again after this number of files is
+# persisted by this process.
+_CLEANUP_AFTER_N_PERSISTED = 500
+
+
+def _compute_key(lower_doc_format: str, doc: str) -> str:
+    return hashlib.sha256(
+        f"{lower_doc_format}\n{doc}".encode("utf-8", "replace")
+    ).hexdigest()[:32]
+
+
+class MarkdownDocsCache(object):
+    def __init__(
+        self,
+        max_cached_chars: int = _MAX_CACHED_CHARS,
+        max_persisted_bytes: int = _MAX_PERSISTED_BYTES,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._max_cached_chars = max_cached_chars
+        self._cached_chars = 0
+        self._key_to_markdown: "OrderedDict[str, str]" = OrderedDict()
+        self._persist_dir: Optional[str] = None
+        self._max_persisted_bytes = max_persisted_bytes
+        self._persisted_since_cleanup = 0
+
+    def set_persist_dir(self, persist_dir: Optional[str]) -> None:
+        self._persist_dir = persist_dir
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key_to_markdown.clear()
+            self._cached_chars = 0
+
+    def _get_persisted_filename(self, key: str) -> Optional[str]:
+        persist_dir = self._persist_dir
+        if not persist_dir:
+            return None
+        return os.path.join(persist_dir, key[:2], f"{key}.md")
+
+    def _load_persisted(self, key: str) -> Optional[str]:
+        filename = self._get_persisted_filename(key)
+        if not filename:
+            return None
+        try:
+            with open(filename, "r", encoding="utf-8") as stream:
+                markdown = stream.read()
+        except FileNotFoundError:
+            return None
+        except:
+            log.exception("Error loading markdown docs from: %s", filename)
+            return None
+
+        try:
+            # Mark it as recently used (the cleanup removes the files with
+            # the oldest mtime first).
+            os.utime(filename)
+        except OSError:
+            pass
+        return markdown
+
+    def _persist(self, key: str, markdown: str) -> None:
+        filename = self._get_persisted_filename(key)
+        if not filename:
+            return
+        try:
+            dirname = os.path.dirname(filename)
+            os.makedirs(dirname, exist_ok=True)
+
+            # Write to a temporary file and then rename so that a partially
+            # written file is never read by another process.
+            temp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_filename, "w", encoding="utf-8") as stream:
+                stream.write(markdown)
+            os.replace(temp_filename, filename)
+        except:
+            log.exception("Error persisting markdown docs to: %s", filename)
+            return
+
+        with self._lock:
+            self._persisted_since_cleanup += 1
+            cleanup = self._persisted_since_cleanup >= _CLEANUP_AFTER_N_PERSISTED
+            if cleanup:
+                self._persisted_since_cleanup = 0
+        if cleanup:
+            self.cleanup_persist_dir()
+
+    def cleanup_persist_dir(self) -> None:
+        """
+        Removes the least recently used files from the persist dir while its
+        size is over the limit.
+        """
+        persist_dir = self._persist_dir
+        if not persist_dir:
+            return
+
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(persist_dir) as subdir_entries:
+                for subdir_entry in subdir_entries:
+                    if not subdir_entry.is_dir():
+                        continue
+                    with os.scandir(subdir_entry.path) as file_entries:
+                        for file_entry in file_entries:
+                            try:
+                                stat = file_entry.stat()
+                            except OSError:
+                                continue
+                            entries.append(
+                                (stat.st_mtime, stat.st_size, file_entry.path)
+                            )
+                            total_size += stat.st_size
+        except FileNotFoundError:
+            return
+        except:
+            log.exception("Error listing markdown docs in: %s", persist_dir)
+            return
+
+        if total_size <= self._max_persisted_bytes:
+            return
+
+        entries.sort()
+        removed = 0
+        for _mtime, size, path in entries:
+            if total_size <= self._max_persisted_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Already removed by another process (or in use).
+                pass
+            total_size -= size
+            removed += 1
+        log.debug("Removed %s markdown docs from: %s", removed, persist_dir)
+
+    def schedule_cleanup_persist_dir(self) -> None:
+        t = threading.Thread(target=self.cleanup_persist_dir)
+        t.daemon = True
+        t.start()
+
+    def _add_to_memory(self, key: str, markdown: str) -> None:
+        # Note: the lock must be held.
+        if key in self._key_to_markdown:
+            self._key_to_markdown.move_to_end(key)
+            return
+
+        self._key_to_markdown[key] = markdown
+        self._cached_chars += len(markdown)
+        while self._cached_chars > self._max_cached_chars and self._key_to_markdown:
+            _key, evicted = self._key_to_markdown.popitem(last=False)
+            self._cached_chars -= len(evicted)
+
+    def get_markdown(
+        self,
+        lower_doc_format: str,
+        doc: str,
+        convert: Callable[[str], Optional[str]],
+    ) -> Optional[str]:
+        """
+        :param convert:
+            Used to convert the doc to markdown if it's still not cached (if it
+            returns None the result isn't cached).
+        """
+        key = _compute_key(lower_doc_format, doc)
+        with self._lock:
+            markdown = self._key_to_markdown.get(key)
+            if markdown is not None:
+                self._key_to_markdown.move_to_end(key)
+                return markdown
+
+        markdown = self._load_persisted(key)
+        if markdown is None:
+            markdown = convert(doc)
+            if markdown is None:
+                return None
+            self._persist(key, markdown)
+
+        with self._lock:
+            self._add_to_memory(key, markdown)
+        return markdown
+
+
+_markdown_docs_cache = MarkdownDocsCache()
+
+
+def get_markdown_docs_cache() -> MarkdownDocsCache:
+    return _markdown_docs_cache
@@ -0,0 +1,112 @@
+"""
+Bounds the memory used by the ASTs of documents which aren't open in the
+client (i.e.: documents loaded from the filesystem to compute the workspace
+symbols, dependency graphs, references, etc).
+
+The memory used by an AST is estimated from the size of the document source
+and when the budget is exceeded the ASTs of the least recently used documents
+are evicted (the document itself is kept along with its symbols cache and the
+AST is parsed again if it's needed later on).
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Rough estimate of the memory used by the AST (tokens, statements and the
+# indexer created on demand) for each char in the source.
+AST_BYTES_PER_SOURCE_CHAR = 20
+
+DEFAULT_MAX_MEMORY_MB = 200
+
+
+class NonOpenDocsAstCache(object):
+    def __init__(self, max_memory_mb: float = DEFAULT_MAX_MEMORY_MB) -> None:
+        self._lock = threading.Lock()
+        self._max_memory = int(max_memory_mb * 1024 * 1024)
+
+        # uri -> (weakref to the document, estimated memory of the AST).
+        self._uri_to_doc_and_memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory = 0
+
+        self.evictions = 0
+        self.reparses = 0
+
+    def set_max_memory_mb(self, max_memory_mb: float) -> None:
+        with self._lock:
+            self._max_memory = int(max_memory_mb * 1024 * 1024)
+            docs_to_evict = self._collect_docs_to_evict()
+        self._evict(docs_to_evict)
+
+    def on_ast_created(self, doc, source_len: int, reparse: bool) -> None:
+        """
+        Called when the AST of a (non-open) document is created.
+
+        :param reparse:
+            Whether the AST of this document was previously evicted.
+        """
+        memory = source_len * AST_BYTES_PER_SOURCE_CHAR
+        uri = doc.uri
+        with self._lock:
+            if reparse:
+                self.reparses += 1
+
+            previous = self._uri_to_doc_and_memory.pop(uri, None)
+            if previous is not None:
+                self._memory -= previous[1]
+
+            self._uri_to_doc_and_memory[uri] = (weakref.ref(doc), memory)
+            self._memory += memory
+            docs_to_evict = self._collect_docs_to_evict()
+
+        self._evict(docs_to_evict)
+
+    def on_ast_accessed(self, doc) -> None:
+        with self._lock:
+            try:
+                self._uri_to_doc_and_memory.move_to_end(doc.uri)
+            except KeyError:
+                pass
+
+    def forget(self, uri: str) -> None:
+        """
+        Stops tracking the given document (i.e.: it was opened in the client).
+        """
+        with self._lock:
+            previous = self._uri_to_doc_and_memory.pop(uri, None)
+            if previous is not None:
+                self._memory -= previous[1]
+
+    def _collect_docs_to_evict(self) -> list:
+        # Note: the lock must be held.
+        docs_to_evict = []
+        # Note: the most recently used entry is always kept.
+        while self._memory > self._max_memory and len(self._uri_to_doc_and_memory) > 1:
+            _uri, (doc_ref, memory) = self._uri_to_doc_and_memory.popitem(last=False)
+            self._memory -= memory
+            doc = doc_ref()
+            if doc is not None:
+                docs_to_evict.append(doc)
+        self.evictions += len(docs_to_evict)
+        return docs_to_evict
+
+    def _evict(self, docs_to_evict: list) -> None:
+        for doc in docs_to_evict:
+            try:
+                doc.evict_ast()
+            except:
+                log.exception("Error evicting AST of: %s", doc.uri)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "docs_with_ast": len(self._uri_to_doc_and_memory),
+                "estimated_memory_mb": round(self._memory / (1024 * 1024), 2),
+                "max_memory_mb": round(self._max_memory / (1024 * 1024), 2),
+                "evictions": self.evictions,
+                "reparses": self.reparses,
+            }
@@ -40,7 +40,6 @@ if sys.version_info[:2] < (3, 8):
     class Protocol(object):
         pass
 
-
 else:
     from typing import Protocol
 
@@ -341,6 +340,8 @@ class ISymbolsCache(Protocol):
 
 class ICompletionContextWorkspaceCaches(Protocol):
     cache_hits: int
+    cache_misses: int
+    invalidations: int
 
     def on_file_changed(self, filename: str):
         pass
@@ -380,6 +381,20 @@ class ICompletionContextWorkspaceCaches(Protocol):
     ) -> None:
         pass
 
+    def get_cached_doc_imports_info(self, doc_uri: str) -> Optional[Any]:
+        """
+        :return: the imports of the given (non-root) document (shared among the
+        different dependency graphs).
+        """
+
+    def cache_doc_imports_info(
+        self, doc_uri: str, doc_imports_info: Any, invalidation_tracker
+    ) -> None:
+        pass
+
+    def get_stats(self) -> dict:
+        pass
+
 
 class IRobotWorkspace(IWorkspace, Protocol):
     completion_context_workspace_caches: ICompletionContextWorkspaceCaches
@@ -424,6 +439,13 @@ class IKeywordFound(Protocol):
 
     completion_item_kind: int = -1
 
+    # The normalized keyword name (computed when the keyword is created).
+    normalized_keyword_name: str
+
+    # Matches a normalized keyword call text against a keyword with embedded
+    # arguments (None if the keyword has no embedded arguments).
+    embedded_args_matcher: Optional[Callable[[str], Any]]
+
     @property
     def source(self) -> str:
         """
@@ -713,6 +735,9 @@ class ICompletionContextDependencyGraph(Protocol):
     def do_invalidate_on_uri_change(self, uri: str) -> bool:
         pass
 
+    def iter_dependency_uris(self) -> Iterator[str]:
+        pass
+
 
 class ICompletionContext(Protocol):
     def __init__(
@@ -222,11 +222,10 @@ def _references_for_keyword_found(
     include_declaration: bool,
 ):
     from robocorp_ls_core import uris
-    from robotframework_ls.impl.text_utilities import normalize_robot_name
 
     ret: List[LocationTypedDict] = []
 
-    normalized_name = normalize_robot_name(keyword_found.keyword_name)
+    normalized_name = keyword_found.normalized_keyword_name
     # Ok, we have the keyword definition, now, we must actually look for the
     # references...
     if include_declaration:
@@ -8,6 +8,14 @@ OPTION_ROBOT_LANGUAGE_SERVER_TCP_PORT = "robot.language-server.tcp-port"
 
 OPTION_ROBOT_LANGUAGE_SERVER_ARGS = "robot.language-server.args"
 
+OPTION_ROBOT_LANGUAGE_SERVER_WARM_API_PROCESSES = (
+    "robot.language-server.warmApiProcesses"
+)
+
+OPTION_ROBOT_LANGUAGE_SERVER_MAX_INTERPRETER_APIS = (
+    "robot.language-server.maxInterpreterApis"
+)
+
 OPTION_ROBOT_VARIABLES = "robot.variables"
 
 OPTION_ROBOT_LINT_ROBOCOP_ENABLED = "robot.lint.robocop.enabled"
@@ -38,6 +46,10 @@ OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS = (
     "robot.workspaceSymbolsOnlyForOpenDocs"
 )
 
+OPTION_ROBOT_NON_OPEN_DOCS_AST_CACHE_MAX_MEMORY_MB = (
+    "robot.nonOpenDocsAstCache.maxMemoryMB"
+)
+
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM = "robot.completions.section_headers.form"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_PLURAL = "plural"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_SINGULAR = "singular"
@@ -53,11 +65,14 @@ ALL_ROBOT_OPTIONS = frozenset(
         OPTION_ROBOT_PYTHON_ENV,
         OPTION_ROBOT_LANGUAGE_SERVER_TCP_PORT,
         OPTION_ROBOT_LANGUAGE_SERVER_ARGS,
+        OPTION_ROBOT_LANGUAGE_SERVER_WARM_API_PROCESSES,
+        OPTION_ROBOT_LANGUAGE_SERVER_MAX_INTERPRETER_APIS,
         OPTION_ROBOT_VARIABLES,
         OPTION_ROBOT_LINT_ROBOCOP_ENABLED,
         OPTION_ROBOT_PYTHONPATH,
         OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM,
         OPTION_ROBOT_WORKSPACE_SYMBOLS_ONLY_FOR_OPEN_DOCS,
+        OPTION_ROBOT_NON_OPEN_DOCS_AST_CACHE_MAX_MEMORY_MB,
         OPTION_ROBOT_COMPLETION_KEYWORDS_FORMAT,
         OPTION_ROBOT_LIBRARIES_LIBDOC_NEEDS_ARGS,
         OPTION_ROBOT_LINT_ENABLED,
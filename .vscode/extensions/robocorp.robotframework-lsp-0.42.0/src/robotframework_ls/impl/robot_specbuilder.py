@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import sys
 import weakref
 from robocorp_ls_core.cache import instance_cache
 from typing import Optional, Union, Type, Callable, List, Tuple
@@ -94,29 +95,19 @@ def _markdown_doc(lower_doc_format: str, obj) -> Optional[str]:
     if lower_doc_format in ("markdown", "md"):
         return obj.doc
 
-    if lower_doc_format == "robot":
-        try:
-            return obj.__md_doc__
-        except AttributeError:
-            from robotframework_ls import robot_to_markdown
-
-            obj.__md_doc__ = robot_to_markdown.convert(obj.doc)
-        return obj.__md_doc__
-
-    if lower_doc_format == "html":
+    if lower_doc_format in ("robot", "html", "rest"):
         try:
             return obj.__md_doc__
         except AttributeError:
-            from robotframework_ls import html_to_markdown
-
-            obj.__md_doc__ = html_to_markdown.convert(obj.doc)
-        return obj.__md_doc__
+            from robotframework_ls.impl.markdown_docs_cache import (
+                get_markdown_docs_cache,
+            )
 
-    if lower_doc_format == "rest":
-        try:
-            return obj.__md_doc__
-        except AttributeError:
-            obj.__md_doc__ = _rest_to_markdown(obj.doc)
+            formatter = _get_formatter(lower_doc_format)
+            assert formatter is not None
+            obj.__md_doc__ = get_markdown_docs_cache().get_markdown(
+                lower_doc_format, obj.doc, formatter
+            )
         return obj.__md_doc__
 
     return None
@@ -255,10 +246,18 @@ class LibraryDoc(object):
     __str__ = __repr__
 
     def convert_docs_to_markdown(self) -> bool:
+        from robotframework_ls.impl.markdown_docs_cache import get_markdown_docs_cache
+
         old_doc_format = self.doc_format
-        formatter = _get_formatter(old_doc_format)
+        convert = _get_formatter(old_doc_format)
+
+        if convert is not None:
+            lower_doc_format = old_doc_format.lower()
+            markdown_docs_cache = get_markdown_docs_cache()
+
+            def formatter(doc: str) -> Optional[str]:
+                return markdown_docs_cache.get_markdown(lower_doc_format, doc, convert)
 
-        if formatter is not None:
             new_doc = formatter(self.doc)
             if new_doc is None:
                 # We can't format it (docutils not installed?)
@@ -272,6 +271,9 @@ class LibraryDoc(object):
                     init.doc = new
 
             for keyword in self.keywords:
+                # Note: the deprecation is computed from the original doc
+                # (the markup isn't kept when converted to markdown).
+                keyword.deprecated
                 new = formatter(keyword.doc)
                 if new is not None:
                     keyword.doc = new
@@ -298,10 +300,20 @@ class KeywordArg(object):
     NAMED_ONLY = "NAMED_ONLY"
     VAR_NAMED = "VAR_NAMED"
 
-    _is_keyword_arg = False
-    _is_star_arg = False
-    _default_value: Union[Type[Sentinel], str] = Sentinel
-    _arg_type: Union[Type[Sentinel], str] = Sentinel
+    # Many instances are kept in memory (for all the keywords of all the
+    # loaded libspecs), so, keep it compact.
+    __slots__ = [
+        "original_arg",
+        "kind",
+        "_is_keyword_arg",
+        "_is_star_arg",
+        "_default_value",
+        "_arg_type",
+        "_arg_name",
+    ]
+
+    _default_value: Union[Type[Sentinel], str]
+    _arg_type: Union[Type[Sentinel], str]
     _arg_name: str
 
     def __init__(
@@ -319,6 +331,10 @@ class KeywordArg(object):
         """
         self.original_arg = arg
         self.kind = kind
+        self._is_keyword_arg = False
+        self._is_star_arg = False
+        self._default_value = Sentinel
+        self._arg_type = Sentinel
 
         if arg.startswith("&"):
             self._is_keyword_arg = True
@@ -370,9 +386,9 @@ class KeywordArg(object):
                     arg = arg[:colon_i]
 
         if name is not Sentinel:
-            self._arg_name = typing.cast(str, name)
+            self._arg_name = sys.intern(typing.cast(str, name))
         else:
-            self._arg_name = arg
+            self._arg_name = sys.intern(arg)
 
     def to_dictionary(self):
         ret = {
@@ -425,20 +441,67 @@ class KeywordArg(object):
 
 
 class KeywordDoc(object):
+
+    __slots__ = [
+        "_weak_libdoc",
+        "name",
+        "_args",
+        "_doc",
+        "tags",
+        "_source",
+        "lineno",
+        "_deprecated",
+        "__instance_cache__",
+        # Memoizes the doc converted to markdown (see: _markdown_doc).
+        "__md_doc__",
+    ]
+
     def __init__(
-        self, weak_libdoc, name="", args=(), doc="", tags=(), source=None, lineno=-1
+        self,
+        weak_libdoc,
+        name="",
+        args=(),
+        doc="",
+        tags=(),
+        source=None,
+        lineno=-1,
+        deprecated: Optional[bool] = None,
     ):
         self._weak_libdoc = weak_libdoc
-        self.name = name
+        self.name = sys.intern(name) if name else name
         self._args = args
-        self.doc = doc
+        # Note: may also be an object with a `load()` method which provides
+        # the doc on demand (see: libspec_markdown_conversion).
+        self._doc = doc
         self.tags = tags
         self._source = source
         self.lineno = lineno
+        # Note: when not given it's computed from the doc when requested.
+        self._deprecated = deprecated
+
+    @property
+    def doc(self) -> str:
+        doc = self._doc
+        if not isinstance(doc, str):
+            loaded = doc.load()
+            if loaded is None:
+                # Unable to load it (don't cache it so that it's retried).
+                return ""
+            doc = self._doc = loaded
+        return doc
+
+    @doc.setter
+    def doc(self, doc: str) -> None:
+        self._doc = doc
 
     @property
     def deprecated(self) -> bool:
-        return self.doc.startswith("*DEPRECATED") and "*" in self.doc[1:]
+        deprecated = self._deprecated
+        if deprecated is None:
+            from robotframework_ls.impl.text_utilities import has_deprecated_text
+
+            deprecated = self._deprecated = has_deprecated_text(self.doc)
+        return deprecated
 
     @property  # type: ignore
     @instance_cache
@@ -479,6 +542,7 @@ class KeywordDoc(object):
             "name": self.name,
             "args": [arg.to_dictionary() for arg in self.args],
             "doc": self.doc,
+            "deprecated": self.deprecated,
             "tags": list(self.tags),
             "source": self.source,
             "lineno": self.lineno,
@@ -808,6 +872,7 @@ class JsonDocBuilder:
             source=kw["source"],
             lineno=int(kw.get("lineno", -1)),
             weak_libdoc=weak_libdoc,
+            deprecated=kw.get("deprecated"),
         )
 
     def _create_arguments(self, arguments) -> List[KeywordArg]:
@@ -38,6 +38,10 @@ from robotframework_ls.impl.protocols import (
     ICompletionContextWorkspaceCaches,
 )
 from robotframework_ls.impl.robot_constants import ROBOT_FILE_EXTENSIONS
+from robotframework_ls.impl.non_open_docs_ast_cache import (
+    NonOpenDocsAstCache,
+    DEFAULT_MAX_MEMORY_MB,
+)
 
 
 log = get_logger(__name__)
@@ -484,11 +488,18 @@ class RobotWorkspace(Workspace):
         )
 
         self.libspec_manager = libspec_manager
+        self.non_open_docs_ast_cache = NonOpenDocsAstCache()
 
         # It needs to be set to None in the initialization (while we setup folders).
         self.workspace_indexer: Optional[WorkspaceIndexer] = None
         self.completion_context_workspace_caches: ICompletionContextWorkspaceCaches = (
-            CompletionContextWorkspaceCaches()
+            CompletionContextWorkspaceCaches(
+                get_library_names_for_source=(
+                    libspec_manager.get_library_names_for_source
+                    if libspec_manager is not NULL
+                    else None
+                )
+            )
         )
 
         Workspace.__init__(
@@ -512,6 +523,7 @@ class RobotWorkspace(Workspace):
 
     @overrides(Workspace.put_document)
     def put_document(self, text_document: TextDocumentItem) -> IDocument:
+        self.non_open_docs_ast_cache.forget(text_document.uri)
         doc = typing.cast(IRobotDocument, Workspace.put_document(self, text_document))
         self.completion_context_workspace_caches.on_updated_document(doc.uri, doc)
         if self.workspace_indexer is not None:
@@ -556,8 +568,19 @@ class RobotWorkspace(Workspace):
 
     @overrides(Workspace.on_changed_config)
     def on_changed_config(self, config: IConfig):
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_NON_OPEN_DOCS_AST_CACHE_MAX_MEMORY_MB,
+        )
+
         Workspace.on_changed_config(self, config)
         self.completion_context_workspace_caches.clear_caches()
+        self.non_open_docs_ast_cache.set_max_memory_mb(
+            config.get_setting(
+                OPTION_ROBOT_NON_OPEN_DOCS_AST_CACHE_MAX_MEMORY_MB,
+                float,
+                DEFAULT_MAX_MEMORY_MB,
+            )
+        )
 
     @overrides(Workspace.dispose)
     def dispose(self):
@@ -571,7 +594,7 @@ class RobotWorkspace(Workspace):
     def _create_document(
         self, doc_uri, source=None, version=None, force_load_source=False
     ):
-        return RobotDocument(
+        doc = RobotDocument(
             doc_uri,
             source,
             version,
@@ -579,6 +602,10 @@ class RobotWorkspace(Workspace):
             mutate_thread=self._main_thread,
             force_load_source=force_load_source,
         )
+        if force_load_source:
+            # i.e.: it's being loaded from the filesystem (not open in the client).
+            doc.ast_cache = self.non_open_docs_ast_cache
+        return doc
 
     def __typecheckself__(self) -> None:
         _: IRobotWorkspace = check_implements(self)
@@ -613,11 +640,16 @@ class RobotDocument(Document):
         self._ast = None
         self.symbols_cache = None
 
+        # Set for documents which aren't open in the client (their AST may be
+        # evicted to bound the memory usage).
+        self.ast_cache: Optional[NonOpenDocsAstCache] = None
+        self._ast_evicted = False
+
     @overrides(Document._clear_caches)
     def _clear_caches(self):
         Document._clear_caches(self)
         self._symbols_cache = None
-        self.get_ast.cache_clear(self)  # noqa (clear the instance_cache).
+        self._get_cached_ast.cache_clear(self)  # noqa (clear the instance_cache).
         self.get_python_ast.cache_clear(self)  # noqa (clear the instance_cache).
         self.get_yaml_contents.cache_clear(self)  # noqa (clear the instance_cache).
 
@@ -638,8 +670,39 @@ class RobotDocument(Document):
 
         return self.TYPE_TEST_CASE
 
-    @instance_cache
     def get_ast(self):
+        ast = self._get_cached_ast()
+        ast_cache = self.ast_cache
+        if ast_cache is not None:
+            ast_cache.on_ast_accessed(self)
+        return ast
+
+    def evict_ast(self) -> None:
+        """
+        Evicts the AST (which is parsed again if requested later on).
+
+        Note: the symbols cache is kept.
+        """
+        self._ast_evicted = True
+        self._get_cached_ast.cache_clear(self)  # noqa (clear the instance_cache).
+
+    @instance_cache
+    def _get_cached_ast(self):
+        from robocorp_ls_core import tracing
+
+        with tracing.span("ast:parse"):
+            ast = self._get_ast()
+
+        ast_cache = self.ast_cache
+        if ast_cache is not None:
+            try:
+                source_len = len(self.source)
+            except:
+                source_len = 0
+            ast_cache.on_ast_created(self, source_len, self._ast_evicted)
+        return ast
+
+    def _get_ast(self):
         if not self._generate_ast:
             raise AssertionError(
                 "The AST can only be accessed in the RobotFrameworkServerApi, not in the RobotFrameworkLanguageServer."
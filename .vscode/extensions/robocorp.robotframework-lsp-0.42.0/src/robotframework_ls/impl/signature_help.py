@@ -17,7 +17,9 @@ def _library_signature_help(
     from robotframework_ls.impl import ast_utils
     from robotframework_ls.impl.robot_specbuilder import docs_and_format
     from robot.api import Token
-    from robotframework_ls.impl.keyword_argument_analysis import KeywordArgumentAnalysis
+    from robotframework_ls.impl.keyword_argument_analysis import (
+        get_keyword_argument_analysis,
+    )
     from robotframework_ls.impl.keyword_argument_analysis import (
         UsageInfoForKeywordArgumentAnalysis,
     )
@@ -60,7 +62,7 @@ def _library_signature_help(
 
         name_token = library_node.get_token(Token.NAME)
         if name_token is not None:
-            keyword_analysis = KeywordArgumentAnalysis(keyword_doc.args)
+            keyword_analysis = get_keyword_argument_analysis(keyword_doc.args)
             active_parameter = keyword_analysis.compute_active_parameter(
                 UsageInfoForKeywordArgumentAnalysis(library_node, name_token),
                 lineno=completion_context.sel.line,
@@ -101,7 +103,9 @@ def signature_help_internal(
     if keyword_definition_and_usage_info is None:
         return None
 
-    from robotframework_ls.impl.keyword_argument_analysis import KeywordArgumentAnalysis
+    from robotframework_ls.impl.keyword_argument_analysis import (
+        get_keyword_argument_analysis,
+    )
     from robotframework_ls.impl.keyword_argument_analysis import (
         UsageInfoForKeywordArgumentAnalysis,
     )
@@ -112,7 +116,7 @@ def signature_help_internal(
     keyword_found: IKeywordFound = keyword_definition.keyword_found
 
     keyword_args = keyword_found.keyword_args
-    keyword_analysis = KeywordArgumentAnalysis(keyword_args)
+    keyword_analysis = get_keyword_argument_analysis(keyword_args)
 
     keyword_token = usage_info.node.get_token(Token.KEYWORD)
 
@@ -32,6 +32,20 @@ class RobotStringMatcher(object):
 
         return False
 
+    def is_keyword_found_match(self, keyword_found: IKeywordFound) -> bool:
+        """
+        Same as `is_keyword_name_match` but uses the normalized name and the
+        embedded arguments matcher precomputed in the keyword found.
+        """
+        if self.filter_text == keyword_found.normalized_keyword_name:
+            return True
+
+        embedded_args_matcher = keyword_found.embedded_args_matcher
+        if embedded_args_matcher is not None:
+            return embedded_args_matcher(self.filter_text) is not None
+
+        return False
+
     def is_same_variable_name(self, variable_name):
         from robotframework_ls.impl.text_utilities import is_variable_text
 
@@ -78,7 +92,7 @@ class MatcherWithResourceOrLibraryName(RobotStringMatcher):
             name = keyword_found.resource_name or keyword_found.library_name
 
         if normalize_robot_name(name) == self.resource_or_library_name_normalized:
-            return self.is_keyword_name_match(keyword_found.keyword_name)
+            return self.is_keyword_found_match(keyword_found)
         return False
 
 
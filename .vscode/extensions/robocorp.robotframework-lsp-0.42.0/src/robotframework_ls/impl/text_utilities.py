@@ -1,7 +1,8 @@
 from functools import lru_cache
 from robocorp_ls_core.robotframework_log import get_logger
 import re
-from typing import Sequence
+import sys
+from typing import Any, Callable, Dict, Sequence, Tuple
 
 log = get_logger(__name__)
 
@@ -30,11 +31,31 @@ class TextUtilities(object):
         self.text = self.text.strip()
 
 
-# Note: this not only makes it faster, but also makes us use less memory as a
-# way to reuse the same 'interned" strings.
-@lru_cache(maxsize=2000)
-def normalize_robot_name(text):
-    return text.lower().replace("_", "").replace(" ", "")
+# The max number of names kept in the interning table (when the limit is
+# reached the table is cleared and populated again on demand).
+_MAX_NORMALIZED_NAMES = 200000
+
+# Maps the name to the normalized (interned) name.
+# Note: the access is not synchronized (the operations used are atomic and
+# in the worst case a name is normalized more than once).
+_name_to_normalized: Dict[str, str] = {}
+
+
+def normalize_robot_name(text: str) -> str:
+    """
+    Note: the normalized names are interned, so, this not only makes it faster,
+    but also makes us use less memory as the same strings are reused.
+    """
+    try:
+        return _name_to_normalized[text]
+    except KeyError:
+        pass
+
+    normalized = sys.intern(text.lower().replace("_", "").replace(" ", ""))
+    if len(_name_to_normalized) >= _MAX_NORMALIZED_NAMES:
+        _name_to_normalized.clear()
+    _name_to_normalized[text] = normalized
+    return normalized
 
 
 def is_variable_text(text: str) -> bool:
@@ -66,7 +87,74 @@ def contains_variable_text(text: str) -> bool:
     return False
 
 
-def matches_robot_keyword(keyword_name_call_text, keyword_name, _re_cache={}):
+# Maps the normalized keyword name (with embedded arguments) to a tuple with
+# the `match` method of the related compiled regexp and the literal prefix and
+# suffix of the name.
+_keyword_name_to_embedded_args_info: Dict[
+    str, Tuple[Callable[[str], Any], str, str]
+] = {}
+
+
+def _get_embedded_args_info(keyword_name: str) -> Tuple[Callable[[str], Any], str, str]:
+    try:
+        return _keyword_name_to_embedded_args_info[keyword_name]
+    except KeyError:
+        pass
+
+    from robotframework_ls.impl import ast_utils
+
+    prefix = keyword_name
+    suffix = ""
+    try:
+        tokenized_vars = list(ast_utils.tokenize_variables_from_name(keyword_name))
+    except:
+        regexp = [re.escape(keyword_name)]
+    else:
+        regexp = []
+        for t in tokenized_vars:
+            if t.type == t.VARIABLE:
+                regexp.append("(.*)")
+            else:
+                regexp.append(re.escape(t.value))
+
+        if any(t.type == t.VARIABLE for t in tokenized_vars):
+            first, last = tokenized_vars[0], tokenized_vars[-1]
+            prefix = first.value if first.type != first.VARIABLE else ""
+            suffix = last.value if last.type != last.VARIABLE else ""
+
+    regexp.append("$")
+
+    info = (re.compile("".join(regexp)).match, prefix, suffix)
+    _keyword_name_to_embedded_args_info[keyword_name] = info
+    return info
+
+
+def get_embedded_args_matcher(keyword_name: str) -> Callable[[str], Any]:
+    """
+    :param str keyword_name:
+        The normalized keyword (which has variables -- i.e.: '{').
+
+    :return: a callable which receives the (normalized) call text and returns
+    a match object if it matches the keyword (or None otherwise).
+    """
+    return _get_embedded_args_info(keyword_name)[0]
+
+
+def get_embedded_args_literal_prefix_and_suffix(keyword_name: str) -> Tuple[str, str]:
+    """
+    :param str keyword_name:
+        The normalized keyword (which has variables -- i.e.: '{').
+
+    :return: the literal text before the first and after the last embedded
+    argument (i.e.: for `clickelement${row}now` it's `("clickelement", "now")`).
+    Any call matching the keyword starts with the prefix and ends with the
+    suffix.
+    """
+    _matcher, prefix, suffix = _get_embedded_args_info(keyword_name)
+    return prefix, suffix
+
+
+def matches_robot_keyword(keyword_name_call_text, keyword_name):
     """
     Checks if a given text matches a given keyword.
 
@@ -79,32 +167,7 @@ def matches_robot_keyword(keyword_name_call_text, keyword_name, _re_cache={}):
     :param str keyword_name:
         The keyword (which has variables -- i.e.: '{').
     """
-
-    try:
-        compiled = _re_cache[keyword_name]
-    except KeyError:
-        from robotframework_ls.impl import ast_utils
-        import re
-
-        try:
-            tokenized_vars = ast_utils.tokenize_variables_from_name(keyword_name)
-        except:
-            regexp = [re.escape(keyword_name)]
-        else:
-            regexp = []
-            for t in tokenized_vars:
-                if t.type == t.VARIABLE:
-                    regexp.append("(.*)")
-                else:
-                    regexp.append(re.escape(t.value))
-
-        regexp.append("$")
-
-        regexp = "".join(regexp)
-        _re_cache[keyword_name] = re.compile(regexp)
-        compiled = _re_cache[keyword_name]
-
-    return compiled.match(keyword_name_call_text)
+    return get_embedded_args_matcher(keyword_name)(keyword_name_call_text)
 
 
 def iter_dotted_names(text: str):
@@ -0,0 +1,181 @@
+"""
+Helpers to keep the documents opened in the language server in sync with the
+server api processes.
+
+- The language server sends the checksum of the text after each change
+  (`textChecksum` in `textDocument/didChange`) so that the server api can
+  verify that it's in sync (and if it's not it requests the document contents
+  with `robot/getOpenDocText`).
+
+- `OpenDocsTextStore` is a content-addressed store (the files are named by the
+  sha256 of the contents) for the text of big open documents, so, when a
+  server api process is started (or needs to resync a document) the text is
+  referenced (`textRef`) instead of being sent through the pipe (and the same
+  file is shared by all the server api processes, which memory-map it to read
+  the contents).
+"""
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from robocorp_ls_core.protocols import TypedDict
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+GET_OPEN_DOC_TEXT_REQUEST = "robot/getOpenDocText"
+
+# Documents smaller than this are sent inline.
+MIN_CHARS_FOR_TEXT_STORE = 20000
+
+_MAX_FILES_IN_STORE = 200
+
+# A file is only removed from the store if it was written more than this
+# amount of seconds ago (so that a server api process which received the
+# reference can still read it).
+_MIN_SECONDS_IN_STORE = 60
+
+
+class TextRefTypedDict(TypedDict):
+    path: str
+    sha256: str
+
+
+def compute_text_checksum(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8", "surrogatepass"))
+
+
+class OpenDocsTextStore(object):
+    def __init__(self, store_dir: Optional[str] = None) -> None:
+        """
+        :param store_dir:
+            The directory where the files are written (if not given a temporary
+            directory is created on demand).
+        """
+        self._lock = threading.Lock()
+        self._store_dir = store_dir
+        self._sha256_to_path_and_time: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _get_store_dir(self) -> str:
+        # Note: the lock must be held.
+        store_dir = self._store_dir
+        if store_dir is None:
+            import tempfile
+
+            store_dir = self._store_dir = tempfile.mkdtemp(prefix="rfls_open_docs_")
+        return store_dir
+
+    def put(self, text: str) -> TextRefTypedDict:
+        contents = text.encode("utf-8", "surrogatepass")
+        sha256 = hashlib.sha256(contents).hexdigest()
+        with self._lock:
+            path_and_time = self._sha256_to_path_and_time.get(sha256)
+            if path_and_time is not None:
+                path = path_and_time[0]
+                self._sha256_to_path_and_time[sha256] = (path, time.time())
+                self._sha256_to_path_and_time.move_to_end(sha256)
+            else:
+                path = os.path.join(self._get_store_dir(), f"{sha256}.txt")
+                temp_path = f"{path}.tmp"
+                with open(temp_path, "wb") as stream:
+                    stream.write(contents)
+                os.replace(temp_path, path)
+                self._sha256_to_path_and_time[sha256] = (path, time.time())
+                self._remove_old_files()
+
+        return {"path": path, "sha256": sha256}
+
+    def _remove_old_files(self) -> None:
+        # Note: the lock must be held.
+        remove_before = time.time() - _MIN_SECONDS_IN_STORE
+        while len(self._sha256_to_path_and_time) > _MAX_FILES_IN_STORE:
+            sha256, (path, write_time) = next(
+                iter(self._sha256_to_path_and_time.items())
+            )
+            if write_time > remove_before:
+                break
+            del self._sha256_to_path_and_time[sha256]
+            try:
+                os.remove(path)
+            except:
+                log.exception("Error removing: %s", path)
+
+    def dispose(self) -> None:
+        import shutil
+
+        with self._lock:
+            store_dir = self._store_dir
+            self._sha256_to_path_and_time.clear()
+            if store_dir is not None:
+                shutil.rmtree(store_dir, ignore_errors=True)
+
+
+def load_text(text_ref: TextRefTypedDict) -> str:
+    """
+    Loads the text referenced by the given text ref (memory-mapping the file).
+
+    :raises RuntimeError: if the contents don't match the expected sha256.
+    """
+    import mmap
+
+    path = text_ref["path"]
+    with open(path, "rb") as stream:
+        if os.fstat(stream.fileno()).st_size == 0:
+            contents = b""
+        else:
+            contents = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if hashlib.sha256(contents).hexdigest() != text_ref["sha256"]:
+                raise RuntimeError(
+                    f"Contents of {path} don't match the expected sha256."
+                )
+            return str(contents, "utf-8", "surrogatepass")
+        finally:
+            if not isinstance(contents, bytes):
+                contents.close()
+
+
+_open_docs_text_store: Optional[OpenDocsTextStore] = None
+_open_docs_text_store_lock = threading.Lock()
+
+
+def get_open_docs_text_store() -> OpenDocsTextStore:
+    global _open_docs_text_store
+    if _open_docs_text_store is None:
+        with _open_docs_text_store_lock:
+            if _open_docs_text_store is None:
+                _open_docs_text_store = OpenDocsTextStore()
+    return _open_docs_text_store
+
+
+def create_text_document_params(uri: str, version, text: Optional[str]) -> dict:
+    """
+    :return: the params to open a document (or to provide its contents) in a
+    server api process (big texts are referenced from the text store).
+    """
+    if text is not None and len(text) >= MIN_CHARS_FOR_TEXT_STORE:
+        try:
+            text_ref = get_open_docs_text_store().put(text)
+        except:
+            log.exception("Error putting text of %s in the text store.", uri)
+        else:
+            return {
+                "textDocument": {"uri": uri, "version": version, "text": None},
+                "textRef": text_ref,
+            }
+
+    return {"textDocument": {"uri": uri, "version": version, "text": text}}
+
+
+def dispose_open_docs_text_store() -> None:
+    global _open_docs_text_store
+    with _open_docs_text_store_lock:
+        store = _open_docs_text_store
+        _open_docs_text_store = None
+    if store is not None:
+        store.dispose()
@@ -3,6 +3,10 @@ from typing import List, Optional
 
 from robocorp_ls_core.basic import log_and_silence_errors
 from robocorp_ls_core.jsonrpc.endpoint import require_monitor
+from robocorp_ls_core.jsonrpc.exceptions import (
+    JsonRpcContentModified,
+    JsonRpcRequestCancelled,
+)
 from robocorp_ls_core.protocols import (
     IRobotFrameworkApiClient,
     IMonitor,
@@ -11,6 +15,7 @@ from robocorp_ls_core.protocols import (
 from robocorp_ls_core.robotframework_log import get_logger
 from robotframework_ls.constants import DEFAULT_COMPLETIONS_TIMEOUT
 from robocorp_ls_core.lsp import CompletionItemTypedDict
+from robotframework_ls.superseded_requests import RequestGeneration
 
 
 log = get_logger(__name__)
@@ -28,12 +33,19 @@ class _RobotFrameworkLsCompletionImpl(object):
     def text_document_completion(self, doc_uri: str, line: int, col: int):
         rf_api_client = self._server_manager.get_regular_rf_api_client(doc_uri)
         if rf_api_client is not None:
+            ls = self._weak_robot_framework_ls()
+            generation = None
+            if ls is not None:
+                generation = ls.new_request_generation(
+                    "textDocument/completion", doc_uri
+                )
             func = partial(
                 self._threaded_document_completion,
                 rf_api_client,
                 doc_uri,
                 line,
                 col,
+                generation=generation,
             )
             func = require_monitor(func)
             return func
@@ -49,6 +61,36 @@ class _RobotFrameworkLsCompletionImpl(object):
         line: int,
         col: int,
         monitor: IMonitor,
+        generation: Optional[RequestGeneration] = None,
+    ) -> list:
+        if generation is None:
+            return self._document_completion(rf_api_client, doc_uri, line, col, monitor)
+
+        try:
+            if generation.short_circuit():
+                # A completion for a newer version of the document was already
+                # requested.
+                raise JsonRpcContentModified()
+
+            generation.add_cancel_callback(monitor.cancel)
+            try:
+                return self._document_completion(
+                    rf_api_client, doc_uri, line, col, monitor
+                )
+            except JsonRpcRequestCancelled:
+                if generation.cancelled:
+                    raise JsonRpcContentModified()
+                raise
+        finally:
+            generation.mark_done()
+
+    def _document_completion(
+        self,
+        rf_api_client: IRobotFrameworkApiClient,
+        doc_uri: str,
+        line: int,
+        col: int,
+        monitor: IMonitor,
     ) -> list:
         from robotframework_ls.impl.completion_context import CompletionContext
         from robotframework_ls.impl import section_completions
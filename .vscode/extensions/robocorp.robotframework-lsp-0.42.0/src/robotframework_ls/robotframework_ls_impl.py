@@ -1,7 +1,6 @@
 from robocorp_ls_core.python_ls import PythonLanguageServer
 from robocorp_ls_core.basic import overrides, log_and_silence_errors
 import os
-import time
 from robotframework_ls.constants import DEFAULT_COMPLETIONS_TIMEOUT
 from robocorp_ls_core.robotframework_log import get_logger
 from typing import Any, Optional, Dict
@@ -21,7 +20,8 @@ from robotframework_ls.ep_providers import (
 from robocorp_ls_core.jsonrpc.endpoint import require_monitor
 from functools import partial
 import itertools
-from robotframework_ls import __version__, rf_interactive_integration
+from concurrent import futures
+from robotframework_ls import __version__
 import typing
 import sys
 from robocorp_ls_core.watchdog_wrapper import IFSObserver
@@ -173,7 +173,6 @@ command_dispatcher = _CommandDispatcher()
 class RobotFrameworkLanguageServer(PythonLanguageServer):
     def __init__(self, rx, tx) -> None:
         from robocorp_ls_core.pluginmanager import PluginManager
-        from robotframework_ls.rf_interactive_integration import _RfInterpretersManager
         from robotframework_ls.server_manager import ServerManager
         from robotframework_ls.ep_providers import DefaultConfigurationProvider
         from robotframework_ls.ep_providers import DefaultEndPointProvider
@@ -184,6 +183,7 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         from robotframework_ls.robotframework_ls_completion_impl import (
             _RobotFrameworkLsCompletionImpl,
         )
+        from robotframework_ls.superseded_requests import SupersededRequestsTracker
 
         PythonLanguageServer.__init__(self, rx, tx)
 
@@ -208,7 +208,8 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         self._pm.set_instance(
             EPEndPointProvider, DefaultEndPointProvider(self._endpoint)
         )
-        self._rf_interpreters_manager = _RfInterpretersManager(self._endpoint, self._pm)
+        # Created on demand (the interactive console is not needed at startup).
+        self._rf_interpreters_manager_instance = None
 
         watch_impl = os.environ.get("ROBOTFRAMEWORK_LS_WATCH_IMPL", "auto")
         if watch_impl not in ("watchdog", "fsnotify", "auto"):
@@ -255,6 +256,7 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
         self._server_manager = ServerManager(self._pm, language_server=self)
         self._lint_manager = _LintManager(self._server_manager, self._lsp_messages)
+        self._superseded_requests = SupersededRequestsTracker()
         self._robot_framework_ls_completion_impl = _RobotFrameworkLsCompletionImpl(
             self._server_manager, self
         )
@@ -348,7 +350,7 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             "completionProvider": {"resolveProvider": True},  # Docs are lazily computed
             "documentFormattingProvider": True,
             "documentHighlightProvider": True,
-            "documentRangeFormattingProvider": False,
+            "documentRangeFormattingProvider": True,
             "documentSymbolProvider": True,
             "definitionProvider": True,
             "executeCommandProvider": {
@@ -395,8 +397,22 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         log.debug("Server capabilities: %s", server_capabilities)
         return server_capabilities
 
+    @property
+    def _rf_interpreters_manager(self):
+        if self._rf_interpreters_manager_instance is None:
+            from robotframework_ls.rf_interactive_integration import (
+                _RfInterpretersManager,
+            )
+
+            self._rf_interpreters_manager_instance = _RfInterpretersManager(
+                self._endpoint, self._pm
+            )
+        return self._rf_interpreters_manager_instance
+
     def m_workspace__execute_command(self, command: str = "", arguments=()) -> Any:
         if command.startswith("robot.internal.rfinteractive."):
+            from robotframework_ls import rf_interactive_integration
+
             return rf_interactive_integration.execute_command(
                 command, self, self._rf_interpreters_manager, arguments
             )
@@ -449,16 +465,72 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
     @command_dispatcher("robot.getInternalInfo")
     def _get_internal_info(self, *arguments):
+        """
+        :param arguments:
+            Optionally a dict with `chromeTraceFile`: if given the spans of all
+            the processes are dumped to that file (in the Chrome trace format).
+        """
+        from robocorp_ls_core import tracing
+
+        chrome_trace_file = None
+        if arguments and isinstance(arguments[0], dict):
+            chrome_trace_file = arguments[0].get("chromeTraceFile")
+
         in_memory_docs = []
         workspace = self.workspace
         if workspace:
             for doc in workspace.iter_documents():
                 in_memory_docs.append({"uri": doc.uri})
-        return {
+        tracer = tracing.get_tracer()
+        ret = {
             "settings": self.config.get_full_settings(),
             "inMemoryDocs": in_memory_docs,
             "processId": os.getpid(),
+            "latency": tracer.get_histograms(),
+            "supersededRequests": self._superseded_requests.get_metrics(),
         }
+        trace_events = tracer.get_chrome_trace_events() if chrome_trace_file else []
+
+        def dump_chrome_trace():
+            if chrome_trace_file:
+                tracing.dump_chrome_trace(chrome_trace_file, trace_events)
+                ret["chromeTraceFile"] = chrome_trace_file
+
+        # Note: only apis which are already started are queried (the internal
+        # info shouldn't start new processes).
+        api_clients = []
+        for api in self._server_manager.collect_apis():
+            rf_api_client = api.started_robotframework_api_client
+            if rf_api_client is not None:
+                api_clients.append((api.log_extension, api.stats, rf_api_client))
+
+        if not api_clients:
+            dump_chrome_trace()
+            return ret
+
+        def _threaded_get_internal_info(monitor: IMonitor):
+            apis_info = []
+            for log_extension, stats, rf_api_client in api_clients:
+                internal_info = self._threaded_api_request_no_doc(
+                    rf_api_client,
+                    "request_internal_info",
+                    monitor,
+                    include_trace_events=bool(chrome_trace_file),
+                )
+                if isinstance(internal_info, dict):
+                    trace_events.extend(internal_info.pop("traceEvents", ()))
+                apis_info.append(
+                    {
+                        "api": log_extension,
+                        "requestsStats": stats,
+                        "internalInfo": internal_info,
+                    }
+                )
+            ret["apis"] = apis_info
+            dump_chrome_trace()
+            return ret
+
+        return require_monitor(_threaded_get_internal_info)
 
     @command_dispatcher("robot.resolveInterpreter")
     def _resolve_interpreter(self, *arguments):
@@ -537,6 +609,9 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         except Exception:
             log.exception("Error disposing RemoteFSObserver.")
         self._server_manager.shutdown()
+        log.info(
+            "Superseded requests metrics: %s", self._superseded_requests.get_metrics()
+        )
 
         PythonLanguageServer.m_shutdown(self, **kwargs)
 
@@ -547,9 +622,7 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
         PythonLanguageServer.m_exit(self, **kwargs)
 
-    def m_text_document__formatting(
-        self, textDocument=None, options=None
-    ) -> Optional[list]:
+    def m_text_document__formatting(self, textDocument=None, options=None) -> Any:
         doc_uri = textDocument["uri"]
 
         source_format_rf_api_client = self._server_manager.get_others_api_client(
@@ -562,31 +635,57 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         message_matcher = source_format_rf_api_client.request_source_format(
             text_document=textDocument, options=options
         )
+        return self._code_format_future(source_format_rf_api_client, message_matcher)
+
+    def m_text_document__range_formatting(
+        self, textDocument=None, range=None, options=None
+    ) -> Any:
+        doc_uri = textDocument["uri"]
+
+        source_format_rf_api_client = self._server_manager.get_others_api_client(
+            doc_uri
+        )
+        if source_format_rf_api_client is None:
+            log.info("Unable to get API for source format.")
+            return []
+
+        message_matcher = source_format_rf_api_client.request_source_format_range(
+            text_document=textDocument, range=range, options=options
+        )
+        return self._code_format_future(source_format_rf_api_client, message_matcher)
+
+    def _code_format_future(
+        self,
+        rf_api_client: IRobotFrameworkApiClient,
+        message_matcher: Optional[IIdMessageMatcher],
+    ) -> futures.Future:
+        from robocorp_ls_core.client_base import create_future_from_message_matcher
+
         if message_matcher is None:
             raise RuntimeError(
                 "Error requesting code formatting (message_matcher==None)."
             )
-        curtime = time.time()
-        maxtime = curtime + DEFAULT_COMPLETIONS_TIMEOUT
+
+        def on_message(msg):
+            if msg is None:
+                raise RuntimeError("Code formatting timed-out.")
+            result = msg.get("result")
+            if result:
+                return result
+            return []
 
         # i.e.: wait X seconds for the code format and bail out if we
         # can't get it.
-        available_time = maxtime - time.time()
-        if available_time <= 0:
-            raise RuntimeError("Code formatting timed-out (available_time <= 0).")
-
-        if message_matcher.event.wait(available_time):
-            msg = message_matcher.msg
-            if msg is not None:
-                result = msg.get("result")
-                if result:
-                    return result
-                else:
-                    return []
-        raise RuntimeError("Code formatting timed-out.")
+        return create_future_from_message_matcher(
+            message_matcher,
+            rf_api_client.request_cancel,
+            DEFAULT_COMPLETIONS_TIMEOUT,
+            on_message,
+        )
 
     @overrides(PythonLanguageServer.m_text_document__did_close)
     def m_text_document__did_close(self, textDocument=None, **_kwargs):
+        self._superseded_requests.forget_doc(textDocument["uri"])
         self._server_manager.forward(
             ("api", "lint", "others"),
             "textDocument/didClose",
@@ -598,10 +697,20 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
     @overrides(PythonLanguageServer.m_text_document__did_open)
     def m_text_document__did_open(self, textDocument=None, **_kwargs):
+        from robotframework_ls.open_docs_text_store import (
+            create_text_document_params,
+        )
+
+        # Big documents are referenced from the text store (so that the text
+        # isn't sent through the pipe of each api).
         self._server_manager.forward(
             ("api", "lint", "others"),
             "textDocument/didOpen",
-            {"textDocument": textDocument},
+            create_text_document_params(
+                textDocument["uri"],
+                textDocument.get("version"),
+                textDocument.get("text"),
+            ),
         )
         PythonLanguageServer.m_text_document__did_open(
             self, textDocument=textDocument, **_kwargs
@@ -611,13 +720,30 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
     def m_text_document__did_change(
         self, contentChanges=None, textDocument=None, **_kwargs
     ):
+        from robotframework_ls.open_docs_text_store import compute_text_checksum
+
+        # Note: the changes are applied before forwarding so that the checksum
+        # of the resulting text is sent along (and the apis are able to detect
+        # whether they're out of sync).
+        PythonLanguageServer.m_text_document__did_change(
+            self, contentChanges=contentChanges, textDocument=textDocument, **_kwargs
+        )
+
+        text_checksum = None
+        ws = self.workspace
+        if ws is not None:
+            doc = ws.get_document(textDocument["uri"], accept_from_file=False)
+            if doc is not None:
+                text_checksum = compute_text_checksum(doc.source)
+
         self._server_manager.forward(
             ("api", "lint", "others"),
             "textDocument/didChange",
-            {"contentChanges": contentChanges, "textDocument": textDocument},
-        )
-        PythonLanguageServer.m_text_document__did_change(
-            self, contentChanges=contentChanges, textDocument=textDocument, **_kwargs
+            {
+                "contentChanges": contentChanges,
+                "textDocument": textDocument,
+                "textChecksum": text_checksum,
+            },
         )
 
     @overrides(PythonLanguageServer.m_workspace__did_change_workspace_folders)
@@ -656,6 +782,22 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
     def cancel_lint(self, doc_uri) -> None:
         self._lint_manager.cancel_lint(doc_uri)
 
+    def new_request_generation(self, kind: str, doc_uri: str):
+        """
+        Registers a new request of the given kind for the current version of
+        the given document (in-flight requests of the same kind for previous
+        versions of the document are cancelled).
+
+        :return Optional[RequestGeneration]:
+        """
+        ws = self.workspace
+        if not ws:
+            return None
+        document = ws.get_document(doc_uri, accept_from_file=False)
+        if document is None:
+            return None
+        return self._superseded_requests.new_generation(kind, doc_uri, document.version)
+
     def m_completion_item__resolve(self, **params):
         completion_item: CompletionItemTypedDict = params
         return self._robot_framework_ls_completion_impl.resolve_completion_item(
@@ -753,6 +895,60 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
         return None
 
+    @log_and_silence_errors(log)
+    def _forward_api_request(
+        self,
+        rf_api_client: IRobotFrameworkApiClient,
+        request_method_name: str,
+        doc_uri: Optional[str],
+        __timeout__=DEFAULT_COMPLETIONS_TIMEOUT,
+        __log__=False,
+        **kwargs,
+    ) -> Optional[futures.Future]:
+        """
+        Forwards a request to the api without holding a thread while its
+        response isn't available (so, slow requests don't use up the threads
+        used to process requests).
+
+        :param doc_uri:
+            If given, it's passed as the first argument to the request.
+
+            Note: this is called in the thread which reads the messages, so,
+            it's not checked here whether the document exists (as it could
+            require reading it from the disk). The server api does that check
+            and replies with None if it doesn't exist.
+
+        :return:
+            A future which is resolved with the result (or None) when the
+            response is received (in the thread which reads the responses).
+        """
+        from robocorp_ls_core.client_base import create_future_from_message_matcher
+
+        func = getattr(rf_api_client, request_method_name)
+
+        message_matcher: Optional[IIdMessageMatcher]
+        if doc_uri is not None:
+            message_matcher = func(doc_uri, **kwargs)
+        else:
+            message_matcher = func(**kwargs)
+
+        if message_matcher is None:
+            log.debug("Message matcher for %s returned None.", request_method_name)
+            return None
+
+        def on_message(msg):
+            if msg is not None:
+                result = msg.get("result")
+                if __log__:
+                    log.info("Result: %s", result)
+                if result:
+                    return result
+            return None
+
+        return create_future_from_message_matcher(
+            message_matcher, rf_api_client.request_cancel, __timeout__, on_message
+        )
+
     def async_api_forward(
         self,
         api_client_method_name: str,
@@ -760,8 +956,14 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         doc_uri: str,
         default_return=None,
         __add_doc_uri_in_args__=True,
+        __superseded_kind__: Optional[str] = None,
         **kwargs,
     ):
+        """
+        :param __superseded_kind__:
+            If given, a request of the same kind for a newer version of the
+            document cancels this request (if it's still in-flight).
+        """
         rf_api_client: Optional[IRobotFrameworkApiClient]
         if target_api == "api":
             rf_api_client = self._server_manager.get_regular_rf_api_client(doc_uri)
@@ -774,23 +976,17 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
 
         self._last_doc_uri = doc_uri
         if rf_api_client is not None:
-            if __add_doc_uri_in_args__:
-                func = partial(
-                    self._threaded_api_request,
-                    rf_api_client,
-                    api_client_method_name,
-                    doc_uri=doc_uri,
-                    **kwargs,
-                )
-            else:
-                func = partial(
-                    self._threaded_api_request_no_doc,
-                    rf_api_client,
-                    api_client_method_name,
-                    **kwargs,
-                )
-            func = require_monitor(func)
-            return func
+            generation = None
+            if __superseded_kind__:
+                generation = self.new_request_generation(__superseded_kind__, doc_uri)
+
+            future = self._forward_api_request(
+                rf_api_client,
+                api_client_method_name,
+                doc_uri if __add_doc_uri_in_args__ else None,
+                **kwargs,
+            )
+            return self._superseded_requests.track_future(generation, future)
 
         log.info(
             "No api available (call: %s, uri: %s).", api_client_method_name, doc_uri
@@ -824,7 +1020,12 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         line, col = kwargs["position"]["line"], kwargs["position"]["character"]
 
         return self.async_api_forward(
-            "request_signature_help", "api", doc_uri, line=line, col=col
+            "request_signature_help",
+            "api",
+            doc_uri,
+            line=line,
+            col=col,
+            __superseded_kind__="textDocument/signatureHelp",
         )
 
     def m_text_document__folding_range(self, **kwargs):
@@ -873,7 +1074,12 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         line, col = params["position"]["line"], params["position"]["character"]
 
         return self.async_api_forward(
-            "request_hover", "api", doc_uri, line=line, col=col
+            "request_hover",
+            "api",
+            doc_uri,
+            line=line,
+            col=col,
+            __superseded_kind__="textDocument/hover",
         )
 
     def m_text_document__references(self, **kwargs):
@@ -886,18 +1092,15 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         # the related caches).
         rf_api_client = self._server_manager.get_regular_rf_api_client(doc_uri)
         if rf_api_client is not None:
-            func = partial(
-                self._threaded_api_request,
+            return self._forward_api_request(
                 rf_api_client,
                 "request_references",
-                doc_uri=doc_uri,
+                doc_uri,
                 line=line,
                 col=col,
                 include_declaration=include_declaration,
                 __timeout__=9999999,
             )
-            func = require_monitor(func)
-            return func
 
         log.info("Unable to compute references (no api available).")
         return []
@@ -915,6 +1118,7 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             default_return={"resultId": None, "data": []},
             text_document=textDocument,
             __add_doc_uri_in_args__=False,
+            __superseded_kind__="textDocument/semanticTokens/full",
         )
 
     def m_workspace__symbol(self, query: Optional[str] = None) -> Any:
@@ -933,5 +1137,10 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         line, col = params["position"]["line"], params["position"]["character"]
 
         return self.async_api_forward(
-            "request_document_highlight", "others", doc_uri, line=line, col=col
+            "request_document_highlight",
+            "others",
+            doc_uri,
+            line=line,
+            col=col,
+            __superseded_kind__="textDocument/documentHighlight",
         )
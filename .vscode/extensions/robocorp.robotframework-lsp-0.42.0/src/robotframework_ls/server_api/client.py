@@ -53,7 +53,7 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         return True
 
     def initialize(
-        self, msg_id=None, process_id=None, root_uri=u"", workspace_folders=()
+        self, msg_id=None, process_id=None, root_uri="", workspace_folders=()
     ):
         from robocorp_ls_core.options import NO_TIMEOUT, USE_TIMEOUTS
 
@@ -201,6 +201,18 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
             {"jsonrpc": "2.0", "id": msg_id, "method": method_name, "params": params}
         )
 
+    def forward_async_encoded(
+        self, method_name, encoded_params: bytes
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        self._check_process_alive()
+        msg_id = self.next_id()
+        # Note: `write` doesn't see the method of encoded messages.
+        self.stats[method_name] = self.stats.get(method_name, 0) + 1
+        return self.request_async_encoded(msg_id, method_name, encoded_params)
+
     def open(self, uri, version, source):
         self.forward(
             "textDocument/didOpen",
@@ -273,6 +285,21 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
             self._build_msg("codeFormat", text_document=text_document, options=options)
         )
 
+    def request_source_format_range(
+        self, text_document, range, options
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(
+            self._build_msg(
+                "codeFormatRange",
+                text_document=text_document,
+                range=range,
+                options=options,
+            )
+        )
+
     def request_signature_help(self, doc_uri, line, col) -> Optional[IIdMessageMatcher]:
         """
         :Note: async complete.
@@ -319,6 +346,18 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         """
         return self.request_async(self._build_msg("waitForFullTestCollection"))
 
+    def request_internal_info(
+        self, include_trace_events: bool = False
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(
+            self._build_msg(
+                "getInternalInfo", include_trace_events=include_trace_events
+            )
+        )
+
     def request_evaluatable_expression(
         self, doc_uri, position
     ) -> Optional[IIdMessageMatcher]:
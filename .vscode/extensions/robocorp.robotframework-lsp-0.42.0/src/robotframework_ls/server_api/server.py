@@ -1,7 +1,7 @@
 from robocorp_ls_core.python_ls import PythonLanguageServer
 from robocorp_ls_core.basic import overrides
 from robocorp_ls_core.robotframework_log import get_logger
-from typing import Optional, List, Dict, Deque, Tuple
+from typing import Optional, List, Dict, Deque, Tuple, Set
 from robocorp_ls_core.protocols import IConfig, IMonitor, ITestInfoTypedDict, IWorkspace
 from functools import partial
 from robocorp_ls_core.jsonrpc.endpoint import require_monitor
@@ -77,6 +77,14 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         self._completion_contexts_saved_lock = threading.Lock()
         self._completion_contexts_saved: Deque[ICompletionContext] = deque()
 
+        from robotframework_ls.impl.code_analysis import AnalysisBlocksCache
+
+        self._analysis_blocks_cache = AnalysisBlocksCache()
+
+        # The uris for which the contents were requested to the language server
+        # because they're out of sync (only accessed in the reader thread).
+        self._resync_pending_uris: Set[str] = set()
+
     @overrides(PythonLanguageServer._create_config)
     def _create_config(self) -> IConfig:
         from robotframework_ls.robot_config import RobotConfig
@@ -153,6 +161,113 @@ class RobotFrameworkServerApi(PythonLanguageServer):
     def m_workspace__did_change_configuration(self, **kwargs):
         PythonLanguageServer.m_workspace__did_change_configuration(self, **kwargs)
         self.libspec_manager.config = self.config
+        self._analysis_blocks_cache.clear()
+
+    @overrides(PythonLanguageServer.m_text_document__did_open)
+    def m_text_document__did_open(self, textDocument=None, textRef=None, **_kwargs):
+        if textRef is not None:
+            from robotframework_ls.open_docs_text_store import load_text
+
+            try:
+                text = load_text(textRef)
+            except:
+                log.exception("Error loading text of: %s", textDocument["uri"])
+                # Load it from the filesystem for now and ask for the contents.
+                textDocument = textDocument.copy()
+                textDocument.pop("text", None)
+                PythonLanguageServer.m_text_document__did_open(
+                    self, textDocument=textDocument, **_kwargs
+                )
+                self._request_doc_resync(textDocument["uri"])
+                return
+
+            textDocument = textDocument.copy()
+            textDocument["text"] = text
+
+        PythonLanguageServer.m_text_document__did_open(
+            self, textDocument=textDocument, **_kwargs
+        )
+
+    @overrides(PythonLanguageServer.m_text_document__did_change)
+    def m_text_document__did_change(
+        self, contentChanges=None, textDocument=None, textChecksum=None, **_kwargs
+    ):
+        doc_uri = textDocument["uri"]
+        ws = self.workspace
+        if ws is not None:
+            doc = ws.get_document(doc_uri, accept_from_file=False)
+            if doc is None:
+                log.info("Received change for document which isn't open: %s", doc_uri)
+                return
+
+            new_version = textDocument.get("version")
+            if (
+                isinstance(new_version, int)
+                and isinstance(doc.version, int)
+                and new_version <= doc.version
+            ):
+                # The contents were already received in a resync.
+                return
+
+        PythonLanguageServer.m_text_document__did_change(
+            self, contentChanges=contentChanges, textDocument=textDocument, **_kwargs
+        )
+
+        if textChecksum is not None and ws is not None:
+            from robotframework_ls.open_docs_text_store import compute_text_checksum
+
+            doc = ws.get_document(doc_uri, accept_from_file=False)
+            if doc is not None and compute_text_checksum(doc.source) != textChecksum:
+                log.info("Document out of sync (checksum mismatch): %s", doc_uri)
+                self._request_doc_resync(doc_uri)
+
+    def _request_doc_resync(self, doc_uri: str) -> None:
+        """
+        Requests the contents of the given document to the language server.
+
+        Note: must be called in the reader thread (the response is also
+        handled in the reader thread, so, the workspace may be mutated there).
+        """
+        from robotframework_ls.open_docs_text_store import GET_OPEN_DOC_TEXT_REQUEST
+
+        if doc_uri in self._resync_pending_uris:
+            return
+        self._resync_pending_uris.add(doc_uri)
+
+        future = self._endpoint.request(GET_OPEN_DOC_TEXT_REQUEST, {"uri": doc_uri})
+        future.add_done_callback(partial(self._on_doc_resync, doc_uri))
+
+    def _on_doc_resync(self, doc_uri: str, future) -> None:
+        from robocorp_ls_core.lsp import TextDocumentItem
+        from robotframework_ls.open_docs_text_store import load_text
+
+        self._resync_pending_uris.discard(doc_uri)
+        try:
+            result = future.result()
+            if not result:
+                log.info("Unable to resync (document no longer open): %s", doc_uri)
+                return
+
+            text_document = result["textDocument"]
+            text = text_document.get("text")
+            text_ref = result.get("textRef")
+            if text_ref is not None:
+                text = load_text(text_ref)
+
+            ws = self.workspace
+            if ws is not None and ws.get_document(doc_uri, accept_from_file=False):
+                ws.put_document(
+                    TextDocumentItem(
+                        uri=doc_uri, version=text_document.get("version"), text=text
+                    )
+                )
+                log.info(
+                    "Document resynced: %s (version: %s)",
+                    doc_uri,
+                    text_document.get("version"),
+                )
+        except:
+            log.exception("Error resyncing document: %s", doc_uri)
 
     @overrides(PythonLanguageServer.lint)
     def lint(self, *args, **kwargs):
@@ -234,7 +349,7 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             )
             if lint_ls_enabled:
                 analysis_errors = code_analysis.collect_analysis_errors(
-                    completion_context
+                    completion_context, self._analysis_blocks_cache
                 )
                 monitor.check_cancelled()
                 log.debug(
@@ -483,8 +598,28 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         func = require_monitor(func)
         return func
 
-    def _threaded_code_format(self, text_document, options, monitor: IMonitor):
+    def m_code_format_range(self, text_document, range, options):
+        func = partial(
+            self._threaded_code_format, text_document, options, format_range=range
+        )
+        func = require_monitor(func)
+        return func
+
+    def _threaded_code_format(
+        self,
+        text_document,
+        options,
+        monitor: IMonitor,
+        format_range: Optional[RangeTypedDict] = None,
+    ):
+        """
+        :param format_range:
+            If given, only the blocks (test cases/keywords/statements in other
+            sections) which intersect the given range are formatted.
+        """
         from robotframework_ls.impl.formatting import create_text_edit_from_diff
+        from robotframework_ls.impl.formatting import compute_format_lines_range
+        from robotframework_ls.impl.formatting import filter_text_edits_in_lines
         from robocorp_ls_core.lsp import TextDocumentItem
         import os.path
         from robotframework_ls.impl.robot_lsp_constants import (
@@ -499,13 +634,15 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
         text_document_item = TextDocumentItem(**text_document)
         text = text_document_item.text
-        if not text:
+        completion_context = None
+        if not text or format_range is not None:
             completion_context = self._create_completion_context(
                 text_document_item.uri, 0, 0, monitor
             )
             if completion_context is None:
                 return []
-            text = completion_context.doc.source
+            if not text:
+                text = completion_context.doc.source
 
         if not text:
             return []
@@ -513,6 +650,21 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         if not self._check_and_log_rf_dependency_version():
             return []
 
+        # 0-based lines (inclusive) to be formatted.
+        lines_range = None
+        if format_range is not None:
+            start_line = format_range["start"]["line"]
+            end_line = format_range["end"]["line"]
+            if end_line > start_line and format_range["end"]["character"] == 0:
+                # The selection ends at the start of the line (so, that line
+                # isn't really selected).
+                end_line -= 1
+            lines_range = compute_format_lines_range(
+                completion_context.get_ast(), start_line, end_line
+            )
+            if lines_range is None:
+                return []
+
         if options is None:
             options = {}
         tab_size = options.get("tabSize", 4)
@@ -555,6 +707,13 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
             from robocorp_ls_core.robotidy_wrapper import robot_tidy_source_format
 
+            if completion_context is None:
+                completion_context = self._create_completion_context(
+                    text_document_item.uri, 0, 0, monitor
+                )
+                if completion_context is None:
+                    return []
+
             ast = completion_context.get_ast()
             path = completion_context.doc.path
             dirname = "."
@@ -569,7 +728,13 @@ class RobotFrameworkServerApi(PythonLanguageServer):
                 dirname = os.path.dirname(path)
 
             try:
-                new_contents = robot_tidy_source_format(ast, dirname)
+                if lines_range is not None:
+                    # robotidy lines are 1-based.
+                    new_contents = robot_tidy_source_format(
+                        ast, dirname, lines_range[0] + 1, lines_range[1] + 1
+                    )
+                else:
+                    new_contents = robot_tidy_source_format(ast, dirname)
             except ImportError:
                 log.critical(
                     "Unable to code-format because robotidy could not be imported."
@@ -578,7 +743,12 @@ class RobotFrameworkServerApi(PythonLanguageServer):
 
         if new_contents is None or new_contents == text:
             return []
-        return [x.to_dict() for x in create_text_edit_from_diff(text, new_contents)]
+        text_edits = create_text_edit_from_diff(text, new_contents)
+        if lines_range is not None:
+            # The builtin tidy always formats the whole document (and robotidy
+            # could still change something outside of the range).
+            text_edits = filter_text_edits_in_lines(text_edits, *lines_range)
+        return [x.to_dict() for x in text_edits]
 
     def _create_completion_context(
         self, doc_uri, line, col, monitor: Optional[IMonitor]
@@ -749,6 +919,32 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         workspace_indexer.wait_for_full_test_collection()
         return True
 
+    def m_get_internal_info(self, include_trace_events: bool = False) -> dict:
+        import os
+        from robotframework_ls.impl.protocols import IRobotWorkspace
+        from robocorp_ls_core import tracing
+
+        tracer = tracing.get_tracer()
+        ret: dict = {"processId": os.getpid(), "latency": tracer.get_histograms()}
+        if include_trace_events:
+            ret["traceEvents"] = tracer.get_chrome_trace_events()
+        workspace = self.workspace
+        if workspace:
+            ws = typing.cast(IRobotWorkspace, workspace)
+            ret[
+                "completionContextWorkspaceCaches"
+            ] = ws.completion_context_workspace_caches.get_stats()
+            non_open_docs_ast_cache = getattr(ws, "non_open_docs_ast_cache", None)
+            if non_open_docs_ast_cache is not None:
+                ret["nonOpenDocsAstCache"] = non_open_docs_ast_cache.get_stats()
+
+        analysis_blocks_cache = self._analysis_blocks_cache
+        ret["analysisBlocksCache"] = {
+            "blocks_reused": analysis_blocks_cache.blocks_reused,
+            "blocks_analyzed": analysis_blocks_cache.blocks_analyzed,
+        }
+        return ret
+
     def m_hover(self, doc_uri: str, line: int, col: int):
         func = partial(self._threaded_hover, doc_uri, line, col)
         func = require_monitor(func)
@@ -48,7 +48,12 @@ def start_server_process(args=(), python_exe=None, env=None):
         if not os.path.exists(python_exe):
             raise RuntimeError("Expected %s to exist" % (python_exe,))
 
-    args = [python_exe or sys.executable, "-u", __file__] + list(args)
+    python_args = [python_exe or sys.executable, "-u"]
+    if Setup.options.DEBUG_IMPORT_TIME:
+        # Startup profile: the timings are written to the stderr of the
+        # process (which _stderr_reader copies to the stderr of this process).
+        python_args.extend(["-X", "importtime"])
+    args = python_args + [__file__] + list(args)
     log.debug('Starting server api process with args: "%s"' % ('" "'.join(args),))
     environ = os.environ.copy()
     environ.pop("PYTHONPATH", "")
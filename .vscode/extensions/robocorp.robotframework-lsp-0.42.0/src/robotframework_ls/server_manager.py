@@ -9,7 +9,7 @@ import sys
 import weakref
 import os
 from robocorp_ls_core.robotframework_log import get_logger
-from typing import Any, Dict, Optional, Tuple, List, Iterable
+from typing import Any, Dict, Optional, Tuple, List, Iterable, Callable
 from robotframework_ls.ep_resolve_interpreter import (
     EPResolveInterpreter,
     IInterpreterInfo,
@@ -22,6 +22,7 @@ from robocorp_ls_core.protocols import (
 )
 import itertools
 from functools import partial
+from collections import OrderedDict
 
 DEFAULT_API_ID = "default"
 
@@ -30,6 +31,96 @@ log = get_logger(__name__)
 _next_id = partial(next, itertools.count(0))
 
 
+@log_and_silence_errors(log)
+def _kill_server_process(server_process) -> None:
+    if is_process_alive(server_process.pid):
+        kill_process_and_subprocesses(server_process.pid)
+
+
+class _ServerProcessPool(object):
+    """
+    Keeps server api processes which were already started (but which are still
+    not initialized) so that they can be claimed without having to wait for
+    the process startup.
+
+    Processes are keyed by everything which is used to start them (python
+    executable, environment and the server api flags).
+
+    This class is not thread-safe and should be accessed only from the same
+    thread as the ServerManager.
+    """
+
+    def __init__(self, max_idle_processes: int = 0) -> None:
+        self.max_idle_processes = max_idle_processes
+        self._key_to_processes: "OrderedDict[tuple, List[Any]]" = OrderedDict()
+
+    def claim(self, key: tuple) -> Optional[Any]:
+        processes = self._key_to_processes.pop(key, None)
+        while processes:
+            server_process = processes.pop(0)
+            if is_process_alive(server_process.pid):
+                if processes:
+                    self._key_to_processes[key] = processes
+                log.debug("Claimed warm server api process: %s", server_process.pid)
+                return server_process
+        return None
+
+    def _count_processes(self) -> int:
+        return sum(len(processes) for processes in self._key_to_processes.values())
+
+    @log_and_silence_errors(log)
+    def prespawn(
+        self,
+        key: tuple,
+        start_server_process: Callable[[], Any],
+        evict: bool = True,
+    ) -> None:
+        """
+        Makes sure that an idle process is available for the given key (if
+        the pool is enabled).
+
+        :param evict:
+            If False the process is only started if the pool still has room
+            for it (i.e.: processes already in the pool aren't evicted).
+        """
+        if self.max_idle_processes <= 0:
+            return
+
+        if not evict and self._count_processes() >= self.max_idle_processes:
+            return
+
+        processes = self._key_to_processes.get(key)
+        if processes is None:
+            processes = self._key_to_processes[key] = []
+        else:
+            self._key_to_processes.move_to_end(key)
+
+        if not processes:
+            server_process = start_server_process()
+            log.debug("Started warm server api process: %s", server_process.pid)
+            processes.append(server_process)
+        self._evict()
+
+    def _evict(self) -> None:
+        count = self._count_processes()
+        while count > self.max_idle_processes and self._key_to_processes:
+            # The first key is the least recently used one.
+            key = next(iter(self._key_to_processes))
+            processes = self._key_to_processes[key]
+            if processes:
+                _kill_server_process(processes.pop(0))
+                count -= 1
+            if not processes:
+                del self._key_to_processes[key]
+
+    def dispose(self) -> None:
+        key_to_processes = self._key_to_processes
+        self._key_to_processes = OrderedDict()
+        for processes in key_to_processes.values():
+            for server_process in processes:
+                _kill_server_process(server_process)
+
+
 class _ServerApi(object):
     """
     Note: this is mainly a helper to manage the startup of an IRobotFrameworkApiClient
@@ -47,8 +138,10 @@ class _ServerApi(object):
         pre_generate_libspecs: bool = False,
         index_workspace: bool = False,
         collect_tests: bool = False,
+        process_pool: Optional[_ServerProcessPool] = None,
     ) -> None:
         self._main_thread = threading.current_thread()
+        self._process_pool = process_pool
 
         from robotframework_ls.robot_config import RobotConfig
 
@@ -82,6 +175,20 @@ class _ServerApi(object):
             return client.stats
         return None
 
+    @property
+    def log_extension(self) -> str:
+        return self._log_extension
+
+    @property
+    def started_robotframework_api_client(
+        self,
+    ) -> Optional[IRobotFrameworkApiClient]:
+        """
+        :return: the api client if it's already started (doesn't start it
+        if still not started).
+        """
+        return self._robotframework_api_client
+
     def _check_in_main_thread(self):
         curr_thread = threading.current_thread()
         if self._main_thread is not curr_thread:
@@ -215,68 +322,30 @@ class _ServerApi(object):
 
         if server_process is None:
             try:
-                from robotframework_ls.options import Setup
                 from robotframework_ls.server_api.client import RobotFrameworkApiClient
-                from robotframework_ls.server_api.server__main__ import (
-                    start_server_process,
-                )
                 from robocorp_ls_core.jsonrpc.streams import (
                     JsonRpcStreamWriter,
                     JsonRpcStreamReader,
                 )
-                from robotframework_ls.robotframework_ls_impl import (
-                    RobotFrameworkLanguageServer,
+                from robotframework_ls.open_docs_text_store import (
+                    GET_OPEN_DOC_TEXT_REQUEST,
+                    create_text_document_params,
                 )
 
-                args = []
-                if Setup.options.verbose:
-                    args.append("-" + "v" * int(Setup.options.verbose))
-                if Setup.options.log_file:
-                    log_id = _next_id()
-                    # i.e.: use a log id in case we create more than one in the
-                    # same session.
-                    if log_id == 0:
-                        args.append(
-                            "--log-file=" + Setup.options.log_file + self._log_extension
-                        )
-                    else:
-                        args.append(
-                            "--log-file="
-                            + Setup.options.log_file
-                            + (".%s" % (log_id,))
-                            + self._log_extension
-                        )
-
-                if self._pre_generate_libspecs:
-                    args.append("--pre-generate-libspecs")
-
-                if self._index_workspace:
-                    args.append("--index-workspace")
-
-                if self._collect_tests:
-                    args.append("--collect-tests")
-
                 python_exe = self._get_python_executable()
                 environ = self._get_environ()
 
                 self._used_python_executable = python_exe
                 self._used_environ = environ
 
-                robot_framework_language_server: RobotFrameworkLanguageServer = (
-                    self.robot_framework_language_server
-                )
-                remote_fs_observer_port = (
-                    robot_framework_language_server.get_remote_fs_observer_port()
-                )
-                if not remote_fs_observer_port:
-                    raise RuntimeError(
-                        f"Expected the port to hear the Remote filesystem observer to be available. Found: {remote_fs_observer_port}"
+                process_pool = self._process_pool
+                if process_pool is not None:
+                    server_process = process_pool.claim(
+                        self._get_process_pool_key(python_exe, environ)
                     )
 
-                args.append(f"--remote-fs-observer-port={remote_fs_observer_port}")
-                server_process = start_server_process(
-                    args=args, python_exe=python_exe, env=environ
-                )
+                if server_process is None:
+                    server_process = self._start_server_process(python_exe, environ)
 
                 self._server_process = server_process
 
@@ -296,6 +365,10 @@ class _ServerApi(object):
                 api = self._robotframework_api_client = RobotFrameworkApiClient(
                     w, r, server_process, on_received_message=on_received_message
                 )
+                api.register_request_handler(
+                    GET_OPEN_DOC_TEXT_REQUEST,
+                    partial(self._on_get_open_doc_text, api, workspace),
+                )
 
                 log.debug(
                     "Initializing api... (this pid: %s, api pid: %s).",
@@ -319,7 +392,8 @@ class _ServerApi(object):
                         {"settings": config.get_full_settings()},
                     )
 
-                # Open existing documents in the API.
+                # Open existing documents in the API (big documents are
+                # referenced from the text store instead of being sent).
                 source: Optional[str]
                 for document in workspace.iter_documents():
                     log.debug("Forwarding doc: %s to api...", document.uri)
@@ -330,13 +404,17 @@ class _ServerApi(object):
 
                     api.forward(
                         "textDocument/didOpen",
-                        {
-                            "textDocument": {
-                                "uri": document.uri,
-                                "version": document.version,
-                                "text": source,
-                            }
-                        },
+                        create_text_document_params(
+                            document.uri, document.version, source
+                        ),
+                    )
+
+                if process_pool is not None:
+                    # Keep a warm process around for the next time a process
+                    # with the same settings is needed.
+                    process_pool.prespawn(
+                        self._get_process_pool_key(python_exe, environ),
+                        partial(self._start_server_process, python_exe, environ),
                     )
 
             except Exception as e:
@@ -373,6 +451,84 @@ class _ServerApi(object):
 
         return self._robotframework_api_client
 
+    def prespawn_server_process(self) -> None:
+        """
+        Starts a process in the pool for this api (if it's still not started)
+        so that the first request for a new interpreter doesn't have to wait
+        for the whole process startup.
+        """
+        self._check_in_main_thread()
+        process_pool = self._process_pool
+        if process_pool is None or self._server_process is not None:
+            return
+
+        python_exe = self._get_python_executable()
+        environ = self._get_environ()
+        process_pool.prespawn(
+            self._get_process_pool_key(python_exe, environ),
+            partial(self._start_server_process, python_exe, environ),
+            evict=False,
+        )
+
+    def _get_process_pool_key(self, python_exe: str, environ: Dict[str, str]) -> tuple:
+        return (
+            self._log_extension,
+            self._pre_generate_libspecs,
+            self._index_workspace,
+            self._collect_tests,
+            python_exe,
+            tuple(sorted(environ.items())),
+        )
+
+    def _start_server_process(self, python_exe: str, environ: Dict[str, str]):
+        from robotframework_ls.options import Setup
+        from robotframework_ls.server_api.server__main__ import start_server_process
+        from robotframework_ls.robotframework_ls_impl import (
+            RobotFrameworkLanguageServer,
+        )
+
+        args = []
+        if Setup.options.verbose:
+            args.append("-" + "v" * int(Setup.options.verbose))
+        if Setup.options.log_file:
+            log_id = _next_id()
+            # i.e.: use a log id in case we create more than one in the
+            # same session.
+            if log_id == 0:
+                args.append(
+                    "--log-file=" + Setup.options.log_file + self._log_extension
+                )
+            else:
+                args.append(
+                    "--log-file="
+                    + Setup.options.log_file
+                    + (".%s" % (log_id,))
+                    + self._log_extension
+                )
+
+        if self._pre_generate_libspecs:
+            args.append("--pre-generate-libspecs")
+
+        if self._index_workspace:
+            args.append("--index-workspace")
+
+        if self._collect_tests:
+            args.append("--collect-tests")
+
+        robot_framework_language_server: RobotFrameworkLanguageServer = (
+            self.robot_framework_language_server
+        )
+        remote_fs_observer_port = (
+            robot_framework_language_server.get_remote_fs_observer_port()
+        )
+        if not remote_fs_observer_port:
+            raise RuntimeError(
+                f"Expected the port to hear the Remote filesystem observer to be available. Found: {remote_fs_observer_port}"
+            )
+
+        args.append(f"--remote-fs-observer-port={remote_fs_observer_port}")
+        return start_server_process(args=args, python_exe=python_exe, env=environ)
+
     @log_and_silence_errors(log)
     def _dispose_server_process(self):
         self._check_in_main_thread()
@@ -402,6 +558,38 @@ class _ServerApi(object):
             return api.forward(method_name, params)
         return None
 
+    def _on_get_open_doc_text(
+        self,
+        api: IRobotFrameworkApiClient,
+        workspace: IWorkspace,
+        method,
+        msg_id,
+        params,
+    ) -> bool:
+        """
+        Called (in the api reader thread) when the api detects that a document
+        is out of sync and requests its contents.
+        """
+        from robotframework_ls.open_docs_text_store import create_text_document_params
+
+        result = None
+        uri = params.get("uri") if isinstance(params, dict) else None
+        try:
+            if uri:
+                document = workspace.get_document(uri, accept_from_file=False)
+                if document is not None:
+                    log.info("Providing contents of %s to api (out of sync).", uri)
+                    result = create_text_document_params(
+                        uri, document.version, document.source
+                    )
+        except:
+            log.exception("Error getting contents of: %s", uri)
+
+        # Note: always reply (even on errors) so that the api doesn't wait
+        # forever.
+        api.write({"jsonrpc": "2.0", "id": msg_id, "result": result})
+        return True
+
     @log_and_silence_errors(log)
     def forward_async(self, method_name, params) -> Optional[IMessageMatcher]:
         self._check_in_main_thread()
@@ -410,6 +598,16 @@ class _ServerApi(object):
             return api.forward_async(method_name, params)
         return None
 
+    @log_and_silence_errors(log)
+    def forward_async_encoded(
+        self, method_name, encoded_params: bytes
+    ) -> Optional[IMessageMatcher]:
+        self._check_in_main_thread()
+        api = self.get_robotframework_api_client()
+        if api is not None:
+            return api.forward_async_encoded(method_name, encoded_params)
+        return None
+
     @log_and_silence_errors(log)
     def open(self, uri, version, source):
         self._check_in_main_thread()
@@ -484,7 +682,12 @@ class ServerManager(object):
         self._config: Optional[IConfig] = config
         self._workspace: Optional[IWorkspace] = workspace
         self._pm = pm
-        self._id_to_apis: Dict[str, _RegularLintAndOthersApi] = {}
+        # Note: kept in the order of usage (the last is the most recently used).
+        self._id_to_apis: "OrderedDict[str, _RegularLintAndOthersApi]" = OrderedDict()
+        self._process_pool = _ServerProcessPool()
+        self._max_interpreter_apis = 5
+        if config is not None:
+            self._update_pool_settings(config)
         if language_server is None:
             self._language_server_ref = lambda: None
         else:
@@ -503,9 +706,27 @@ class ServerManager(object):
             for api in apis:
                 yield api
 
+    def _update_pool_settings(self, config: IConfig) -> None:
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LANGUAGE_SERVER_WARM_API_PROCESSES,
+            OPTION_ROBOT_LANGUAGE_SERVER_MAX_INTERPRETER_APIS,
+        )
+
+        self._process_pool.max_idle_processes = config.get_setting(
+            OPTION_ROBOT_LANGUAGE_SERVER_WARM_API_PROCESSES, int, 0
+        )
+        self._max_interpreter_apis = config.get_setting(
+            OPTION_ROBOT_LANGUAGE_SERVER_MAX_INTERPRETER_APIS, int, 5
+        )
+
     def set_config(self, config: IConfig) -> None:
         self._check_in_main_thread()
         self._config = config
+        self._update_pool_settings(config)
+        # If the limits were lowered, stop the processes which are no longer
+        # needed right away (and not only when a new process is started).
+        self._process_pool._evict()
+        self._evict_least_recently_used_apis()
         for api in self._iter_all_apis():
             api.config = config
 
@@ -524,13 +745,19 @@ class ServerManager(object):
             self._language_server_ref,
             index_workspace=True,
             collect_tests=collect_tests,
+            process_pool=self._process_pool,
         )
 
         lint_api = _ServerApi(
-            ".lint.api", self._language_server_ref, pre_generate_libspecs=True
+            ".lint.api",
+            self._language_server_ref,
+            pre_generate_libspecs=True,
+            process_pool=self._process_pool,
         )
 
-        others_api = _ServerApi(".others.api", self._language_server_ref)
+        others_api = _ServerApi(
+            ".others.api", self._language_server_ref, process_pool=self._process_pool
+        )
 
         config = self._config
         if config is not None:
@@ -546,13 +773,34 @@ class ServerManager(object):
 
         apis = _RegularLintAndOthersApi(api, lint_api, others_api)
         self._id_to_apis[api_id] = apis
+        self._evict_least_recently_used_apis()
         return apis
 
+    def _evict_least_recently_used_apis(self) -> None:
+        """
+        Stops the processes of the least recently used interpreters when
+        there are more than `robot.language-server.maxInterpreterApis` (the
+        default api is never evicted). If the interpreter is used again the
+        processes are recreated.
+        """
+        self._check_in_main_thread()
+        interpreter_ids = [
+            api_id for api_id in self._id_to_apis if api_id != DEFAULT_API_ID
+        ]
+        max_interpreter_apis = max(1, self._max_interpreter_apis)
+        for api_id in interpreter_ids[: len(interpreter_ids) - max_interpreter_apis]:
+            log.debug("Evicting server apis for interpreter: %s", api_id)
+            apis = self._id_to_apis.pop(api_id)
+            for api in apis:
+                api.exit()
+
     def _get_default_apis(self) -> _RegularLintAndOthersApi:
         self._check_in_main_thread()
         apis = self._id_to_apis.get(DEFAULT_API_ID)
         if not apis:
             apis = self._create_apis(DEFAULT_API_ID, collect_tests=True)
+            for api in apis:
+                api.prespawn_server_process()
         return apis
 
     def _get_apis_for_doc_uri(self, doc_uri: str) -> _RegularLintAndOthersApi:
@@ -567,30 +815,47 @@ class ServerManager(object):
                     interpreter_id = interpreter_info.get_interpreter_id()
                     apis = self._id_to_apis.get(interpreter_id)
                     if apis is not None:
+                        self._id_to_apis.move_to_end(interpreter_id)
                         apis.set_interpreter_info(interpreter_info)
                     else:
                         apis = self._create_apis(interpreter_id)
                         apis.set_interpreter_info(interpreter_info)
+                        # The interpreter was still not seen: start its
+                        # processes right away (in parallel) so that the apis
+                        # which aren't used in this request are warm when
+                        # needed.
+                        for api in apis:
+                            api.prespawn_server_process()
 
                     return apis
 
         return self._get_default_apis()
 
     def forward(self, target: Tuple[str, ...], method_name: str, params: Any) -> None:
+        from robocorp_ls_core.client_base import encode_params
+
         self._check_in_main_thread()
+        if not self._id_to_apis:
+            return
+
+        # The params are encoded only once and the same bytes are sent to all
+        # the APIs (i.e.: for a didOpen/didChange with a big text the encoding
+        # may be expensive).
+        encoded_params = encode_params(params)
+
         apis: _RegularLintAndOthersApi
         for apis in self._id_to_apis.values():
             # Note: always forward async to all APIs (all the messages are sent
             # from the current main thread, so, the messages ordering is still
             # guaranteed to be correct).
             if "api" in target:
-                apis.api.forward_async(method_name, params)
+                apis.api.forward_async_encoded(method_name, encoded_params)
 
             if "lint" in target:
-                apis.lint_api.forward_async(method_name, params)
+                apis.lint_api.forward_async_encoded(method_name, encoded_params)
 
             if "others" in target:
-                apis.others_api.forward_async(method_name, params)
+                apis.others_api.forward_async_encoded(method_name, encoded_params)
 
     def shutdown(self) -> None:
         self._check_in_main_thread()
@@ -598,9 +863,15 @@ class ServerManager(object):
             api.shutdown()
 
     def exit(self) -> None:
+        from robotframework_ls.open_docs_text_store import (
+            dispose_open_docs_text_store,
+        )
+
         self._check_in_main_thread()
         for api in self._iter_all_apis():
             api.exit()
+        self._process_pool.dispose()
+        dispose_open_docs_text_store()
 
     def collect_apis(self) -> List[_ServerApi]:
         return list(self._iter_all_apis())
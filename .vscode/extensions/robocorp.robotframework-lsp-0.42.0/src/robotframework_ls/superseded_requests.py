@@ -0,0 +1,224 @@
+"""
+While the user types the client sends bursts of requests (completion, hover,
+signature help, ...) for successive versions of a document. Only the result
+for the latest version is actually useful, so, when a request of some kind
+is received for a newer version of a document, the in-flight requests of the
+same kind for older versions of that document are cancelled (and if their
+processing still didn't start, it's short-circuited). The client receives a
+ContentModified error for those.
+"""
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+
+def _cancel_as_content_modified(future) -> None:
+    # The endpoint replies with ContentModified (instead of RequestCancelled)
+    # for a future cancelled with this marker.
+    future.__content_modified__ = True
+    future.cancel()
+
+
+class RequestGeneration(object):
+    """
+    Represents a request of some kind for a given version of a document.
+    """
+
+    __slots__ = [
+        "kind",
+        "doc_uri",
+        "doc_version",
+        "_tracker",
+        "_lock",
+        "_cancel_callbacks",
+        "cancelled",
+        "done",
+    ]
+
+    def __init__(self, tracker, kind: str, doc_uri: str, doc_version: Any) -> None:
+        self.kind = kind
+        self.doc_uri = doc_uri
+        self.doc_version = doc_version
+        self._tracker = tracker
+        self._lock = threading.Lock()
+        self._cancel_callbacks: List[Callable[[], Any]] = []
+        self.cancelled = False
+        self.done = False
+
+    def add_cancel_callback(self, callback: Callable[[], Any]) -> bool:
+        """
+        Adds a callback to be called when this generation is superseded (if it
+        was already superseded the callback is called right away).
+
+        :return: True if the generation is still active and False otherwise.
+        """
+        with self._lock:
+            if not self.cancelled:
+                self._cancel_callbacks.append(callback)
+                return True
+
+        callback()
+        return False
+
+    def short_circuit(self) -> bool:
+        """
+        To be called just before the processing of the request starts.
+
+        :return: True if the request was superseded (in which case the request
+        shouldn't be processed).
+        """
+        if self.cancelled:
+            self._tracker._on_short_circuit(self)
+            return True
+        return False
+
+    def cancel(self) -> bool:
+        """
+        :return: True if it was cancelled while still in-flight.
+        """
+        with self._lock:
+            if self.cancelled or self.done:
+                return False
+            self.cancelled = True
+            callbacks = self._cancel_callbacks
+            self._cancel_callbacks = []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except:
+                log.exception("Error cancelling superseded request.")
+        return True
+
+    def mark_done(self, *args) -> None:
+        with self._lock:
+            self.done = True
+            self._cancel_callbacks = []
+        self._tracker._on_done(self)
+
+
+class _KindMetrics(object):
+    __slots__ = ["requests", "cancelled_in_flight", "short_circuited"]
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.cancelled_in_flight = 0
+        self.short_circuited = 0
+
+
+class SupersededRequestsTracker(object):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key_to_generation: Dict[Tuple[str, str], RequestGeneration] = {}
+        self._kind_to_metrics: Dict[str, _KindMetrics] = {}
+
+    def _get_metrics(self, kind: str) -> _KindMetrics:
+        # Note: the lock must be held.
+        metrics = self._kind_to_metrics.get(kind)
+        if metrics is None:
+            metrics = self._kind_to_metrics[kind] = _KindMetrics()
+        return metrics
+
+    def new_generation(
+        self, kind: str, doc_uri: str, doc_version: Any
+    ) -> Optional[RequestGeneration]:
+        """
+        Registers a new request of the given kind for the given document
+        version, cancelling an in-flight request of the same kind for a
+        previous version of the document.
+
+        :return: None if the document version isn't available (in which case
+        the request isn't tracked).
+        """
+        if doc_version is None:
+            return None
+
+        key = (kind, doc_uri)
+        generation = RequestGeneration(self, kind, doc_uri, doc_version)
+        with self._lock:
+            metrics = self._get_metrics(kind)
+            metrics.requests += 1
+            previous = self._key_to_generation.get(key)
+            if previous is not None and previous.doc_version == doc_version:
+                # A request for the same version is not superseded (i.e.: hover
+                # in a different location of the same document: the client
+                # cancels it if it's not needed).
+                previous = None
+            self._key_to_generation[key] = generation
+
+        if previous is not None and previous.cancel():
+            with self._lock:
+                metrics.cancelled_in_flight += 1
+            log.debug(
+                "Cancelled superseded %s (uri: %s, version: %s -> %s).",
+                kind,
+                doc_uri,
+                previous.doc_version,
+                doc_version,
+            )
+        return generation
+
+    def track_future(self, generation: Optional[RequestGeneration], future):
+        """
+        Helper to cancel the given future when the generation is superseded.
+
+        :return: the passed future.
+        """
+        if generation is not None:
+            if future is None:
+                # Nothing to track (i.e.: the request wasn't forwarded).
+                generation.mark_done()
+            else:
+                future.add_done_callback(generation.mark_done)
+                generation.add_cancel_callback(
+                    partial(_cancel_as_content_modified, future)
+                )
+        return future
+
+    def _on_short_circuit(self, generation: RequestGeneration) -> None:
+        with self._lock:
+            self._get_metrics(generation.kind).short_circuited += 1
+
+    def _on_done(self, generation: RequestGeneration) -> None:
+        key = (generation.kind, generation.doc_uri)
+        with self._lock:
+            if self._key_to_generation.get(key) is generation:
+                del self._key_to_generation[key]
+
+    def forget_doc(self, doc_uri: str) -> None:
+        """
+        Cancels any in-flight request for the given document (i.e.: it was
+        closed).
+        """
+        with self._lock:
+            keys = [key for key in self._key_to_generation if key[1] == doc_uri]
+            generations = [self._key_to_generation.pop(key) for key in keys]
+
+        for generation in generations:
+            if generation.cancel():
+                with self._lock:
+                    self._get_metrics(generation.kind).cancelled_in_flight += 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: a dict with the kind of the request mapping to the number of
+        requests, how many were cancelled while in-flight and how many of the
+        cancelled ones were short-circuited (i.e.: cancelled before their
+        processing started).
+        """
+        with self._lock:
+            return dict(
+                (
+                    kind,
+                    {
+                        "requests": metrics.requests,
+                        "cancelled_in_flight": metrics.cancelled_in_flight,
+                        "short_circuited": metrics.short_circuited,
+                    },
+                )
+                for kind, metrics in self._kind_to_metrics.items()
+            )
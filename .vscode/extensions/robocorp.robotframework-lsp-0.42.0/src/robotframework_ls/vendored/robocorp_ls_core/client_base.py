@@ -1,8 +1,13 @@
 import itertools
+from concurrent import futures
 from functools import partial
 import threading
 from robocorp_ls_core.basic import implements
-from robocorp_ls_core.robotframework_log import get_logger
+from robocorp_ls_core.robotframework_log import (
+    get_logger,
+    TruncatedPayload,
+    LOG_LEVEL_DEBUG,
+)
 from robocorp_ls_core.protocols import (
     ILanguageServerClientBase,
     Sentinel,
@@ -13,6 +18,7 @@ from robocorp_ls_core.protocols import (
 )
 from typing import Any, Union, Optional, List, Callable, Dict
 from robocorp_ls_core.callbacks import Callback
+from robocorp_ls_core import tracing
 
 log = get_logger(__name__)
 
@@ -21,12 +27,37 @@ class _MessageMatcher(object):
     def __init__(self):
         self.event = threading.Event()
         self.msg = None
+        self._callbacks_lock = threading.Lock()
+        self._done_callbacks: List[Callable[[Any], None]] = []
 
     def notify(self, msg):
         # msg can be None if the communication was finished in the meanwhile.
         self.msg = msg
         self.event.set()
 
+        with self._callbacks_lock:
+            done_callbacks = self._done_callbacks
+            self._done_callbacks = []
+
+        for callback in done_callbacks:
+            try:
+                callback(self)
+            except:
+                log.exception("Error calling: %s", callback)
+
+    def add_done_callback(self, callback: Callable[[Any], None]) -> None:
+        """
+        :param callback:
+            Called with this message matcher when the message is received (in
+            the thread which reads the messages) or right away if it was
+            already received.
+        """
+        with self._callbacks_lock:
+            if not self.event.is_set():
+                self._done_callbacks.append(callback)
+                return
+        callback(self)
+
 
 class _IdMessageMatcher(_MessageMatcher):
     def __init__(self, message_id):
@@ -62,6 +93,42 @@ class _PatternMessageMatcher(_MessageMatcher):
     __repr__ = __str__
 
 
+def encode_params(params: Any) -> bytes:
+    """
+    Encodes the params of a message so that the same encoded params can be
+    sent in multiple requests (see: `encode_request`).
+    """
+    import json
+
+    return json.dumps(params).encode("utf-8")
+
+
+def encode_request(
+    message_id, method_name: str, encoded_params: bytes, trace_id=None
+) -> bytes:
+    """
+    :return: the json-encoded request with the given (already encoded) params.
+    """
+    import json
+
+    header_contents = {"jsonrpc": "2.0", "id": message_id, "method": method_name}
+    if trace_id is not None:
+        header_contents["traceId"] = trace_id
+    header = json.dumps(header_contents)
+    # i.e.: replace the closing brace by the params.
+    return b"".join(
+        (header[:-1].encode("utf-8"), b', "params": ', encoded_params, b"}")
+    )
+
+
+def _add_trace_id(contents: dict) -> None:
+    # The trace id of the request being handled in this thread (if any) is
+    # propagated so that the request can be followed among processes.
+    trace_id = tracing.get_trace_id()
+    if trace_id is not None and "traceId" not in contents:
+        contents["traceId"] = trace_id
+
+
 def wait_for_message_matcher(
     message_matcher: IIdMessageMatcher,
     request_cancel: Callable[[Any], None],
@@ -114,6 +181,57 @@ def wait_for_message_matcher(
     return False
 
 
+def create_future_from_message_matcher(
+    message_matcher: IIdMessageMatcher,
+    request_cancel: Callable[[Any], None],
+    timeout: float,
+    on_message: Callable[[Optional[dict]], Any],
+) -> "futures.Future":
+    """
+    Provides a future which is resolved with `on_message(msg)` when the message
+    is received (without requiring a thread waiting for it).
+
+    Note: if the future is cancelled or the timeout elapses the cancel is
+    automatically passed to the api too (in the timeout case the future is
+    resolved with `on_message(None)`).
+    """
+    from robocorp_ls_core.timeouts import TimeoutTracker
+
+    future: futures.Future = futures.Future()
+    # The result may be set from the timeout thread or the reader thread.
+    lock = threading.Lock()
+
+    def set_result(msg):
+        with lock:
+            if future.done():
+                return
+            try:
+                result = on_message(msg)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def on_timeout():
+        request_cancel(message_matcher.message_id)
+        set_result(None)
+
+    timeout_handle = TimeoutTracker.get_singleton().call_on_timeout(timeout, on_timeout)
+
+    def on_message_matcher_done(message_matcher):
+        timeout_handle.__exit__(None, None, None)
+        set_result(message_matcher.msg)
+
+    def on_future_done(future):
+        if future.cancelled():
+            timeout_handle.__exit__(None, None, None)
+            request_cancel(message_matcher.message_id)
+
+    future.add_done_callback(on_future_done)
+    message_matcher.add_done_callback(on_message_matcher_done)
+    return future
+
+
 def wait_for_message_matchers(
     message_matchers: List[Optional[IIdMessageMatcher]],
     monitor: Optional[IMonitor],
@@ -206,7 +324,8 @@ class _ReaderThread(threading.Thread):
         from robocorp_ls_core.options import Setup
 
         notify_matchers = []
-        log.debug("Will handle read message: %s" % (msg,))
+        if log.is_enabled(LOG_LEVEL_DEBUG):
+            log.debug("Will handle read message: %s", TruncatedPayload(msg))
         with self._lock:
             for message_matcher in self._pattern_message_matchers.values():
                 if message_matcher.matches(msg):
@@ -222,12 +341,10 @@ class _ReaderThread(threading.Thread):
 
             if Setup.options.DEBUG_MESSAGE_MATCHERS:
                 log.debug(
-                    "Notify matchers: %s\nRemaining id matchers: %s\nRemaining pattern matchers: %s"
-                    % (
-                        notify_matchers,
-                        self._id_message_matchers,
-                        self._pattern_message_matchers,
-                    )
+                    "Notify matchers: %s\nRemaining id matchers: %s\nRemaining pattern matchers: %s",
+                    notify_matchers,
+                    self._id_message_matchers,
+                    self._pattern_message_matchers,
                 )
 
         if self._request_handlers:
@@ -319,6 +436,7 @@ class LanguageServerClientBase(object):
 
     @implements(ILanguageServerClientBase.request_async)
     def request_async(self, contents: dict) -> Optional[IIdMessageMatcher]:
+        _add_trace_id(contents)
         message_id = contents["id"]
         message_matcher = self._reader_thread.obtain_id_message_matcher(message_id)
         if message_matcher is None:
@@ -329,6 +447,22 @@ class LanguageServerClientBase(object):
 
         return message_matcher
 
+    @implements(ILanguageServerClientBase.request_async_encoded)
+    def request_async_encoded(
+        self, message_id, method_name: str, encoded_params: bytes
+    ) -> Optional[IIdMessageMatcher]:
+        message_matcher = self._reader_thread.obtain_id_message_matcher(message_id)
+        if message_matcher is None:
+            return None
+
+        encoded = encode_request(
+            message_id, method_name, encoded_params, tracing.get_trace_id()
+        )
+        if not self.write(encoded):
+            return None
+
+        return message_matcher
+
     @implements(ILanguageServerClientBase.request)
     def request(
         self,
@@ -350,6 +484,7 @@ class LanguageServerClientBase(object):
         if timeout is Sentinel.USE_DEFAULT_TIMEOUT:
             timeout = self.DEFAULT_TIMEOUT
 
+        _add_trace_id(contents)
         message_id = contents["id"]
         message_matcher = self._reader_thread.obtain_id_message_matcher(message_id)
         if message_matcher is None:
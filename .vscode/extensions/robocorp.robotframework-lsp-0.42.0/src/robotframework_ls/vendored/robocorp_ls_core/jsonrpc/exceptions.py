@@ -97,6 +97,13 @@ class JsonRpcRequestCancelled(JsonRpcException):
     MESSAGE = "Request Cancelled"
 
 
+class JsonRpcContentModified(JsonRpcRequestCancelled):
+    # A request superseded by a request for a newer version of the document.
+
+    CODE = -32801
+    MESSAGE = "Content Modified"
+
+
 class JsonRpcServerError(JsonRpcException):
     def __init__(self, message, code, data=None):
         assert _is_server_error_code(code)
@@ -118,5 +125,6 @@ _EXCEPTIONS = (
     JsonRpcInvalidParams,
     JsonRpcInternalError,
     JsonRpcRequestCancelled,
+    JsonRpcContentModified,
     JsonRpcServerError,
 )
@@ -34,6 +34,24 @@ ENV_OPTION_LSP_DEBUG_REMOTE_FS_MESSAGES = "LSP_DEBUG_FS_MESSAGES"
 
 ENV_OPTION_LSP_DEBUG_CACHE_DEPS = "LSP_DEBUG_CACHE_DEPS"
 
+# When set, subprocesses are started with `-X importtime` (the import timings
+# are written to the stderr of the subprocess, which is copied to the stderr of
+# the process which started it -- not to the log).
+ENV_OPTION_LSP_DEBUG_IMPORT_TIME = "LSP_DEBUG_IMPORT_TIME"
+
+# When set, the requests which take more than LSP_PROFILE_SLOW_REQUESTS_THRESHOLD
+# seconds are profiled (see: robocorp_ls_core.sampling_profiler).
+ENV_OPTION_LSP_PROFILE_SLOW_REQUESTS = "LSP_PROFILE_SLOW_REQUESTS"
+
+ENV_OPTION_LSP_PROFILE_SLOW_REQUESTS_THRESHOLD = "LSP_PROFILE_SLOW_REQUESTS_THRESHOLD"
+
+
+def get_float_from_env(env_key, default: float) -> float:
+    try:
+        return float(os.environ[env_key])
+    except:
+        return default
+
 
 class BaseOptions(object):
 
@@ -47,6 +65,11 @@ class BaseOptions(object):
     DEBUG_PROCESS_ENVIRON = is_true_in_env(ENV_OPTION_LSP_DEBUG_PROCESS_ENVIRON)
     DEBUG_REMOTE_FS_MESSAGES = is_true_in_env(ENV_OPTION_LSP_DEBUG_REMOTE_FS_MESSAGES)
     DEBUG_CACHE_DEPS = is_true_in_env(ENV_OPTION_LSP_DEBUG_CACHE_DEPS)
+    DEBUG_IMPORT_TIME = is_true_in_env(ENV_OPTION_LSP_DEBUG_IMPORT_TIME)
+    PROFILE_SLOW_REQUESTS = is_true_in_env(ENV_OPTION_LSP_PROFILE_SLOW_REQUESTS)
+    PROFILE_SLOW_REQUESTS_THRESHOLD = get_float_from_env(
+        ENV_OPTION_LSP_PROFILE_SLOW_REQUESTS_THRESHOLD, 2.0
+    )
 
     HIDE_COMMAND_MESSAGES = set()
 
@@ -0,0 +1,134 @@
+"""
+Opt-in sampling profiler for slow requests (enabled with the
+`LSP_PROFILE_SLOW_REQUESTS` environment variable).
+
+When a request takes more than the configured threshold the stack of the
+thread handling the request is sampled (with `sys._current_frames()`) until
+the request finishes and the samples are written to the log directory in the
+collapsed stack format (each line has the frames from the root separated by
+`;` followed by the number of samples), which can be used to create
+flamegraphs (i.e.: flamegraph.pl or https://www.speedscope.app).
+"""
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+
+def get_profiles_dir() -> str:
+    """
+    :return: the directory where the profiles are written (the log directory
+    or the temp directory if there's no log file).
+    """
+    from robocorp_ls_core.robotframework_log import get_log_file
+
+    log_file = get_log_file()
+    if log_file and isinstance(log_file, str):
+        return os.path.dirname(log_file)
+
+    import tempfile
+
+    return tempfile.gettempdir()
+
+
+class SlowRequestProfiler(object):
+    def __init__(self, thread_ident: int, name: str, interval: float) -> None:
+        """
+        :param thread_ident:
+            The ident of the thread to be sampled.
+
+        :param name:
+            A name to identify the request (used in the filename).
+
+        :param interval:
+            The interval (in seconds) between samples.
+        """
+        self._thread_ident = thread_ident
+        self._name = name
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._stack_to_count: Dict[str, int] = {}
+        self._code_to_label: dict = {}
+        self._samples = 0
+        self.filename: Optional[str] = None
+
+    def start(self) -> None:
+        t = threading.Thread(
+            target=self._run, name=f"SlowRequestProfiler: {self._name}"
+        )
+        t.daemon = True
+        t.start()
+
+    def stop(self) -> None:
+        """
+        Stops sampling (the profile is written in the profiler thread).
+        """
+        self._stop_event.set()
+
+    def _run(self) -> None:
+        try:
+            self._sample()
+            while not self._stop_event.wait(self._interval):
+                if not self._sample():
+                    break
+            self._write()
+        except:
+            log.exception("Error profiling slow request: %s", self._name)
+
+    def _get_label(self, code) -> str:
+        label = self._code_to_label.get(code)
+        if label is None:
+            label = self._code_to_label[code] = "%s (%s:%s)" % (
+                code.co_name,
+                os.path.basename(code.co_filename),
+                code.co_firstlineno,
+            )
+        return label
+
+    def _sample(self) -> bool:
+        """
+        :return: False if the thread is no longer alive.
+        """
+        frame = sys._current_frames().get(self._thread_ident)
+        if frame is None:
+            return False
+
+        labels = []
+        while frame is not None:
+            labels.append(self._get_label(frame.f_code))
+            frame = frame.f_back
+        del frame
+
+        labels.reverse()
+        stack = ";".join(labels)
+        self._stack_to_count[stack] = self._stack_to_count.get(stack, 0) + 1
+        self._samples += 1
+        return True
+
+    def _write(self) -> None:
+        import time
+
+        if not self._stack_to_count:
+            return
+
+        safe_name = "".join(c if c.isalnum() else "_" for c in self._name)
+        filename = os.path.join(
+            get_profiles_dir(),
+            "slow-request-%s-%s-%s.collapsed"
+            % (os.getpid(), safe_name, time.strftime("%Y%m%d-%H%M%S")),
+        )
+        with open(filename, "w", encoding="utf-8") as stream:
+            for stack, count in sorted(self._stack_to_count.items()):
+                stream.write(f"{stack} {count}\n")
+
+        self.filename = filename
+        log.info(
+            "Profile of slow request: %s (%s samples) written to: %s",
+            self._name,
+            self._samples,
+            filename,
+        )
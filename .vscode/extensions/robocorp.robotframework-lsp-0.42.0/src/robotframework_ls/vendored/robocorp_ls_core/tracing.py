@@ -0,0 +1,241 @@
+"""
+Lightweight tracing of requests.
+
+Each request handled by the `Endpoint` is associated to a trace id (which is
+received in the `traceId` field of the message or is created based on the
+message id) and while the request is handled the trace id is propagated to the
+requests done to other processes (see: `LanguageServerClientBase`), so, a
+request to the language server can be followed in the server api processes.
+
+Usage:
+
+    with tracing.span("ast:parse"):
+        ...
+
+Note: span names are `<category>:<name>` (the category is used to group the
+events in the Chrome trace).
+
+The spans are aggregated in per-name latency histograms and the latest ones
+are kept so that they can be dumped to a Chrome trace json file (which may be
+opened in chrome://tracing or https://ui.perfetto.dev).
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+log = get_logger(__name__)
+
+# Upper bounds (in milliseconds) for the buckets of the histograms.
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+MAX_SPANS_KEPT = 20000
+try:
+    MAX_SPANS_KEPT = int(os.environ.get("ROBOTFRAMEWORK_LS_MAX_SPANS_KEPT", 20000))
+except:
+    pass
+
+_tls = threading.local()
+
+
+def get_trace_id() -> Optional[str]:
+    """
+    :return: the trace id of the request being handled in the current thread.
+    """
+    return getattr(_tls, "trace_id", None)
+
+
+class trace_context(object):
+    """
+    Context manager which sets the trace id for the current thread.
+    """
+
+    __slots__ = ["_trace_id", "_prev_trace_id"]
+
+    def __init__(self, trace_id: Optional[str]) -> None:
+        self._trace_id = trace_id
+        self._prev_trace_id = None
+
+    def __enter__(self):
+        self._prev_trace_id = getattr(_tls, "trace_id", None)
+        _tls.trace_id = self._trace_id
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _tls.trace_id = self._prev_trace_id
+
+
+class _Histogram(object):
+    __slots__ = ["count", "total_ms", "max_ms", "bucket_counts"]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # The last bucket is for the values above the last upper bound.
+        self.bucket_counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+        for i, upper_bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if ms <= upper_bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+    def _percentile_upper_bound(self, percentile: float) -> float:
+        """
+        :return: the upper bound of the bucket where the given percentile is.
+        """
+        target = self.count * percentile
+        accumulated = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            accumulated += bucket_count
+            if accumulated >= target:
+                if i < len(HISTOGRAM_BUCKETS_MS):
+                    return round(min(HISTOGRAM_BUCKETS_MS[i], self.max_ms), 3)
+                break
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> dict:
+        buckets = {}
+        for upper_bound, bucket_count in zip(HISTOGRAM_BUCKETS_MS, self.bucket_counts):
+            buckets[f"<={upper_bound}ms"] = bucket_count
+        buckets[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = self.bucket_counts[-1]
+
+        return {
+            "count": self.count,
+            "totalMs": round(self.total_ms, 3),
+            "avgMs": round(self.total_ms / self.count, 3) if self.count else 0,
+            "maxMs": round(self.max_ms, 3),
+            "p50Ms": self._percentile_upper_bound(0.5),
+            "p90Ms": self._percentile_upper_bound(0.9),
+            "p99Ms": self._percentile_upper_bound(0.99),
+            "buckets": buckets,
+        }
+
+
+class Tracer(object):
+    def __init__(self, max_spans_kept: int = MAX_SPANS_KEPT) -> None:
+        self._lock = threading.Lock()
+        self._name_to_histogram: Dict[str, _Histogram] = {}
+        # Each span is: (name, start_time, duration, thread_id, trace_id, args)
+        self._spans: Deque[tuple] = deque(maxlen=max_spans_kept)
+        self._pid = os.getpid()
+
+    def record(
+        self,
+        name: str,
+        start_time: float,
+        duration: float,
+        trace_id: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        :param start_time:
+            The start time (as given by `time.time()`).
+
+        :param duration:
+            The duration in seconds.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            histogram = self._name_to_histogram.get(name)
+            if histogram is None:
+                histogram = self._name_to_histogram[name] = _Histogram()
+            histogram.add(duration * 1000)
+            self._spans.append((name, start_time, duration, thread_id, trace_id, args))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._name_to_histogram.clear()
+            self._spans.clear()
+
+    def get_histograms(self) -> Dict[str, dict]:
+        with self._lock:
+            return dict(
+                (name, histogram.to_dict())
+                for name, histogram in sorted(self._name_to_histogram.items())
+            )
+
+    def get_chrome_trace_events(self) -> List[dict]:
+        """
+        :return: the spans kept as events in the Chrome trace event format.
+        """
+        with self._lock:
+            spans = list(self._spans)
+
+        pid = self._pid
+        events = []
+        for name, start_time, duration, thread_id, trace_id, args in spans:
+            event_args = {"traceId": trace_id}
+            if args:
+                event_args.update(args)
+            events.append(
+                {
+                    "name": name,
+                    "cat": name.split(":", 1)[0],
+                    "ph": "X",
+                    "ts": int(start_time * 1000000),
+                    "dur": int(duration * 1000000),
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": event_args,
+                }
+            )
+        return events
+
+
+def dump_chrome_trace(filename: str, events: List[dict]) -> None:
+    """
+    Writes the given events (which may be from multiple processes) to a json
+    file in the Chrome trace format.
+    """
+    import json
+
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as stream:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, stream)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+class span(object):
+    """
+    Context manager which records the time elapsed in the given span.
+    """
+
+    __slots__ = ["_name", "_args", "_start_time", "_start"]
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]] = None) -> None:
+        self._name = name
+        self._args = args
+
+    def __enter__(self):
+        self._start_time = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _tracer.record(
+            self._name,
+            self._start_time,
+            time.perf_counter() - self._start,
+            getattr(_tls, "trace_id", None),
+            self._args,
+        )